@@ -0,0 +1,50 @@
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from models import DataLogger, SAMPLE_COLUMNS
+
+
+def make_columns(count: int, seed: int = 1) -> dict:
+    rng = np.random.default_rng(seed)
+    columns = {name: rng.normal(0.0, 10.0, count) for name in SAMPLE_COLUMNS}
+    columns['time'] = 1.7e9 + np.arange(count) / 500.0
+    columns['device_time_us'] = np.arange(count) * 2000.0
+    columns['seq'] = np.arange(count, dtype=np.float64)
+    return columns
+
+
+def measure(fmt: str, columns: dict, batch: int) -> float:
+    count = len(columns['time'])
+    with tempfile.TemporaryDirectory() as directory:
+        suffix = '.csv' if fmt == 'csv' else '.stblog'
+        logger = DataLogger.create(str(Path(directory) / f"bench{suffix}"), fmt)
+        start = time.perf_counter()
+        for offset in range(0, count, batch):
+            logger.log_columns({name: values[offset:offset + batch]
+                                for name, values in columns.items()})
+        logger.close()
+        elapsed = time.perf_counter() - start
+    return count / elapsed
+
+
+def run(count: int = 200000, batch: int = 100) -> dict:
+    columns = make_columns(count)
+    return {
+        'csv_rows_per_s': measure('csv', columns, batch),
+        'columnar_rows_per_s': measure('columnar', columns, batch),
+    }
+
+
+def main():
+    for name, rate in run().items():
+        print(f"{name:28s} {rate:14,.0f}")
+
+
+if __name__ == '__main__':
+    main()
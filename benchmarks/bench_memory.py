@@ -0,0 +1,55 @@
+import gc
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from controllers import DataManager
+from benchmarks.fakes import FakeConnection, firmware_lines, rss_mb
+
+
+def run(samples: int = 3000000, checkpoints: int = 6, rate: float = None) -> dict:
+    gc.collect()
+    baseline = rss_mb()
+    manager = DataManager()
+    connection = FakeConnection(firmware_lines(100000), rate)
+    manager.device.open_local(connection)
+    
+    marks = []
+    received = 0
+    step = samples // checkpoints
+    next_mark = step
+    start = time.perf_counter()
+    while received < samples:
+        columns = manager.read_columns()
+        count = len(columns['time'])
+        if count == 0:
+            time.sleep(0.001)
+            continue
+        received += count
+        if received >= next_mark:
+            marks.append((received, rss_mb()))
+            next_mark += step
+    elapsed = time.perf_counter() - start
+    
+    history = manager.history
+    manager.shutdown()
+    first_samples, first_rss = marks[0]
+    last_samples, last_rss = marks[-1]
+    growth = (last_rss - first_rss) / max(1e-9, (last_samples - first_samples) / 1e6)
+    return {
+        'session_samples_per_s': received / elapsed,
+        'rss_growth_mb': last_rss - baseline,
+        'rss_growth_per_million_mb': growth,
+        'history_raw_samples': float(len(history)),
+    }
+
+
+def main():
+    for name, value in run().items():
+        print(f"{name:32s} {value:14,.3f}")
+
+
+if __name__ == '__main__':
+    main()
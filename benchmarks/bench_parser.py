@@ -0,0 +1,66 @@
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from models import IMUData, DataParser
+
+
+def make_lines(count: int, noise: float = 0.01, seed: int = 1):
+    rng = random.Random(seed)
+    lines = []
+    for seq in range(count):
+        if rng.random() < noise:
+            lines.append("PID Updated via Serial - Kp: 1.40, Ki: 0.07, Kd: 0.00")
+            continue
+        lines.append(
+            f'{{"r":{rng.uniform(-30, 30):.2f},"g":{rng.uniform(-50, 50):.2f},'
+            f'"s":{rng.randint(0, 180)},"e":{rng.uniform(-30, 30):.2f},'
+            f'"i":{rng.uniform(-40, 40):.1f},"t":{1000000 + seq * 20000},"n":{seq}}}'
+        )
+    return lines
+
+
+def json_parse(line: str):
+    try:
+        if line.strip().startswith('{'):
+            data = json.loads(line)
+            return IMUData(roll=float(data.get('r', 0)),
+                           gyro_rate=float(data.get('g', 0)),
+                           servo_pos=float(data.get('s', 90)))
+        return None
+    except Exception:
+        return None
+
+
+def measure(func, lines, repeat: int = 3) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(lines)
+        best = min(best, time.perf_counter() - start)
+    return len(lines) / best
+
+
+def run(count: int = 100000) -> dict:
+    lines = make_lines(count)
+    parser = DataParser()
+    return {
+        'json_loads_lines_per_s': measure(lambda batch: [json_parse(line) for line in batch], lines),
+        'parse_lines_per_s': measure(lambda batch: [parser.parse(line) for line in batch], lines),
+        'parse_many_lines_per_s': measure(parser.parse_many, lines),
+    }
+
+
+def main():
+    results = run()
+    baseline = results['json_loads_lines_per_s']
+    for name, rate in results.items():
+        print(f"{name:28s} {rate:14,.0f}  ({rate / baseline:.2f}x)")
+
+
+if __name__ == '__main__':
+    main()
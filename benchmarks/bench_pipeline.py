@@ -0,0 +1,58 @@
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from controllers import DataManager
+from models import LatencyHistogram
+from benchmarks.fakes import FakeConnection, firmware_lines
+
+
+def measure(rate: float, duration: float, poll_interval: float = 0.0005) -> dict:
+    manager = DataManager()
+    connection = FakeConnection(firmware_lines(int(rate * duration * 1.2) + 1000, rate), rate)
+    manager.device.open_local(connection)
+    latency = LatencyHistogram()
+    calls = 0
+    busy = 0.0
+    received = 0
+    
+    deadline = time.monotonic() + duration
+    while time.monotonic() < deadline:
+        start = time.perf_counter()
+        data = manager.read_data()
+        busy += time.perf_counter() - start
+        calls += 1
+        if data is None:
+            time.sleep(poll_interval)
+            continue
+        received += 1
+        latency.record(time.monotonic() - connection.emit_time(data.seq))
+    
+    emitted = connection.emitted
+    manager.shutdown()
+    summary = latency.summary()
+    prefix = f"hz{rate:g}"
+    return {
+        f'{prefix}_delivered_ratio': received / emitted if emitted else 0.0,
+        f'{prefix}_latency_p50_ms': summary['p50'] * 1e3,
+        f'{prefix}_latency_p99_ms': summary['p99'] * 1e3,
+        f'{prefix}_read_data_us': busy / calls * 1e6 if calls else 0.0,
+    }
+
+
+def run(rates=(50, 500, 5000), duration: float = 5.0) -> dict:
+    results = {}
+    for rate in rates:
+        results.update(measure(rate, duration))
+    return results
+
+
+def main():
+    for name, value in run().items():
+        print(f"{name:32s} {value:14,.3f}")
+
+
+if __name__ == '__main__':
+    main()
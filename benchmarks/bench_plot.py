@@ -0,0 +1,71 @@
+import os
+import sys
+import time
+from pathlib import Path
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from PyQt5.QtWidgets import QApplication
+from models import DataParser, LatencyHistogram, SampleBuffer, samples_from_columns
+from views import PlotWidget, FastPlotWidget
+from benchmarks.fakes import firmware_lines
+
+
+def make_samples(count: int, rate: float = 500.0):
+    columns = DataParser().parse_many(firmware_lines(count, rate))
+    columns['time'] = 1.7e9 + columns['device_time_us'] * 1e-6
+    return samples_from_columns(columns, columns['time'])
+
+
+def measure(widget_class, samples, frames: int, batch: int, max_points: int) -> dict:
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    widget = widget_class(max_points=max_points, buffer=SampleBuffer(max(100000, max_points)))
+    widget.frame_timer.stop()
+    widget.resize(1000, 600)
+    widget.show()
+    app.processEvents()
+    
+    histogram = LatencyHistogram()
+    for frame in range(frames):
+        offset = (frame * batch) % (len(samples) - batch)
+        start = time.perf_counter()
+        widget.update_batch(samples[offset:offset + batch])
+        widget.render_frame()
+        app.processEvents()
+        histogram.record(time.perf_counter() - start)
+    
+    widget.close()
+    widget.deleteLater()
+    app.processEvents()
+    summary = histogram.summary()
+    return {
+        'frame_mean_ms': summary['mean'] * 1e3,
+        'frame_p99_ms': summary['p99'] * 1e3,
+        'frames_per_s': 1.0 / summary['mean'] if summary['mean'] else 0.0,
+    }
+
+
+def run(frames: int = 150, rate: float = 500.0, fps: float = 30.0, max_points: int = 5000) -> dict:
+    batch = max(1, int(rate / fps))
+    samples = make_samples(max(20000, batch * 4), rate)
+    results = {}
+    widgets = [('matplotlib', PlotWidget)]
+    try:
+        import pyqtgraph
+        widgets.append(('pyqtgraph', FastPlotWidget))
+    except ImportError:
+        pass
+    for name, widget_class in widgets:
+        for metric, value in measure(widget_class, samples, frames, batch, max_points).items():
+            results[f'{name}_{metric}'] = value
+    return results
+
+
+def main():
+    for name, value in run().items():
+        print(f"{name:32s} {value:14,.3f}")
+
+
+if __name__ == '__main__':
+    main()
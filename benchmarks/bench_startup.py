@@ -0,0 +1,118 @@
+import importlib.util
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+IMPORT_TARGETS = {
+    'models': 'import models',
+    'controllers': 'import controllers',
+    'main': 'import main',
+}
+WINDOW_TIMEOUT = 60.0
+
+
+def child_env() -> dict:
+    env = dict(os.environ)
+    env.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [str(ROOT), env.get('PYTHONPATH')]))
+    return env
+
+
+def import_time(statement: str) -> tuple:
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement],
+                            capture_output=True, text=True, cwd=ROOT, env=child_env())
+    if result.returncode != 0:
+        raise RuntimeError(f"{statement!r} failed:\n{result.stderr[-2000:]}")
+    
+    total = 0
+    modules = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.split('|')
+        modules += 1
+        if not name.startswith('  '):
+            total += int(cumulative)
+    return total / 1e3, modules
+
+
+def show_window(backend: str):
+    from PyQt5.QtCore import QEvent, QObject, QTimer
+    from PyQt5.QtWidgets import QApplication
+    from views import BallStabilizerDashboard
+    
+    app = QApplication(sys.argv[:1])
+    window = BallStabilizerDashboard(plot_backend=backend)
+    marks = []
+    
+    class PaintWatcher(QObject):
+        
+        def eventFilter(self, obj, event):
+            if event.type() == QEvent.Paint:
+                plot = window.plot_widget
+                if not marks:
+                    marks.append('shown')
+                    print('shown', flush=True)
+                elif plot is not None and (obj is plot or plot.isAncestorOf(obj)):
+                    print('plot', flush=True)
+                    app.quit()
+            return False
+    
+    watcher = PaintWatcher()
+    app.installEventFilter(watcher)
+    window.show()
+    QTimer.singleShot(int(WINDOW_TIMEOUT * 1000), app.quit)
+    app.exec_()
+    window.close()
+
+
+def time_window(backend: str) -> dict:
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, __file__, '--window', backend],
+                               stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                               text=True, cwd=ROOT, env=child_env())
+    marks = {}
+    for line in process.stdout:
+        mark = line.strip()
+        if mark in ('shown', 'plot'):
+            marks[mark] = (time.perf_counter() - start) * 1e3
+    process.wait()
+    if len(marks) < 2:
+        raise RuntimeError(f"{backend} window did not finish painting")
+    return marks
+
+
+def run(repeats: int = 5, backends=('matplotlib', 'pyqtgraph')) -> dict:
+    results = {}
+    for target, statement in IMPORT_TARGETS.items():
+        times = []
+        for _ in range(repeats):
+            elapsed, modules = import_time(statement)
+            times.append(elapsed)
+        results[f'{target}_import_ms'] = statistics.median(times)
+        results[f'{target}_modules'] = modules
+    
+    for backend in backends:
+        if backend == 'pyqtgraph' and importlib.util.find_spec('pyqtgraph') is None:
+            continue
+        runs = [time_window(backend) for _ in range(repeats)]
+        results[f'{backend}_window_ms'] = statistics.median(marks['shown'] for marks in runs)
+        results[f'{backend}_plot_ms'] = statistics.median(marks['plot'] for marks in runs)
+    return results
+
+
+def main():
+    for name, value in run().items():
+        print(f"{name:32s} {value:14,.3f}")
+
+
+if __name__ == '__main__':
+    if len(sys.argv) == 3 and sys.argv[1] == '--window':
+        sys.path.insert(0, str(ROOT))
+        show_window(sys.argv[2])
+    else:
+        main()
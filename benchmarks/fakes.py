@@ -0,0 +1,96 @@
+import os
+import sys
+import time
+from collections import deque
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from models import IConnection, GimbalPlant
+from models.plant_simulator import TEXT_TELEMETRY_FORMAT
+
+
+def firmware_lines(count: int, rate: float = 500.0, seed: int = 1, plants: int = 50) -> List[str]:
+    steps = -(-count // plants)
+    plant = GimbalPlant(rate=rate, count=plants, seed=seed)
+    columns = plant.step(steps)
+    rows = [columns[name].T.reshape(-1)[:count]
+            for name in ('roll', 'gyro_rate', 'servo_pos', 'error', 'integral')]
+    device_time = (np.arange(count) * 1e6 / rate).astype(np.int64) + 1000000
+    return [TEXT_TELEMETRY_FORMAT % row for row in zip(
+        rows[0].tolist(), rows[1].tolist(), rows[2].astype(np.int64).tolist(),
+        rows[3].tolist(), rows[4].tolist(), device_time.tolist(), range(count)
+    )]
+
+
+class FakeConnection(IConnection):
+    
+    def __init__(self, lines: List[str], rate: Optional[float] = None, max_batch: int = 5000):
+        self.lines = lines
+        self.rate = rate
+        self.max_batch = max_batch
+        self.position = 0
+        self.emitted = 0
+        self.start_clock = 0.0
+        self.connected = False
+        self.pending = deque()
+    
+    def connect(self) -> bool:
+        self.start_clock = time.monotonic()
+        self.connected = True
+        return True
+    
+    def disconnect(self):
+        self.connected = False
+    
+    def is_connected(self) -> bool:
+        return self.connected
+    
+    def emit_time(self, seq: int) -> float:
+        return self.start_clock + (seq + 1) / self.rate
+    
+    def read_lines(self) -> List[str]:
+        if not self.connected:
+            return []
+        if self.rate:
+            due = int((time.monotonic() - self.start_clock) * self.rate)
+            count = min(due - self.emitted, self.max_batch)
+        else:
+            count = self.max_batch
+        if count <= 0:
+            return []
+        
+        lines = []
+        while len(lines) < count:
+            chunk = self.lines[self.position:self.position + count - len(lines)]
+            lines.extend(chunk)
+            self.position = (self.position + len(chunk)) % len(self.lines)
+        self.emitted += count
+        return lines
+    
+    def read_available(self) -> bytes:
+        lines = self.read_lines()
+        return ('\n'.join(lines) + '\n').encode('utf-8') if lines else b''
+    
+    def read_line(self) -> Optional[str]:
+        if not self.pending:
+            self.pending.extend(self.read_lines())
+        return self.pending.popleft() if self.pending else None
+    
+    def send_command(self, command: str) -> bool:
+        return self.connected
+
+
+def rss_mb() -> float:
+    try:
+        with open(f'/proc/{os.getpid()}/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024.0
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
@@ -0,0 +1,153 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from pathlib import Path
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+
+
+BASELINE_PATH = Path(__file__).resolve().parent / 'baseline.json'
+QUICK_BASELINE_PATH = Path(__file__).resolve().parent / 'baseline_quick.json'
+SUITES = ('parser', 'logger', 'pipeline', 'memory', 'plot', 'startup')
+QUICK_OPTIONS = {
+    'parser': {'count': 20000},
+    'logger': {'count': 50000},
+    'pipeline': {'duration': 1.0},
+    'memory': {'samples': 300000},
+    'plot': {'frames': 30},
+    'startup': {'repeats': 1},
+}
+HIGHER_IS_BETTER = ('_per_s', '_ratio')
+LOWER_IS_BETTER = ('_ms', '_us', '_mb')
+HOST_KEYS = ('machine', 'cpus')
+
+
+def run_suite(name: str, quick: bool = False) -> dict:
+    if name == 'parser':
+        from benchmarks.bench_parser import run
+    elif name == 'logger':
+        from benchmarks.bench_logger import run
+    elif name == 'pipeline':
+        from benchmarks.bench_pipeline import run
+    elif name == 'memory':
+        from benchmarks.bench_memory import run
+    elif name == 'plot':
+        from benchmarks.bench_plot import run
+    elif name == 'startup':
+        from benchmarks.bench_startup import run
+    else:
+        raise ValueError(f"Unknown benchmark suite: {name}")
+    return {metric: float(value) for metric, value in
+            run(**(QUICK_OPTIONS[name] if quick else {})).items()}
+
+
+def environment() -> dict:
+    return {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'host': platform.node(),
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+    }
+
+
+def direction(metric: str) -> int:
+    if metric.endswith(HIGHER_IS_BETTER):
+        return 1
+    if metric.endswith(LOWER_IS_BETTER):
+        return -1
+    return 0
+
+
+def host_mismatches(current: dict, recorded: dict) -> list:
+    return [(key, recorded.get(key), current.get(key)) for key in HOST_KEYS
+            if recorded.get(key) != current.get(key)]
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    regressions = []
+    for suite, metrics in results.items():
+        reference = baseline.get(suite, {})
+        for metric, value in metrics.items():
+            sign = direction(metric)
+            base = reference.get(metric)
+            if not sign or not base:
+                continue
+            change = (value - base) / abs(base)
+            if sign * change < -tolerance:
+                regressions.append((suite, metric, base, value, change))
+    return regressions
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Run stabilizer pipeline benchmarks")
+    parser.add_argument('--suite', action='append', choices=SUITES,
+                        help="suite to run (repeatable, default: all)")
+    parser.add_argument('--quick', action='store_true',
+                        help="shorter runs for smoke testing")
+    parser.add_argument('--output', default=None,
+                        help="write results as JSON to this path")
+    parser.add_argument('--baseline', default=None,
+                        help="baseline results to compare against "
+                             "(default: baseline.json, or baseline_quick.json with --quick)")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="allowed relative regression before failing")
+    parser.add_argument('--update-baseline', action='store_true',
+                        help="store these results as the new baseline")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    if args.baseline is None:
+        args.baseline = str(QUICK_BASELINE_PATH if args.quick else BASELINE_PATH)
+    results = {}
+    for suite in args.suite or SUITES:
+        print(f"Running {suite}...", flush=True)
+        results[suite] = run_suite(suite, args.quick)
+        for metric, value in results[suite].items():
+            print(f"  {metric:36s} {value:16,.3f}")
+    
+    report = {'environment': environment(), 'quick': args.quick, 'results': results}
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    
+    if args.update_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+    
+    if not os.path.exists(args.baseline):
+        print("No baseline to compare against")
+        return 0
+    
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline.get('quick', False) != args.quick:
+        mode = 'quick' if baseline.get('quick') else 'full'
+        print(f"Baseline {args.baseline} holds {mode} runs, not comparing. "
+              f"Pass a matching --baseline or use --update-baseline.")
+        return 2
+    mismatches = host_mismatches(report['environment'], baseline.get('environment', {}))
+    for key, recorded, current in mismatches:
+        print(f"Warning: baseline {key} is {recorded}, this host has {current}")
+    regressions = compare(results, baseline.get('results', {}), args.tolerance)
+    for suite, metric, base, value, change in regressions:
+        print(f"REGRESSION {suite}.{metric}: {base:,.3f} -> {value:,.3f} ({change:+.0%})")
+    if not regressions:
+        print(f"No regressions beyond {args.tolerance:.0%} of baseline")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,3 +1,23 @@
 from .data_manager import DataManager
+from .device import Device, DEFAULT_DEVICE, CONNECT_TIMEOUT
+from .acquisition_worker import AcquisitionWorker
+from .async_acquisition import AsyncLoopThread, AsyncAcquisition
+from .stream_decoder import StreamDecoder
+from .supervisor import Supervisor, gap_columns
+from .auto_tuner import AutoTuner, TUNING_METHODS, score_window
 
-__all__ = ['DataManager']
+__all__ = [
+    'DataManager',
+    'Device',
+    'DEFAULT_DEVICE',
+    'CONNECT_TIMEOUT',
+    'AcquisitionWorker',
+    'AsyncLoopThread',
+    'AsyncAcquisition',
+    'StreamDecoder',
+    'Supervisor',
+    'gap_columns',
+    'AutoTuner',
+    'TUNING_METHODS',
+    'score_window'
+]
@@ -0,0 +1,113 @@
+import threading
+import time
+from typing import Optional, Callable, Dict
+import numpy as np
+from models import IConnection, IColumnConnection, DataParser, SampleBuffer, METRICS
+from .stream_decoder import StreamDecoder
+from .supervisor import Supervisor
+
+
+class AcquisitionWorker(threading.Thread):
+    
+    def __init__(self, connection: IConnection, buffer: SampleBuffer,
+                 parser: DataParser = None, idle_interval: float = 0.002,
+                 on_columns: Optional[Callable[[Dict[str, np.ndarray]], None]] = None,
+                 supervisor: Optional[Supervisor] = None):
+        super().__init__(name="AcquisitionWorker", daemon=True)
+        self.connection = connection
+        self.buffer = buffer
+        self.decoder = StreamDecoder(parser)
+        self.idle_interval = idle_interval
+        self.on_columns = on_columns
+        self.supervisor = supervisor
+        self._attempted = False
+        self._stop_event = threading.Event()
+    
+    def run(self):
+        supervisor = self.supervisor
+        while not self._stop_event.is_set():
+            if supervisor and not self.connection.is_connected():
+                self._reconnect()
+                continue
+            
+            try:
+                columns = self._read_batch()
+            except Exception as e:
+                if not supervisor:
+                    raise
+                supervisor.errors += 1
+                print(f"Error: {e}")
+                self.connection.disconnect()
+                continue
+            
+            if columns is not None:
+                if supervisor:
+                    supervisor.mark_data()
+                self._publish(columns)
+            elif supervisor and supervisor.stalled():
+                supervisor.stalls += 1
+                print(f"No data for {supervisor.watchdog} s, reconnecting")
+                self.connection.disconnect()
+            else:
+                self._stop_event.wait(self.idle_interval)
+    
+    def _reconnect(self):
+        supervisor = self.supervisor
+        gap = supervisor.lost()
+        if gap is not None:
+            self._publish(gap)
+        
+        if self._attempted and self._stop_event.wait(supervisor.next_delay()):
+            return
+        self._attempted = True
+        if not self.connection.connect():
+            return
+        
+        supervisor.connected()
+        self.decoder.resync()
+        for command in supervisor.resume_commands():
+            self.connection.send_command(command)
+    
+    def _publish(self, columns: Dict[str, np.ndarray]):
+        if self.on_columns:
+            start = time.perf_counter()
+            self.on_columns(columns)
+            METRICS.record('callback', time.perf_counter() - start)
+        self.buffer.append(columns)
+    
+    def _read_batch(self) -> Optional[Dict[str, np.ndarray]]:
+        if not self.connection.is_connected():
+            return None
+        start = time.perf_counter()
+        if isinstance(self.connection, IColumnConnection):
+            columns = self.connection.read_columns()
+            METRICS.record('read', time.perf_counter() - start)
+            return self.decoder.decode_columns(columns)
+        if self.decoder.binary:
+            data = self.connection.read_available()
+            METRICS.record('read', time.perf_counter() - start)
+            return self.decoder.decode_bytes(data)
+        
+        lines = self.connection.read_lines()
+        METRICS.record('read', time.perf_counter() - start)
+        METRICS.count('read.lines', len(lines))
+        return self.decoder.decode_lines(lines)
+    
+    def is_connected(self) -> bool:
+        return self.connection.is_connected()
+    
+    def send_command(self, command: str) -> bool:
+        sent = self.connection.send_command(command)
+        if sent and self.supervisor:
+            self.supervisor.record_command(command)
+        return sent
+    
+    def set_binary(self, enabled: bool):
+        self.decoder.set_binary(enabled)
+        if self.supervisor:
+            self.supervisor.record_command(f"BIN:{1 if enabled else 0}")
+    
+    def stop(self, timeout: float = 1.0):
+        self._stop_event.set()
+        if self.is_alive() and threading.current_thread() is not self:
+            self.join(timeout)
@@ -0,0 +1,170 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, Executor
+from typing import Optional, Callable, Dict, Any
+import numpy as np
+from models import IAsyncConnection, DataParser, SampleBuffer, METRICS
+from .stream_decoder import StreamDecoder
+from .supervisor import Supervisor
+
+
+class AsyncLoopThread(threading.Thread):
+    
+    def __init__(self):
+        super().__init__(name="AsyncLoopThread", daemon=True)
+        self.loop = asyncio.SelectorEventLoop()
+    
+    def run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+    
+    def submit(self, coroutine) -> Future:
+        if not self.is_alive():
+            self.start()
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+    
+    def call(self, coroutine, timeout: float = 1.0) -> Any:
+        return self.submit(coroutine).result(timeout)
+    
+    def stop(self, timeout: float = 1.0):
+        if self.is_alive():
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.join(timeout)
+
+
+class AsyncAcquisition:
+    
+    def __init__(self, connection: IAsyncConnection, buffer: SampleBuffer,
+                 bridge: AsyncLoopThread, parser: DataParser = None,
+                 on_columns: Optional[Callable[[Dict[str, np.ndarray]], None]] = None,
+                 supervisor: Supervisor = None, executor: Optional[Executor] = None):
+        self.connection = connection
+        self.buffer = buffer
+        self.bridge = bridge
+        self.decoder = StreamDecoder(parser)
+        self.on_columns = on_columns
+        self.supervisor = supervisor or Supervisor()
+        self.executor = executor
+        self.state = 'idle'
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self.first_connect: Future = Future()
+    
+    def start(self) -> Future:
+        self._stopping = False
+        self.state = 'connecting'
+        self.first_connect = Future()
+        self.bridge.submit(self.run())
+        return self.first_connect
+    
+    async def run(self):
+        self._task = asyncio.current_task()
+        supervisor = self.supervisor
+        try:
+            while not self._stopping:
+                self.state = 'connecting'
+                try:
+                    connected = await self.connection.connect()
+                except Exception as e:
+                    print(f"Error: {e}")
+                    connected = False
+                if not self.first_connect.done():
+                    self.first_connect.set_result(connected)
+                
+                if connected:
+                    self.state = 'connected'
+                    supervisor.connected()
+                    try:
+                        await self._resume()
+                        await self._pump()
+                    except asyncio.TimeoutError:
+                        supervisor.stalls += 1
+                        print(f"No data for {supervisor.watchdog} s, reconnecting")
+                    except Exception as e:
+                        supervisor.errors += 1
+                        print(f"Error: {e}")
+                    await self.connection.disconnect()
+                    
+                    gap = supervisor.lost()
+                    if gap is not None:
+                        self._publish(gap)
+                
+                if not self._stopping:
+                    self.state = 'connecting'
+                    await asyncio.sleep(supervisor.next_delay())
+        finally:
+            if not self.first_connect.done():
+                self.first_connect.set_result(False)
+            await self.connection.disconnect()
+            self.state = 'idle'
+    
+    async def _resume(self):
+        self.decoder.resync()
+        for command in self.supervisor.resume_commands():
+            await self.connection.send_command(command)
+    
+    async def _pump(self):
+        loop = asyncio.get_running_loop()
+        stream = self.connection.stream()
+        try:
+            while True:
+                try:
+                    data = await asyncio.wait_for(stream.__anext__(),
+                                                  self.supervisor.watchdog or None)
+                except StopAsyncIteration:
+                    return
+                
+                self.supervisor.mark_data()
+                if self.executor:
+                    await loop.run_in_executor(self.executor, self._handle, data)
+                else:
+                    self._handle(data)
+        finally:
+            await stream.aclose()
+    
+    def _handle(self, data: bytes):
+        METRICS.count('read.chunks')
+        columns = self.decoder.decode_bytes(data)
+        if columns is not None:
+            self._publish(columns)
+    
+    def _publish(self, columns: Dict[str, np.ndarray]):
+        if self.on_columns:
+            start = time.perf_counter()
+            self.on_columns(columns)
+            METRICS.record('callback', time.perf_counter() - start)
+        self.buffer.append(columns)
+    
+    def is_connected(self) -> bool:
+        return self.state == 'connected' and self.connection.is_connected()
+    
+    def send_command(self, command: str) -> bool:
+        try:
+            sent = self.bridge.call(self.connection.send_command(command))
+        except Exception as e:
+            print(f"Error: {e}")
+            return False
+        if sent:
+            self.supervisor.record_command(command)
+        return sent
+    
+    def set_binary(self, enabled: bool):
+        self.decoder.set_binary(enabled)
+        self.supervisor.record_command(f"BIN:{1 if enabled else 0}")
+    
+    async def _cancel(self):
+        task, self._task = self._task, None
+        if task and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+    
+    def stop(self, timeout: float = 1.0):
+        self._stopping = True
+        try:
+            self.bridge.call(self._cancel(), timeout)
+        except Exception as e:
+            print(f"Error: {e}")
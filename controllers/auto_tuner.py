@@ -0,0 +1,219 @@
+import threading
+from typing import Optional, Callable, Dict, List, Tuple
+import numpy as np
+
+
+TUNING_METHODS = ('nelder_mead', 'ziegler_nichols')
+DEFAULT_BOUNDS = ((0.0, 30.0), (0.0, 5.0), (0.0, 2.0))
+
+
+def score_window(columns: Dict[str, np.ndarray], oscillation_weight: float = 0.05) -> dict:
+    times = columns['time']
+    errors = columns['error']
+    finite = np.isfinite(times) & np.isfinite(errors)
+    times, errors = times[finite], errors[finite]
+    if len(errors) < 2 or times[-1] <= times[0]:
+        return {'score': np.inf, 'iae': np.nan, 'oscillation': np.nan, 'samples': len(errors)}
+    
+    duration = times[-1] - times[0]
+    magnitude = np.abs(errors)
+    iae = float(np.sum(0.5 * (magnitude[1:] + magnitude[:-1]) * np.diff(times)) / duration)
+    oscillation = float(np.abs(np.diff(errors)).sum() / duration)
+    return {
+        'score': float(iae + oscillation_weight * oscillation),
+        'iae': iae,
+        'oscillation': oscillation,
+        'samples': len(errors)
+    }
+
+
+def oscillation_period(columns: Dict[str, np.ndarray], threshold: float = 2.0,
+                       sustain: float = 0.7) -> Optional[float]:
+    times = columns['time']
+    errors = columns['error']
+    finite = np.isfinite(times) & np.isfinite(errors)
+    times, errors = times[finite], errors[finite]
+    if len(errors) < 8:
+        return None
+    
+    errors = errors - errors.mean()
+    half = len(errors) // 2
+    first = np.ptp(errors[:half])
+    second = np.ptp(errors[half:])
+    if second < threshold or second < sustain * first:
+        return None
+    
+    crossings = np.flatnonzero(np.signbit(errors[1:]) != np.signbit(errors[:-1]))
+    if len(crossings) < 4:
+        return None
+    return float(2.0 * np.mean(np.diff(times[crossings])))
+
+
+class AutoTuner(threading.Thread):
+    
+    def __init__(self, send_gains: Callable[[float, float, float], bool], buffer,
+                 method: str = 'nelder_mead', initial: Tuple[float, float, float] = (7.0, 0.5, 0.0),
+                 bounds=DEFAULT_BOUNDS, settle_time: float = 1.0, window: float = 3.0,
+                 max_trials: int = 30, tolerance: float = 0.01,
+                 oscillation_weight: float = 0.05, min_samples: int = 20,
+                 on_trial: Optional[Callable[[dict], None]] = None):
+        super().__init__(name="AutoTuner", daemon=True)
+        if method not in TUNING_METHODS:
+            raise ValueError(f"Unknown tuning method: {method}")
+        self.send_gains = send_gains
+        self.buffer = buffer
+        self.method = method
+        self.initial = np.asarray(initial, dtype=np.float64)
+        self.bounds = np.asarray(bounds, dtype=np.float64)
+        self.settle_time = settle_time
+        self.window = window
+        self.max_trials = max_trials
+        self.tolerance = tolerance
+        self.oscillation_weight = oscillation_weight
+        self.min_samples = min_samples
+        self.on_trial = on_trial
+        self.trials: List[dict] = []
+        self.best: Optional[dict] = None
+        self.status = 'idle'
+        self.message = ''
+        self._stop_event = threading.Event()
+    
+    def run(self):
+        self.status = 'running'
+        status = 'failed'
+        try:
+            try:
+                if self.method == 'ziegler_nichols':
+                    self._ziegler_nichols()
+                else:
+                    self._nelder_mead()
+            except (StopIteration, RuntimeError) as e:
+                self.message = str(e)
+            
+            if self.best is not None:
+                self._send(self.best['gains'])
+            else:
+                self._send(self._clip(self.initial))
+            if self._stop_event.is_set():
+                status = 'stopped'
+            elif self.best is not None:
+                status = 'done'
+        except Exception as e:
+            self.message = f"Error: {e}"
+        finally:
+            self.status = status
+    
+    def _clip(self, gains) -> np.ndarray:
+        return np.round(np.clip(gains, self.bounds[:, 0], self.bounds[:, 1]), 3)
+    
+    def _send(self, gains) -> bool:
+        return self.send_gains(*(float(g) for g in gains))
+    
+    def _wait(self, seconds: float):
+        if self._stop_event.wait(seconds):
+            raise StopIteration("Tuning stopped")
+    
+    def _collect(self, gains) -> Dict[str, np.ndarray]:
+        if len(self.trials) >= self.max_trials:
+            raise StopIteration("Trial budget exhausted")
+        if not self._send(gains):
+            raise RuntimeError("Failed to send PID values")
+        
+        self._wait(self.settle_time)
+        start = self.buffer.write_index
+        self._wait(self.window)
+        columns, _, _ = self.buffer.since(start)
+        if np.isfinite(columns['error']).sum() < self.min_samples:
+            raise RuntimeError("Not enough telemetry during trial")
+        return columns
+    
+    def _record(self, gains, columns, candidate: bool = True) -> dict:
+        trial = score_window(columns, self.oscillation_weight)
+        trial['gains'] = tuple(float(g) for g in gains)
+        trial['index'] = len(self.trials)
+        self.trials.append(trial)
+        if candidate and (self.best is None or trial['score'] < self.best['score']):
+            self.best = trial
+        if self.on_trial:
+            self.on_trial(trial)
+        return trial
+    
+    def evaluate(self, gains) -> float:
+        gains = self._clip(gains)
+        return self._record(gains, self._collect(gains))['score']
+    
+    def _nelder_mead(self):
+        span = self.bounds[:, 1] - self.bounds[:, 0]
+        simplex = [self._clip(self.initial)]
+        for axis in range(len(self.initial)):
+            vertex = simplex[0].copy()
+            step = 0.1 * span[axis]
+            vertex[axis] += step if vertex[axis] + step <= self.bounds[axis, 1] else -step
+            simplex.append(self._clip(vertex))
+        scores = [self.evaluate(vertex) for vertex in simplex]
+        
+        while True:
+            order = np.argsort(scores)
+            simplex = [simplex[i] for i in order]
+            scores = [scores[i] for i in order]
+            if abs(scores[-1] - scores[0]) <= self.tolerance * max(abs(scores[0]), 1e-9):
+                self.message = "Converged"
+                return
+            
+            centroid = np.mean(simplex[:-1], axis=0)
+            reflected = self._clip(centroid + (centroid - simplex[-1]))
+            reflected_score = self.evaluate(reflected)
+            if reflected_score < scores[0]:
+                expanded = self._clip(centroid + 2.0 * (centroid - simplex[-1]))
+                expanded_score = self.evaluate(expanded)
+                if expanded_score < reflected_score:
+                    simplex[-1], scores[-1] = expanded, expanded_score
+                else:
+                    simplex[-1], scores[-1] = reflected, reflected_score
+                continue
+            if reflected_score < scores[-2]:
+                simplex[-1], scores[-1] = reflected, reflected_score
+                continue
+            
+            contracted = self._clip(centroid + 0.5 * (simplex[-1] - centroid))
+            contracted_score = self.evaluate(contracted)
+            if contracted_score < scores[-1]:
+                simplex[-1], scores[-1] = contracted, contracted_score
+                continue
+            
+            for i in range(1, len(simplex)):
+                simplex[i] = self._clip(simplex[0] + 0.5 * (simplex[i] - simplex[0]))
+                scores[i] = self.evaluate(simplex[i])
+    
+    def _ziegler_nichols(self):
+        low, high = self.bounds[0]
+        steps = max(2, self.max_trials - 1)
+        for kp in np.linspace(max(low, high / steps), high, steps):
+            gains = self._clip((kp, 0.0, 0.0))
+            columns = self._collect(gains)
+            self._record(gains, columns, candidate=False)
+            period = oscillation_period(columns)
+            if period is None:
+                continue
+            
+            ultimate = float(gains[0])
+            gains = self._clip((0.6 * ultimate, 1.2 * ultimate / period, 0.075 * ultimate * period))
+            self.message = f"Ku={ultimate:.3f}, Tu={period:.3f} s"
+            self._record(gains, self._collect(gains))
+            return
+        raise RuntimeError("No sustained oscillation found")
+    
+    def progress(self) -> dict:
+        return {
+            'status': self.status,
+            'method': self.method,
+            'trials': len(self.trials),
+            'max_trials': self.max_trials,
+            'best': self.best,
+            'message': self.message
+        }
+    
+    def stop(self):
+        self._stop_event.set()
+        if self.is_alive():
+            self.join(timeout=self.settle_time + self.window + 1.0)
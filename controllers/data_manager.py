@@ -1,92 +1,295 @@
-from typing import Optional, Callable
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from typing import Optional, Callable, List, Dict, Tuple
+import numpy as np
 from models import (
-    IMUData, IConnection, SerialConnection, WiFiConnection, MQTTConnection,
-    DataParser, DataSimulator, DataLogger
+    IMUData, IAsyncConnection, AsyncSerialConnection, AsyncTCPConnection,
+    AsyncMQTTConnection, ReplayConnection, SimulatedConnection, samples_from_columns,
+    list_serial_ports, METRICS
 )
+from .async_acquisition import AsyncLoopThread
+from .auto_tuner import AutoTuner
+from .device import Device, DEFAULT_DEVICE, CONNECT_TIMEOUT
+from .supervisor import Supervisor
 
 
 class DataManager:
     
-    def __init__(self):
-        self.connection: Optional[IConnection] = None
-        self.parser = DataParser()
-        self.simulator = DataSimulator()
-        self.logger: Optional[DataLogger] = None
-        self.is_simulation = False
+    def __init__(self, buffer_size: int = 100000, history_dir: Optional[str] = None,
+                 workers: int = 4, watchdog: Optional[float] = 3.0,
+                 keep_history: bool = True):
+        self.buffer_size = buffer_size
+        self.history_dir = history_dir
+        self.keep_history = keep_history
+        self.watchdog = watchdog
+        self.bridge = AsyncLoopThread()
+        self.executor = ThreadPoolExecutor(workers, thread_name_prefix="Decode")
+        self.devices: Dict[str, Device] = {}
+        self.hubs: List[AsyncMQTTConnection] = []
+        self.discovered = deque()
+        self.current = DEFAULT_DEVICE
+        self.tuner: Optional[AutoTuner] = None
+        self.add_device(DEFAULT_DEVICE)
         self.data_callback: Optional[Callable[[IMUData], None]] = None
     
     def set_data_callback(self, callback: Callable[[IMUData], None]):
         self.data_callback = callback
     
-    def connect_serial(self, port: str, baudrate: int = 921600) -> bool:
-        self.disconnect()
-        self.connection = SerialConnection(port, baudrate)
-        self.is_simulation = False
-        return self.connection.connect()
+    def add_device(self, name: str) -> Device:
+        if name not in self.devices:
+            self.devices[name] = Device(name, self.buffer_size, self.history_dir,
+                                       self.keep_history)
+        return self.devices[name]
     
-    def connect_wifi(self, host: str, port: int = 8888) -> bool:
-        self.disconnect()
-        self.connection = WiFiConnection(host, port)
-        self.is_simulation = False
-        return self.connection.connect()
+    def remove_device(self, name: str):
+        device = self.devices.pop(name, None)
+        if device:
+            device.close()
+            device.stop_logging()
+        if not self.devices:
+            self.add_device(DEFAULT_DEVICE)
+        if self.current not in self.devices:
+            self.current = next(iter(self.devices))
+    
+    def select_device(self, name: str) -> Device:
+        device = self.add_device(name)
+        self.current = name
+        return device
+    
+    def device_names(self) -> List[str]:
+        return list(self.devices)
+    
+    def active_devices(self) -> List[str]:
+        return [name for name, device in self.devices.items() if device.is_active()]
+    
+    def get_device(self, name: Optional[str] = None) -> Device:
+        return self.devices[name or self.current]
+    
+    @property
+    def device(self) -> Device:
+        return self.devices[self.current]
+    
+    @property
+    def buffer(self):
+        return self.device.buffer
+    
+    @property
+    def history(self):
+        return self.device.history
+    
+    @property
+    def analyzer(self):
+        return self.device.analyzer
+    
+    @property
+    def connection(self):
+        return self.device.connection
+    
+    @property
+    def worker(self):
+        return self.device.worker
+    
+    @property
+    def logger(self):
+        return self.device.logger
+    
+    @property
+    def parser(self):
+        return self.device.parser
+    
+    @property
+    def is_simulation(self) -> bool:
+        return self.device.is_simulation
+    
+    @property
+    def binary_telemetry(self) -> bool:
+        return self.device.binary_telemetry
+    
+    def list_serial_ports(self) -> Future:
+        return self.executor.submit(list_serial_ports)
+    
+    def connect_serial(self, port: str, baudrate: int = 921600,
+                       device: Optional[str] = None) -> bool:
+        return self._open_async(AsyncSerialConnection(port, baudrate), device)
+    
+    def connect_wifi(self, host: str, port: int = 8888, device: Optional[str] = None) -> bool:
+        return self._open_async(AsyncTCPConnection(host, port), device)
     
     def connect_mqtt(self, broker: str, port: int = 1883,
                      topic_data: str = "gimbal/stabilizer",
-                     topic_cmd: str = "gimbal/command") -> bool:
-        self.disconnect()
-        self.connection = MQTTConnection(broker, port, topic_data, topic_cmd)
-        self.is_simulation = False
-        return self.connection.connect()
+                     topic_cmd: str = "gimbal/command",
+                     device: Optional[str] = None) -> bool:
+        return self._open_async(AsyncMQTTConnection(broker, port, topic_data, topic_cmd),
+                                device)
     
-    def start_simulation(self):
-        self.disconnect()
-        self.is_simulation = True
+    def connect_mqtt_hub(self, broker: str, port: int = 1883,
+                         topic_data: str = "gimbal/+/stabilizer",
+                         topic_cmd: str = "gimbal/+/command",
+                         **options) -> AsyncMQTTConnection:
+        hub = AsyncMQTTConnection(broker, port, topic_data, topic_cmd, **options)
+        hub.on_device = partial(self._on_device_discovered, hub)
+        self.hubs.append(hub)
+        self.bridge.submit(hub.ensure_connected())
+        return hub
     
-    def disconnect(self):
-        if self.connection:
-            self.connection.disconnect()
-            self.connection = None
-        self.is_simulation = False
+    def _on_device_discovered(self, hub: AsyncMQTTConnection, device_id: str):
+        self.discovered.append((hub, device_id))
     
-    def is_connected(self) -> bool:
-        if self.is_simulation:
-            return True
-        return self.connection is not None and self.connection.is_connected()
+    def update_devices(self) -> List[str]:
+        added = []
+        while self.discovered:
+            hub, device_id = self.discovered.popleft()
+            device = self.add_device(device_id or hub.topic_data)
+            if not device.is_active():
+                device.open(hub.channel(device_id), self.bridge, self.executor,
+                            Supervisor(self.watchdog))
+                added.append(device.name)
+        return added
     
-    def start_logging(self, filename: str = None):
-        self.logger = DataLogger(filename)
+    def poll_connects(self) -> List[str]:
+        return [name for name, device in self.devices.items()
+                if device.poll_connect() is False]
     
-    def stop_logging(self):
-        self.logger = None
+    def wait_connected(self, device: Optional[str] = None,
+                       timeout: float = CONNECT_TIMEOUT) -> bool:
+        return self.get_device(device).poll_connect(timeout) is not False
     
-    def is_logging(self) -> bool:
-        return self.logger is not None
+    def connect_replay(self, path: str, speed: Optional[float] = 1.0,
+                       loop: bool = False, device: Optional[str] = None) -> bool:
+        return self.add_device(device or self.current).open_local(
+            ReplayConnection(path, speed, loop)
+        )
     
-    def get_log_filename(self) -> Optional[str]:
-        return self.logger.get_filename() if self.logger else None
+    def _open_async(self, connection: IAsyncConnection, device: Optional[str]) -> bool:
+        return self.add_device(device or self.current).open(
+            connection, self.bridge, self.executor, Supervisor(self.watchdog)
+        )
     
-    def read_data(self) -> Optional[IMUData]:
-        data = None
-        
-        if self.is_simulation:
-            data = self.simulator.generate()
+    def start_simulation(self, rate: float = 100.0, device: Optional[str] = None,
+                         **options) -> bool:
+        return self.add_device(device or self.current).start_simulation(
+            SimulatedConnection(rate, **options)
+        )
+    
+    def set_binary_telemetry(self, enabled: bool, device: Optional[str] = None) -> bool:
+        return self.get_device(device).set_binary_telemetry(enabled)
+    
+    def disconnect(self, device: Optional[str] = None):
+        self.get_device(device).close()
+    
+    def disconnect_all(self):
+        for device in self.devices.values():
+            device.close()
+        hubs, self.hubs = self.hubs, []
+        for hub in hubs:
+            try:
+                self.bridge.call(hub.disconnect())
+            except Exception as e:
+                print(f"Error: {e}")
+    
+    def is_connected(self, device: Optional[str] = None) -> bool:
+        return self.get_device(device).is_connected()
+    
+    def is_active(self, device: Optional[str] = None) -> bool:
+        return self.get_device(device).is_active()
+    
+    def get_connection_state(self, device: Optional[str] = None) -> str:
+        return self.get_device(device).get_connection_state()
+    
+    def start_logging(self, filename: str = None, fmt: str = 'csv',
+                      device: Optional[str] = None, **options):
+        self.get_device(device).start_logging(filename, fmt, **options)
+    
+    def stop_logging(self, device: Optional[str] = None):
+        self.get_device(device).stop_logging()
+    
+    def stop_all_logging(self):
+        for device in self.devices.values():
+            device.stop_logging()
+    
+    def is_logging(self, device: Optional[str] = None) -> bool:
+        return self.get_device(device).logger is not None
+    
+    def logging_devices(self) -> List[str]:
+        return [name for name, device in self.devices.items() if device.logger is not None]
+    
+    def get_log_filename(self, device: Optional[str] = None) -> Optional[str]:
+        logger = self.get_device(device).logger
+        return logger.get_filename() if logger else None
+    
+    def read_columns(self, max_items: Optional[int] = None,
+                     device: Optional[str] = None) -> Dict[str, np.ndarray]:
+        return self.get_device(device).read_columns(max_items)
+    
+    def read_batch(self) -> List[IMUData]:
+        columns = self.read_columns()
+        samples = samples_from_columns(columns, columns['time'])
         
-        elif self.connection and self.connection.is_connected():
-            line = self.connection.read_line()
-            if line:
-                data = self.parser.parse(line)
+        if self.data_callback and samples:
+            start = time.perf_counter()
+            for data in samples:
+                self.data_callback(data)
+            METRICS.record('data_callback', time.perf_counter() - start)
         
-        if data and self.logger:
-            self.logger.log(data)
+        return samples
+    
+    def read_data(self) -> Optional[IMUData]:
+        columns = self.read_columns(1)
+        samples = samples_from_columns(columns, columns['time'])
+        data = samples[0] if samples else None
         
         if data and self.data_callback:
+            start = time.perf_counter()
             self.data_callback(data)
+            METRICS.record('data_callback', time.perf_counter() - start)
         
         return data
     
-    def send_pid_values(self, kp: float, ki: float, kd: float) -> bool:
-        if not self.connection or not self.connection.is_connected():
+    def get_acquisition_stats(self, device: Optional[str] = None) -> dict:
+        return self.get_device(device).get_acquisition_stats()
+    
+    def get_stream_stats(self, device: Optional[str] = None) -> dict:
+        return self.get_device(device).get_stream_stats()
+    
+    def get_analysis(self, device: Optional[str] = None) -> dict:
+        return self.get_device(device).analyzer.summary()
+    
+    def send_pid_values(self, kp: float, ki: float, kd: float,
+                        device: Optional[str] = None) -> bool:
+        return self.get_device(device).send_command(f"PID:{kp},{ki},{kd}")
+    
+    def start_autotune(self, method: str = 'nelder_mead',
+                       initial: Tuple[float, float, float] = (7.0, 0.5, 0.0),
+                       device: Optional[str] = None, **options) -> bool:
+        self.stop_autotune()
+        name = device or self.current
+        target = self.get_device(name)
+        if not target.is_connected():
             return False
         
-        command = f"PID:{kp},{ki},{kd}"
-        return self.connection.send_command(command)
+        self.tuner = AutoTuner(partial(self._send_tuning_gains, name), target.buffer,
+                               method, initial, **options)
+        self.tuner.start()
+        return True
+    
+    def _send_tuning_gains(self, device: str, kp: float, ki: float, kd: float) -> bool:
+        return self.send_pid_values(kp, ki, kd, device)
+    
+    def stop_autotune(self):
+        if self.tuner:
+            self.tuner.stop()
+    
+    def is_tuning(self) -> bool:
+        return self.tuner is not None and self.tuner.is_alive()
+    
+    def get_tuning_progress(self) -> Optional[dict]:
+        return self.tuner.progress() if self.tuner else None
+    
+    def shutdown(self):
+        self.stop_autotune()
+        self.disconnect_all()
+        self.stop_all_logging()
+        self.bridge.stop()
+        self.executor.shutdown(wait=False)
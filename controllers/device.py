@@ -0,0 +1,182 @@
+import re
+import time
+from concurrent.futures import Executor, Future, TimeoutError as FutureTimeoutError
+from pathlib import Path
+from typing import Optional, Dict, Union
+import numpy as np
+from models import (
+    IConnection, IAsyncConnection, DataParser, DataLogger, SampleBuffer, HistoryStore,
+    StreamAnalyzer
+)
+from .acquisition_worker import AcquisitionWorker
+from .async_acquisition import AsyncLoopThread, AsyncAcquisition
+from .supervisor import Supervisor
+
+
+DEFAULT_DEVICE = 'default'
+CONNECT_TIMEOUT = 10.0
+
+
+class Device:
+    
+    def __init__(self, name: str, buffer_size: int = 100000,
+                 history_dir: Optional[str] = None, keep_history: bool = True):
+        self.name = name
+        self.connection: Optional[Union[IConnection, IAsyncConnection]] = None
+        self.worker: Optional[Union[AcquisitionWorker, AsyncAcquisition]] = None
+        self.buffer = SampleBuffer(buffer_size)
+        self.history = HistoryStore(
+            spill_dir=str(Path(history_dir) / self.slug) if history_dir else None
+        ) if keep_history else None
+        self.analyzer = StreamAnalyzer()
+        self.read_index = 0
+        self.overruns = 0
+        self.parser = DataParser()
+        self.logger: Optional[DataLogger] = None
+        self.is_simulation = False
+        self.binary_telemetry = False
+        self.first_connect: Optional[Future] = None
+        self.connect_deadline = 0.0
+    
+    @property
+    def slug(self) -> str:
+        return re.sub(r'[^\w.-]+', '_', self.name)
+    
+    def open(self, connection: IAsyncConnection, bridge: AsyncLoopThread,
+             executor: Optional[Executor] = None,
+             supervisor: Optional[Supervisor] = None) -> bool:
+        self.close()
+        self.analyzer.reset()
+        self.connection = connection
+        self.worker = AsyncAcquisition(connection, self.buffer, bridge, self.parser,
+                                       on_columns=self.store_columns,
+                                       supervisor=supervisor, executor=executor)
+        self.first_connect = self.worker.start()
+        self.connect_deadline = time.monotonic() + CONNECT_TIMEOUT
+        return True
+    
+    def poll_connect(self, timeout: Optional[float] = 0) -> Optional[bool]:
+        if self.first_connect is None:
+            return None
+        try:
+            connected = self.first_connect.result(timeout)
+        except FutureTimeoutError:
+            if time.monotonic() < self.connect_deadline:
+                return None
+            print(f"Connection timed out after {CONNECT_TIMEOUT} s")
+            connected = False
+        
+        self.first_connect = None
+        if not connected:
+            self.close()
+        return connected
+    
+    def open_local(self, connection: IConnection) -> bool:
+        self.close()
+        self.analyzer.reset()
+        self.connection = connection
+        if not connection.connect():
+            return False
+        
+        self.worker = AcquisitionWorker(connection, self.buffer, self.parser,
+                                        on_columns=self.store_columns)
+        self.worker.start()
+        return True
+    
+    def start_simulation(self, connection: IConnection) -> bool:
+        if not self.open_local(connection):
+            return False
+        self.is_simulation = True
+        return True
+    
+    def close(self):
+        if self.worker:
+            self.worker.stop()
+            self.worker = None
+        if isinstance(self.connection, IConnection):
+            self.connection.disconnect()
+        self.connection = None
+        self.first_connect = None
+        self.is_simulation = False
+        self.binary_telemetry = False
+    
+    def is_connected(self) -> bool:
+        return self.worker is not None and self.worker.is_connected()
+    
+    def is_active(self) -> bool:
+        return self.worker is not None
+    
+    def get_connection_state(self) -> str:
+        if isinstance(self.worker, AsyncAcquisition):
+            return self.worker.state
+        return 'connected' if self.is_connected() else 'idle'
+    
+    def send_command(self, command: str) -> bool:
+        if not self.is_connected():
+            return False
+        if not self.worker.send_command(command):
+            return False
+        if command.upper().startswith('PID:'):
+            self.analyzer.mark_step(command)
+        return True
+    
+    def set_binary_telemetry(self, enabled: bool) -> bool:
+        if not self.worker:
+            return False
+        
+        if self.worker.is_connected():
+            if not self.worker.send_command(f"BIN:{1 if enabled else 0}"):
+                return False
+        elif not isinstance(self.worker, AsyncAcquisition):
+            return False
+        
+        self.binary_telemetry = enabled
+        self.worker.set_binary(enabled)
+        return True
+    
+    def start_logging(self, filename: str = None, fmt: str = 'csv', **options):
+        self.stop_logging()
+        prefix = "data_log" if self.name == DEFAULT_DEVICE else f"data_log_{self.slug}"
+        self.logger = DataLogger.create(filename, fmt, prefix=prefix, **options)
+    
+    def stop_logging(self):
+        logger = self.logger
+        self.logger = None
+        if logger:
+            logger.close()
+    
+    def store_columns(self, columns: Dict[str, np.ndarray]):
+        if self.history is not None:
+            self.history.append(columns)
+        logger = self.logger
+        if logger:
+            logger.log_columns(columns)
+    
+    def read_columns(self, max_items: Optional[int] = None) -> Dict[str, np.ndarray]:
+        columns, self.read_index, lost = self.buffer.since(self.read_index, max_items)
+        self.overruns += lost
+        self.analyzer.update(columns)
+        return columns
+    
+    def get_acquisition_stats(self) -> dict:
+        return {
+            'backlog': self.buffer.write_index - self.read_index,
+            'dropped': self.overruns,
+            'lines': self.worker.decoder.lines_read if self.worker else 0,
+            'samples': self.worker.decoder.samples_parsed if self.worker else 0,
+            'malformed': self.parser.malformed,
+            'ingest_dropped': getattr(self.connection, 'dropped', 0),
+            **self.get_supervisor_stats()
+        }
+    
+    def get_supervisor_stats(self) -> dict:
+        supervisor = getattr(self.worker, 'supervisor', None)
+        if supervisor is None:
+            return {'reconnects': 0, 'stalls': 0, 'gaps': 0}
+        summary = supervisor.summary()
+        return {name: summary[name] for name in ('reconnects', 'stalls', 'gaps')}
+    
+    def get_stream_stats(self) -> dict:
+        if not self.worker:
+            return {}
+        return self.worker.decoder.stats.summary()
@@ -0,0 +1,75 @@
+import time
+from typing import Optional, Dict, List
+import numpy as np
+from models import DataParser, BinaryFrameDecoder, LineBuffer, StreamStats, METRICS
+
+
+TEXT_SEQ_MODULUS = 1 << 32
+FRAME_SEQ_MODULUS = 1 << 16
+
+
+class StreamDecoder:
+    
+    def __init__(self, parser: DataParser = None):
+        self.parser = parser or DataParser()
+        self.frames: Optional[BinaryFrameDecoder] = None
+        self.line_buffer = LineBuffer()
+        self.stats = StreamStats(TEXT_SEQ_MODULUS)
+        self.lines_read = 0
+        self.samples_parsed = 0
+    
+    @property
+    def binary(self) -> bool:
+        return self.frames is not None
+    
+    def decode_lines(self, lines: List[str]) -> Optional[Dict[str, np.ndarray]]:
+        if not lines:
+            return None
+        start = time.perf_counter()
+        self.lines_read += len(lines)
+        columns = self._stamp(self.parser.parse_many(lines))
+        METRICS.record('parse', time.perf_counter() - start)
+        return columns
+    
+    def decode_bytes(self, data: bytes) -> Optional[Dict[str, np.ndarray]]:
+        if not data:
+            return None
+        METRICS.count('read.bytes', len(data))
+        frames = self.frames
+        if frames:
+            start = time.perf_counter()
+            columns = self._stamp(frames.decode(data))
+            METRICS.record('parse', time.perf_counter() - start)
+            return columns
+        return self.decode_lines(self.line_buffer.feed(data))
+    
+    def decode_columns(self, columns: Dict[str, np.ndarray]) -> Optional[Dict[str, np.ndarray]]:
+        if not columns or len(columns['time']) == 0:
+            return None
+        count = len(columns['time'])
+        self.stats.update(columns['seq'], columns['device_time_us'], float(columns['time'][-1]))
+        self.samples_parsed += count
+        METRICS.count('samples', count)
+        return columns
+    
+    def _stamp(self, columns: Dict[str, np.ndarray]) -> Optional[Dict[str, np.ndarray]]:
+        count = len(columns['seq'])
+        if count == 0:
+            return None
+        
+        columns = dict(columns)
+        columns['time'] = self.stats.update(columns['seq'], columns['device_time_us'], time.time())
+        self.samples_parsed += count
+        METRICS.count('samples', count)
+        return columns
+    
+    def resync(self):
+        self.line_buffer.clear()
+        if self.frames:
+            self.frames.reset()
+        self.stats.reset_sequence()
+    
+    def set_binary(self, enabled: bool):
+        self.frames = BinaryFrameDecoder() if enabled else None
+        self.line_buffer.clear()
+        self.stats.reset_sequence(FRAME_SEQ_MODULUS if enabled else TEXT_SEQ_MODULUS)
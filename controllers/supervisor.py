@@ -0,0 +1,74 @@
+import random
+import time
+from typing import Dict, List, Optional
+import numpy as np
+from models import SAMPLE_COLUMNS
+
+
+RESUMABLE_COMMANDS = ('BIN', 'PID')
+
+
+def gap_columns(timestamp: float) -> Dict[str, np.ndarray]:
+    columns = {name: np.full(1, np.nan) for name in SAMPLE_COLUMNS}
+    columns['time'][0] = timestamp
+    return columns
+
+
+class Supervisor:
+    
+    def __init__(self, watchdog: Optional[float] = 3.0, initial_delay: float = 0.5,
+                 max_delay: float = 30.0, factor: float = 2.0, jitter: float = 0.2):
+        self.watchdog = watchdog
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.factor = factor
+        self.jitter = jitter
+        self.delay = initial_delay
+        self.commands: Dict[str, str] = {}
+        self.connects = 0
+        self.stalls = 0
+        self.errors = 0
+        self.gaps = 0
+        self.last_data = time.monotonic()
+        self.receiving = False
+    
+    def next_delay(self) -> float:
+        delay = self.delay
+        self.delay = min(self.delay * self.factor, self.max_delay)
+        return delay * random.uniform(1.0 - self.jitter, 1.0)
+    
+    def connected(self):
+        self.connects += 1
+        self.last_data = time.monotonic()
+    
+    def mark_data(self):
+        self.last_data = time.monotonic()
+        self.delay = self.initial_delay
+        self.receiving = True
+    
+    def stalled(self) -> bool:
+        return bool(self.watchdog) and time.monotonic() - self.last_data > self.watchdog
+    
+    def lost(self) -> Optional[Dict[str, np.ndarray]]:
+        if not self.receiving:
+            return None
+        self.receiving = False
+        self.gaps += 1
+        return gap_columns(time.time())
+    
+    def record_command(self, command: str):
+        prefix = command.split(':', 1)[0].strip().upper()
+        if prefix in RESUMABLE_COMMANDS:
+            self.commands[prefix] = command
+    
+    def resume_commands(self) -> List[str]:
+        return [self.commands[prefix] for prefix in RESUMABLE_COMMANDS if prefix in self.commands]
+    
+    def summary(self) -> dict:
+        return {
+            'connects': self.connects,
+            'reconnects': max(0, self.connects - 1),
+            'stalls': self.stalls,
+            'errors': self.errors,
+            'gaps': self.gaps
+        }
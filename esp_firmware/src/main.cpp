@@ -20,6 +20,28 @@ Adafruit_SSD1306 display(SCREEN_WIDTH, SCREEN_HEIGHT,
 
 unsigned long lastDataPublish = 0;
 const unsigned long dataPublishInterval = 20;
+uint32_t telemetrySeq = 0;
+unsigned long sampleMicros = 0;
+
+const uint8_t FRAME_SYNC_1 = 0xA5;
+const uint8_t FRAME_SYNC_2 = 0x5A;
+bool binaryTelemetry = false;
+uint16_t frameSeq = 0;
+unsigned long lastBinaryPublish = 0;
+const unsigned long binaryPublishIntervalUs = 2000;
+
+struct __attribute__((packed)) TelemetryFrame {
+  uint8_t sync1;
+  uint8_t sync2;
+  uint16_t seq;
+  uint32_t timeUs;
+  float roll;
+  float gyroRate;
+  float servo;
+  float error;
+  float integral;
+  uint16_t crc;
+};
 
 Adafruit_MPU6050 mpu;
 Servo servoRoll;
@@ -50,6 +72,32 @@ unsigned long lastTime = 0;
 float dt = 0.01;
 float alpha = 0.96;
 
+uint16_t crc16(const uint8_t *data, size_t length) {
+  uint16_t crc = 0xFFFF;
+  for (size_t i = 0; i < length; i++) {
+    crc ^= (uint16_t)data[i] << 8;
+    for (uint8_t bit = 0; bit < 8; bit++) {
+      crc = (crc & 0x8000) ? (crc << 1) ^ 0x1021 : crc << 1;
+    }
+  }
+  return crc;
+}
+
+void sendBinaryFrame(unsigned long timeUs, float gyroRate) {
+  TelemetryFrame frame;
+  frame.sync1 = FRAME_SYNC_1;
+  frame.sync2 = FRAME_SYNC_2;
+  frame.seq = frameSeq++;
+  frame.timeUs = timeUs;
+  frame.roll = angleRoll;
+  frame.gyroRate = gyroRate;
+  frame.servo = servoRollPos;
+  frame.error = errorRoll;
+  frame.integral = integralRoll;
+  frame.crc = crc16((const uint8_t *)&frame, sizeof(frame) - sizeof(frame.crc));
+  Serial.write((const uint8_t *)&frame, sizeof(frame));
+}
+
 void updateOLED() {
   display.clearDisplay();
   display.setTextSize(1);
@@ -160,6 +208,12 @@ void loop() {
         Serial.print(", Kd: ");
         Serial.println(Kd, 2);
       }
+    } else if (command.startsWith("BIN:")) {
+      bool enable = command.substring(4).toInt() != 0;
+      Serial.println(enable ? "Binary telemetry ON" : "Binary telemetry OFF");
+      binaryTelemetry = enable;
+      frameSeq = 0;
+      lastBinaryPublish = micros();
     }
   }
   
@@ -169,6 +223,7 @@ void loop() {
     delay(10);
     return;
   }
+  sampleMicros = micros();
   
   unsigned long currentTime = millis();
   dt = (currentTime - lastTime) / 1000.0;
@@ -203,7 +258,13 @@ void loop() {
   servoRoll.write(servoRollPos);
   
   unsigned long currentMillis = millis();
-  if (currentMillis - lastDataPublish >= dataPublishInterval) {
+  unsigned long currentMicros = micros();
+  if (binaryTelemetry) {
+    if (currentMicros - lastBinaryPublish >= binaryPublishIntervalUs) {
+      lastBinaryPublish = currentMicros;
+      sendBinaryFrame(sampleMicros, gyroRateRoll);
+    }
+  } else if (currentMillis - lastDataPublish >= dataPublishInterval) {
     lastDataPublish = currentMillis;
     
     Serial.print("{\"r\":");
@@ -216,6 +277,10 @@ void loop() {
     Serial.print(errorRoll, 2);
     Serial.print(",\"i\":");
     Serial.print(integralRoll, 1);
+    Serial.print(",\"t\":");
+    Serial.print(sampleMicros);
+    Serial.print(",\"n\":");
+    Serial.print(telemetrySeq++);
     Serial.println("}");
   }
   
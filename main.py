@@ -1,13 +1,44 @@
+import argparse
+import os
 import sys
 from PyQt5.QtWidgets import QApplication
 from views import BallStabilizerDashboard
 
 
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Ball Stabilizer Dashboard")
+    parser.add_argument('--plot-backend', choices=['matplotlib', 'pyqtgraph'],
+                        default=os.environ.get('STABILIZER_PLOT_BACKEND', 'matplotlib'),
+                        help="plotting engine for the live view")
+    parser.add_argument('--max-points', type=int, default=None,
+                        help="samples kept in the plot window")
+    parser.add_argument('--metrics-port', type=int, default=None,
+                        help="serve Prometheus metrics on this local HTTP port")
+    parser.add_argument('--metrics-file', default=None,
+                        help="periodically write metrics to this file (.json or Prometheus text)")
+    parser.add_argument('--metrics-interval', type=float, default=5.0,
+                        help="seconds between metrics file writes")
+    return parser.parse_known_args(argv)
+
+
 def main():
-    app = QApplication(sys.argv)
-    window = BallStabilizerDashboard()
+    args, qt_args = parse_args(sys.argv[1:])
+    app = QApplication(sys.argv[:1] + qt_args)
+    window = BallStabilizerDashboard(plot_backend=args.plot_backend,
+                                     max_points=args.max_points)
     window.show()
-    sys.exit(app.exec_())
+    
+    exporter = None
+    if args.metrics_port is not None or args.metrics_file:
+        from models import MetricsExporter
+        exporter = MetricsExporter(path=args.metrics_file, port=args.metrics_port,
+                                   interval=args.metrics_interval)
+        exporter.start()
+    
+    status = app.exec_()
+    if exporter:
+        exporter.stop()
+    sys.exit(status)
 
 
 if __name__ == '__main__':
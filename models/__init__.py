@@ -1,15 +1,91 @@
+import importlib
 from .imu_data import IMUData
-from .connection import IConnection, SerialConnection, WiFiConnection, MQTTConnection
-from .data_processor import DataParser, DataSimulator
+from .ingest_queue import IngestQueue
+from .connection import IConnection, IColumnConnection, LineBuffer, list_serial_ports
+from .async_connection import (
+    IAsyncConnection, AsyncSerialConnection, AsyncTCPConnection, AsyncMQTTConnection,
+    AsyncMQTTChannel
+)
+from .data_processor import (
+    DataParser, BinaryFrameDecoder, samples_from_columns,
+    columns_from_samples
+)
+from .stream_stats import StreamStats
+from .log_writer import ILogWriter, CSVLogWriter
+from .columnar_log import ColumnarLogWriter, ColumnarLog
 from .data_logger import DataLogger
+from .replay_connection import ReplayConnection
+from .plant_simulator import GimbalPlant, SimulatedConnection
+from .sample_buffer import SampleBuffer, SAMPLE_COLUMNS
+from .decimation import MinMaxDecimator, minmax_decimate
+from .history_store import HistoryStore
+from .instrumentation import Instrumentation, LatencyHistogram, METRICS
+from .signal_analysis import StreamAnalyzer
+
+LAZY_IMPORTS = {
+    'SWEEP_PARAMETERS': 'parameter_sweep',
+    'SWEEP_METRICS': 'parameter_sweep',
+    'gain_grid': 'parameter_sweep',
+    'simulate_batch': 'parameter_sweep',
+    'sweep': 'parameter_sweep',
+    'rank_sweep': 'parameter_sweep',
+    'write_sweep_csv': 'parameter_sweep',
+    'MetricsExporter': 'metrics_exporter'
+}
 
 __all__ = [
     'IMUData',
     'IConnection',
-    'SerialConnection',
-    'WiFiConnection',
-    'MQTTConnection',
+    'IColumnConnection',
+    'LineBuffer',
+    'list_serial_ports',
+    'IngestQueue',
+    'IAsyncConnection',
+    'AsyncSerialConnection',
+    'AsyncTCPConnection',
+    'AsyncMQTTConnection',
+    'AsyncMQTTChannel',
     'DataParser',
-    'DataSimulator',
-    'DataLogger'
+    'BinaryFrameDecoder',
+    'samples_from_columns',
+    'columns_from_samples',
+    'StreamStats',
+    'ILogWriter',
+    'CSVLogWriter',
+    'ColumnarLogWriter',
+    'ColumnarLog',
+    'DataLogger',
+    'ReplayConnection',
+    'GimbalPlant',
+    'SimulatedConnection',
+    'SWEEP_PARAMETERS',
+    'SWEEP_METRICS',
+    'gain_grid',
+    'simulate_batch',
+    'sweep',
+    'rank_sweep',
+    'write_sweep_csv',
+    'SampleBuffer',
+    'SAMPLE_COLUMNS',
+    'MinMaxDecimator',
+    'minmax_decimate',
+    'HistoryStore',
+    'Instrumentation',
+    'LatencyHistogram',
+    'METRICS',
+    'MetricsExporter',
+    'StreamAnalyzer'
 ]
+
+
+def __getattr__(name):
+    module = LAZY_IMPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{module}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
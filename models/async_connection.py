@@ -0,0 +1,408 @@
+import asyncio
+import random
+import select
+from abc import ABC, abstractmethod
+from typing import AsyncIterator, Optional, Callable, Dict, List
+from .connection import topic_device_id, device_topic, load_mqtt
+from .ingest_queue import IngestQueue
+
+
+class IAsyncConnection(ABC):
+    
+    @abstractmethod
+    async def connect(self) -> bool:
+        pass
+    
+    @abstractmethod
+    async def disconnect(self):
+        pass
+    
+    @abstractmethod
+    def is_connected(self) -> bool:
+        pass
+    
+    @abstractmethod
+    async def read(self) -> bytes:
+        pass
+    
+    @abstractmethod
+    async def send_command(self, command: str) -> bool:
+        pass
+    
+    async def stream(self) -> AsyncIterator[bytes]:
+        while self.is_connected():
+            data = await self.read()
+            if not data:
+                return
+            yield data
+
+
+class AsyncSerialConnection(IAsyncConnection):
+    
+    def __init__(self, port: str, baudrate: int = 921600, chunk_size: int = 65536):
+        self.port = port
+        self.baudrate = baudrate
+        self.chunk_size = chunk_size
+        self.serial = None
+    
+    async def connect(self) -> bool:
+        loop = asyncio.get_running_loop()
+        try:
+            import serial
+            self.serial = await loop.run_in_executor(
+                None, lambda: serial.Serial(self.port, self.baudrate, timeout=0)
+            )
+            return True
+        except Exception as e:
+            print(f"Error serial: {e}")
+            self.serial = None
+            return False
+    
+    async def disconnect(self):
+        port, self.serial = self.serial, None
+        if port and port.is_open:
+            port.close()
+    
+    def is_connected(self) -> bool:
+        return self.serial is not None and self.serial.is_open
+    
+    async def _readable(self):
+        loop = asyncio.get_running_loop()
+        try:
+            fileno = self.serial.fileno()
+        except (AttributeError, OSError):
+            await asyncio.sleep(0.005)
+            return
+        
+        ready = loop.create_future()
+        loop.add_reader(fileno, lambda: ready.done() or ready.set_result(None))
+        try:
+            await ready
+        finally:
+            loop.remove_reader(fileno)
+    
+    async def read(self) -> bytes:
+        while self.is_connected():
+            try:
+                data = self.serial.read(min(self.serial.in_waiting, self.chunk_size) or 1)
+                if data:
+                    return data
+                await self._readable()
+            except Exception as e:
+                print(f"Error: {e}")
+                await self.disconnect()
+        return b''
+    
+    async def send_command(self, command: str) -> bool:
+        if not self.is_connected():
+            return False
+        try:
+            if not command.endswith('\n'):
+                command += '\n'
+            self.serial.write(command.encode('utf-8'))
+            return True
+        except Exception as e:
+            print(f"Error: {e}")
+            return False
+
+
+class AsyncTCPConnection(IAsyncConnection):
+    
+    def __init__(self, host: str, port: int = 8888, timeout: float = 5.0,
+                 chunk_size: int = 65536):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.chunk_size = chunk_size
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+    
+    async def connect(self) -> bool:
+        try:
+            self.reader, self.writer = await asyncio.wait_for(
+                asyncio.open_connection(self.host, self.port), self.timeout
+            )
+            return True
+        except Exception as e:
+            print(f"Error WiFi: {e}")
+            return False
+    
+    async def disconnect(self):
+        writer, self.writer = self.writer, None
+        self.reader = None
+        if writer:
+            try:
+                writer.close()
+                await writer.wait_closed()
+            except Exception:
+                pass
+    
+    def is_connected(self) -> bool:
+        return self.writer is not None
+    
+    async def read(self) -> bytes:
+        if not self.is_connected():
+            return b''
+        try:
+            data = await self.reader.read(self.chunk_size)
+        except Exception as e:
+            print(f"Error: {e}")
+            data = b''
+        if not data:
+            await self.disconnect()
+        return data
+    
+    async def send_command(self, command: str) -> bool:
+        if not self.is_connected():
+            return False
+        try:
+            if not command.endswith('\n'):
+                command += '\n'
+            self.writer.write(command.encode('utf-8'))
+            await self.writer.drain()
+            return True
+        except Exception as e:
+            print(f"Error: {e}")
+            return False
+
+
+class AsyncMQTTConnection(IAsyncConnection):
+    
+    def __init__(self, broker: str, port: int = 1883,
+                 topic_data: str = "gimbal/stabilizer",
+                 topic_cmd: str = "gimbal/command",
+                 timeout: float = 5.0, max_queue: int = 10000,
+                 overflow: str = 'drop_oldest', max_batch: int = 1024,
+                 on_device: Optional[Callable[[str], None]] = None):
+        self.mqtt = load_mqtt()
+        self.broker = broker
+        self.port = port
+        self.topic_data = topic_data
+        self.topic_cmd = topic_cmd
+        self.timeout = timeout
+        self.max_queue = max_queue
+        self.overflow = overflow
+        self.max_batch = max_batch
+        self.on_device = on_device
+        self.client = None
+        self.connected = False
+        self.queues: Dict[str, IngestQueue] = {}
+        self.events: Dict[str, asyncio.Event] = {}
+        self.any_event = asyncio.Event()
+        self.paused = False
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._sock = None
+        self._connect_result: Optional[asyncio.Future] = None
+        self._connect_lock = asyncio.Lock()
+        self._misc_task: Optional[asyncio.Task] = None
+    
+    def _create_client(self):
+        client_id = f"Dashboard-{random.randint(0, 0xFFFF):04X}"
+        try:
+            from paho.mqtt.client import CallbackAPIVersion
+            client = self.mqtt.Client(callback_api_version=CallbackAPIVersion.VERSION1,
+                                 client_id=client_id)
+        except (ImportError, AttributeError):
+            client = self.mqtt.Client(client_id)
+        
+        loop = self._loop
+        client.on_connect = self._on_connect
+        client.on_disconnect = self._on_disconnect
+        client.on_message = self._on_message
+        client.on_socket_open = lambda c, u, sock: self._in_loop(self._watch, c, sock)
+        client.on_socket_close = lambda c, u, sock: self._in_loop(self._unwatch, sock)
+        client.on_socket_register_write = lambda c, u, sock: self._in_loop(
+            loop.add_writer, sock, c.loop_write)
+        client.on_socket_unregister_write = lambda c, u, sock: self._in_loop(
+            loop.remove_writer, sock)
+        return client
+    
+    def _watch(self, client, sock):
+        self._sock = sock
+        self.paused = False
+        self._loop.add_reader(sock, self._on_readable, client, sock)
+    
+    def _unwatch(self, sock):
+        if sock is self._sock:
+            self._sock = None
+        if not self.paused:
+            self._loop.remove_reader(sock)
+        self.paused = False
+    
+    def _on_readable(self, client, sock):
+        for _ in range(self.max_batch):
+            if client.loop_read() != self.mqtt.MQTT_ERR_SUCCESS or self.paused:
+                return
+            if not select.select([sock], [], [], 0)[0]:
+                return
+    
+    def _in_loop(self, method, *args):
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            method(*args)
+        else:
+            self._loop.call_soon_threadsafe(method, *args)
+    
+    def _on_connect(self, client, userdata, flags, rc):
+        if rc == 0:
+            self.connected = True
+            client.subscribe(self.topic_data)
+        else:
+            print(f"MQTT Connection failed with code {rc}")
+        if self._connect_result and not self._connect_result.done():
+            self._connect_result.set_result(rc == 0)
+    
+    def _on_disconnect(self, client, userdata, rc):
+        self.connected = False
+        self._wake_all()
+    
+    def _on_message(self, client, userdata, msg):
+        device_id = topic_device_id(self.topic_data, msg.topic)
+        if device_id is None:
+            return
+        
+        queue = self.queue(device_id)
+        queue.put(msg.payload, block=False)
+        self.events[device_id].set()
+        self.any_event.set()
+        if self.overflow == 'block' and queue.full() and self._sock is not None:
+            self._loop.remove_reader(self._sock)
+            self.paused = True
+    
+    def _resume(self):
+        if self.paused and self._sock is not None and \
+                not any(queue.full() for queue in self.queues.values()):
+            self.paused = False
+            self._loop.add_reader(self._sock, self._on_readable, self.client, self._sock)
+    
+    def _wake_all(self):
+        for event in self.events.values():
+            event.set()
+        self.any_event.set()
+    
+    def queue(self, device_id: str = '') -> IngestQueue:
+        queue = self.queues.get(device_id)
+        if queue is None:
+            queue = self.queues[device_id] = IngestQueue(self.max_queue, self.overflow)
+            self.events[device_id] = asyncio.Event()
+            if self.on_device:
+                self.on_device(device_id)
+        return queue
+    
+    def device_ids(self) -> List[str]:
+        return list(self.queues)
+    
+    def channel(self, device_id: str) -> 'AsyncMQTTChannel':
+        return AsyncMQTTChannel(self, device_id)
+    
+    @property
+    def dropped(self) -> int:
+        return sum(queue.dropped for queue in self.queues.values())
+    
+    async def _misc_loop(self, client):
+        while self.client is client:
+            client.loop_misc()
+            await asyncio.sleep(1.0)
+    
+    async def connect(self) -> bool:
+        if self.client is not None:
+            await self.disconnect()
+        self._loop = asyncio.get_running_loop()
+        self._connect_result = self._loop.create_future()
+        self.client = self._create_client()
+        try:
+            await self._loop.run_in_executor(None, self.client.connect,
+                                             self.broker, self.port, 60)
+            self._misc_task = asyncio.ensure_future(self._misc_loop(self.client))
+            return await asyncio.wait_for(self._connect_result, self.timeout)
+        except Exception as e:
+            print(f"Error membuka MQTT connection: {e}")
+            await self.disconnect()
+            return False
+    
+    async def ensure_connected(self) -> bool:
+        async with self._connect_lock:
+            return self.connected or await self.connect()
+    
+    async def disconnect(self):
+        client, self.client = self.client, None
+        if self._misc_task:
+            self._misc_task.cancel()
+            self._misc_task = None
+        if client:
+            try:
+                client.disconnect()
+            except Exception:
+                pass
+        self.connected = False
+        self._wake_all()
+    
+    def is_connected(self) -> bool:
+        return self.connected
+    
+    async def read_device(self, device_id: str) -> bytes:
+        queue = self.queue(device_id)
+        event = self.events[device_id]
+        while self.is_connected():
+            payloads = queue.drain(self.max_batch)
+            if payloads:
+                self._resume()
+                return b'\n'.join(payloads) + b'\n'
+            event.clear()
+            await event.wait()
+        return b''
+    
+    async def read(self) -> bytes:
+        while self.is_connected():
+            payloads = []
+            for queue in self.queues.values():
+                payloads.extend(queue.drain(self.max_batch))
+            if payloads:
+                self._resume()
+                return b'\n'.join(payloads) + b'\n'
+            self.any_event.clear()
+            await self.any_event.wait()
+        return b''
+    
+    async def publish(self, command: str, device_id: str = '') -> bool:
+        if not self.is_connected():
+            return False
+        try:
+            info = self.client.publish(device_topic(self.topic_cmd, device_id), command)
+            return info.rc == self.mqtt.MQTT_ERR_SUCCESS
+        except Exception as e:
+            print(f"Error mengirim MQTT command: {e}")
+            return False
+    
+    async def send_command(self, command: str) -> bool:
+        return await self.publish(command)
+
+
+class AsyncMQTTChannel(IAsyncConnection):
+    
+    def __init__(self, hub: AsyncMQTTConnection, device_id: str):
+        self.hub = hub
+        self.device_id = device_id
+        self.ingest = hub.queue(device_id)
+    
+    @property
+    def dropped(self) -> int:
+        return self.ingest.dropped
+    
+    async def connect(self) -> bool:
+        return await self.hub.ensure_connected()
+    
+    async def disconnect(self):
+        self.hub.events[self.device_id].set()
+    
+    def is_connected(self) -> bool:
+        return self.hub.is_connected()
+    
+    async def read(self) -> bytes:
+        return await self.hub.read_device(self.device_id)
+    
+    async def send_command(self, command: str) -> bool:
+        return await self.hub.publish(command, self.device_id)
@@ -0,0 +1,145 @@
+import json
+import os
+from pathlib import Path
+from typing import List, Dict, Optional, Tuple
+import numpy as np
+from .log_writer import ILogWriter
+
+
+COLUMNAR_FORMAT = "stabilizer-columnar"
+COLUMNAR_VERSION = 2
+HEADER_NAME = "header.json"
+CHUNKS_NAME = "chunks.bin"
+CHUNK_DTYPE = np.dtype([('row', '<i8'), ('rows', '<i8'), ('t0', '<f8'), ('t1', '<f8')])
+
+COLUMNS = [
+    ('time', '<f8'),
+    ('roll', '<f4'),
+    ('gyro_rate', '<f4'),
+    ('servo_pos', '<f4'),
+    ('error', '<f4'),
+    ('integral', '<f4'),
+    ('device_time_us', '<f8'),
+    ('seq', '<f8'),
+]
+
+
+class ColumnarLogWriter(ILogWriter):
+    
+    extension = '.stblog'
+    
+    def __init__(self, columns: List[Tuple[str, str]] = None):
+        self.columns = columns or COLUMNS
+        self.path: Optional[Path] = None
+        self.files = {}
+        self.index = None
+        self.rows = 0
+        self.row_bytes = sum(np.dtype(dtype).itemsize for _, dtype in self.columns)
+    
+    def open(self, filename: str):
+        self.path = Path(filename)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.rows = 0
+        self.files = {
+            name: open(self.path / f"{name}.bin", 'wb')
+            for name, _ in self.columns
+        }
+        self.index = open(self.path / CHUNKS_NAME, 'wb')
+        self._write_header()
+    
+    def clone(self) -> 'ColumnarLogWriter':
+        return ColumnarLogWriter(self.columns)
+    
+    def write(self, columns: Dict[str, np.ndarray]):
+        count = len(columns['time'])
+        if count == 0:
+            return
+        
+        for name, dtype in self.columns:
+            column = columns.get(name)
+            if column is None:
+                column = np.full(count, np.nan)
+            self.files[name].write(np.asarray(column, dtype=dtype).tobytes())
+        for f in self.files.values():
+            f.flush()
+        
+        times = columns['time']
+        chunk = np.array((self.rows, count, times[0], times[-1]), dtype=CHUNK_DTYPE)
+        self.index.write(chunk.tobytes())
+        self.index.flush()
+        self.rows += count
+    
+    def _write_header(self):
+        header = {
+            'format': COLUMNAR_FORMAT,
+            'version': COLUMNAR_VERSION,
+            'rows': self.rows,
+            'columns': [{'name': name, 'dtype': dtype, 'file': f"{name}.bin"}
+                        for name, dtype in self.columns],
+            'chunks': CHUNKS_NAME,
+        }
+        temp = self.path / (HEADER_NAME + '.tmp')
+        with open(temp, 'w') as f:
+            json.dump(header, f)
+        os.replace(temp, self.path / HEADER_NAME)
+    
+    def size(self) -> int:
+        return self.rows * self.row_bytes
+    
+    def close(self):
+        for f in self.files.values():
+            f.close()
+        self.files = {}
+        if self.index is not None:
+            self.index.close()
+            self.index = None
+            self._write_header()
+
+
+class ColumnarLog:
+    
+    def __init__(self, path: str):
+        self.path = Path(path)
+        with open(self.path / HEADER_NAME) as f:
+            self.header = json.load(f)
+        
+        if self.header.get('format') != COLUMNAR_FORMAT:
+            raise ValueError(f"Not a columnar log: {path}")
+        
+        self.chunks = self._read_chunks()
+        self.rows = int(self.chunks['rows'].sum())
+        for column in self.header['columns']:
+            size = (self.path / column['file']).stat().st_size
+            self.rows = min(self.rows, size // np.dtype(column['dtype']).itemsize)
+        
+        self.columns: Dict[str, np.ndarray] = {}
+        for column in self.header['columns']:
+            dtype = np.dtype(column['dtype'])
+            if self.rows == 0:
+                self.columns[column['name']] = np.empty(0, dtype=dtype)
+            else:
+                self.columns[column['name']] = np.memmap(
+                    self.path / column['file'], dtype=dtype, mode='r', shape=(self.rows,)
+                )
+    
+    def _read_chunks(self) -> np.ndarray:
+        chunks = self.header['chunks']
+        if isinstance(chunks, list):
+            return np.array([(chunk['row'], chunk['rows'], chunk['t0'], chunk['t1'])
+                             for chunk in chunks], dtype=CHUNK_DTYPE)
+        
+        data = (self.path / chunks).read_bytes()
+        usable = len(data) - len(data) % CHUNK_DTYPE.itemsize
+        return np.frombuffer(data[:usable], dtype=CHUNK_DTYPE)
+    
+    def __len__(self) -> int:
+        return self.rows
+    
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.columns[name]
+    
+    def time_range(self, t0: float, t1: float) -> Dict[str, np.ndarray]:
+        times = self.columns['time']
+        start = int(np.searchsorted(times, t0, side='left'))
+        stop = int(np.searchsorted(times, t1, side='right'))
+        return {name: column[start:stop] for name, column in self.columns.items()}
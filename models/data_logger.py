@@ -1,34 +1,164 @@
-import csv
+import threading
+import time
 from pathlib import Path
 from datetime import datetime
+from typing import List, Dict, Optional
+import numpy as np
 from .imu_data import IMUData
+from .data_processor import columns_from_samples
+from .log_writer import ILogWriter, CSVLogWriter
+from .columnar_log import ColumnarLogWriter
+from .instrumentation import METRICS
+
+
+LOG_FORMATS = {
+    'csv': CSVLogWriter,
+    'columnar': ColumnarLogWriter,
+}
+ROTATE_RETRY_INTERVAL = 30.0
 
 
 class DataLogger:
     
-    def __init__(self, filename: str = None):
+    def __init__(self, filename: str = None, writer: ILogWriter = None,
+                 flush_interval: float = 1.0, flush_rows: int = 1000,
+                 max_bytes: Optional[int] = None,
+                 rotate_interval: Optional[float] = None, prefix: str = "data_log"):
+        self.writer = writer or CSVLogWriter()
+        
         if filename is None:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"data_log_{timestamp}.csv"
+            filename = f"{prefix}_{timestamp}{self.writer.extension}"
         
+        self.base_filename = filename
         self.filename = filename
-        self.file = None
-        self.writer = None
-        self._write_header()
+        self.flush_interval = flush_interval
+        self.flush_rows = flush_rows
+        self.max_bytes = max_bytes
+        self.rotate_interval = rotate_interval
+        self.rotation_index = 0
+        self.rotate_errors = 0
+        self.rows_written = 0
+        self.opened_at = 0.0
+        self.rotate_retry_at = 0.0
+        
+        self._chunks: List[Dict[str, np.ndarray]] = []
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        
+        self._open_file(filename)
+        self._thread = threading.Thread(target=self._run, name="DataLogger", daemon=True)
+        self._thread.start()
     
-    def _write_header(self):
-        with open(self.filename, 'w', newline='') as f:
-            writer = csv.writer(f)
-            writer.writerow(['Time', 'Roll', 'Gyro Rate', 'Servo Position'])
+    @classmethod
+    def create(cls, filename: str = None, fmt: str = 'csv', **kwargs) -> 'DataLogger':
+        if fmt not in LOG_FORMATS:
+            raise ValueError(f"Unknown log format: {fmt}")
+        return cls(filename, writer=LOG_FORMATS[fmt](), **kwargs)
+    
+    def _open_file(self, filename: str):
+        self.filename = filename
+        self.writer.open(filename)
+        self.opened_at = time.monotonic()
     
     def log(self, data: IMUData):
+        self.log_columns(columns_from_samples([data]))
+    
+    def log_many(self, samples: List[IMUData]):
+        if samples:
+            self.log_columns(columns_from_samples(samples))
+    
+    def log_columns(self, columns: Dict[str, np.ndarray]):
+        count = len(columns['time'])
+        if self._closed or count == 0:
+            return
+        
+        start = time.perf_counter()
+        chunk = {name: np.array(values, copy=True) for name, values in columns.items()}
+        with self._lock:
+            self._chunks.append(chunk)
+            self._pending += count
+            pending = self._pending
+        METRICS.record('log', time.perf_counter() - start)
+        if pending >= self.flush_rows:
+            self._wake.set()
+    
+    def _run(self):
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self._flush()
+        self._flush()
+    
+    def _flush(self):
+        with self._lock:
+            chunks, self._chunks = self._chunks, []
+            count, self._pending = self._pending, 0
+        
+        if chunks:
+            try:
+                if len(chunks) == 1:
+                    columns = chunks[0]
+                else:
+                    columns = {name: np.concatenate([chunk[name] for chunk in chunks])
+                               for name in chunks[0]}
+                start = time.perf_counter()
+                self.writer.write(columns)
+                METRICS.record('log.write', time.perf_counter() - start)
+                METRICS.count('log.rows', count)
+                self.rows_written += count
+            except Exception as e:
+                print(f"Error logging data: {e}")
+        
+        if self._should_rotate():
+            self._rotate()
+    
+    def _should_rotate(self) -> bool:
+        if self._closed or time.monotonic() < self.rotate_retry_at:
+            return False
+        if self.max_bytes is not None and self.writer.size() >= self.max_bytes:
+            return True
+        if (self.rotate_interval is not None
+                and time.monotonic() - self.opened_at >= self.rotate_interval):
+            return True
+        return False
+    
+    def _rotate(self):
+        path = Path(self.base_filename)
+        filename = str(path.with_name(f"{path.stem}_{self.rotation_index + 1:03d}{path.suffix}"))
+        writer = self.writer.clone()
         try:
-            with open(self.filename, 'a', newline='') as f:
-                writer = csv.writer(f)
-                timestamp = data.timestamp.strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
-                writer.writerow([timestamp, data.roll, data.gyro_rate, data.servo_pos])
+            writer.open(filename)
         except Exception as e:
-            print(f"Error logging data: {e}")
+            self.rotate_errors += 1
+            self.rotate_retry_at = time.monotonic() + ROTATE_RETRY_INTERVAL
+            METRICS.count('log.rotate_errors')
+            print(f"Error rotating log file, still writing {self.filename}: {e}")
+            try:
+                writer.close()
+            except Exception:
+                pass
+            return
+        
+        previous, self.writer = self.writer, writer
+        self.rotation_index += 1
+        self.filename = filename
+        self.opened_at = time.monotonic()
+        try:
+            previous.close()
+        except Exception as e:
+            print(f"Error closing log file: {e}")
+    
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        self.writer.close()
     
     def get_filename(self) -> str:
         return self.filename
@@ -1,45 +1,262 @@
-from typing import Optional
-import random
+from typing import Optional, List, Dict, Tuple
+from datetime import datetime
 import json
+import re
+import numpy as np
 from .imu_data import IMUData
 
 
+NUMBER = r'([-+.\deE]+)'
+LEGACY_TELEMETRY_BODY = (
+    r'\{"r":' + NUMBER + r',"g":' + NUMBER + r',"s":' + NUMBER +
+    r',"e":' + NUMBER + r',"i":' + NUMBER
+)
+TELEMETRY_PATTERN = re.compile(LEGACY_TELEMETRY_BODY + r',"t":(\d+),"n":(\d+)\}')
+LEGACY_TELEMETRY_PATTERN = re.compile(LEGACY_TELEMETRY_BODY + r'\}')
+TELEMETRY_COLUMNS = (
+    'roll', 'gyro_rate', 'servo_pos', 'error', 'integral', 'device_time_us', 'seq'
+)
+NO_DEVICE_CLOCK = ('nan', 'nan')
+
+
+def _optional_int(value: float) -> Optional[int]:
+    return None if value != value else int(value)
+
+
+def samples_from_columns(columns: Dict[str, np.ndarray],
+                         timestamps: Optional[np.ndarray] = None) -> List[IMUData]:
+    count = len(columns['roll'])
+    if count == 0:
+        return []
+    
+    if timestamps is None:
+        times = [datetime.now()] * count
+    else:
+        times = [datetime.fromtimestamp(t) for t in timestamps.tolist()]
+    
+    device_times = [_optional_int(t) for t in columns['device_time_us'].tolist()]
+    seqs = [_optional_int(n) for n in columns['seq'].tolist()]
+    values = zip(columns['roll'].tolist(), columns['gyro_rate'].tolist(),
+                 columns['servo_pos'].tolist(), columns['error'].tolist(),
+                 columns['integral'].tolist(), times, device_times, seqs)
+    return [
+        IMUData(roll=r, gyro_rate=g, servo_pos=s, timestamp=t, error=e, integral=i,
+                device_time_us=d, seq=n)
+        for r, g, s, e, i, t, d, n in values
+    ]
+
+
+def columns_from_samples(samples: List[IMUData]) -> Dict[str, np.ndarray]:
+    def column(values):
+        return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+    
+    return {
+        'time': np.array([data.timestamp.timestamp() for data in samples], dtype=np.float64),
+        'roll': column(data.roll for data in samples),
+        'gyro_rate': column(data.gyro_rate for data in samples),
+        'servo_pos': column(data.servo_pos for data in samples),
+        'error': column(data.error for data in samples),
+        'integral': column(data.integral for data in samples),
+        'device_time_us': column(data.device_time_us for data in samples),
+        'seq': column(data.seq for data in samples),
+    }
+
+
 class DataParser:
     
+    def __init__(self):
+        self.parsed = 0
+        self.malformed = 0
+    
+    def parse(self, line: str) -> Optional[IMUData]:
+        line = line.strip()
+        values = self._match(line)
+        
+        if values is None:
+            values = self._parse_fallback(line)
+            if values is None:
+                self.malformed += 1
+                return None
+        
+        self.parsed += 1
+        roll, gyro_rate, servo_pos, error, integral, device_time_us, seq = values
+        return IMUData(roll=roll, gyro_rate=gyro_rate, servo_pos=servo_pos,
+                       error=error, integral=integral,
+                       device_time_us=_optional_int(device_time_us),
+                       seq=_optional_int(seq))
+    
     @staticmethod
-    def parse(line: str) -> Optional[IMUData]:
+    def _match(line: str) -> Optional[Tuple[float, ...]]:
+        match = TELEMETRY_PATTERN.fullmatch(line)
+        if match:
+            groups = match.groups()
+        else:
+            match = LEGACY_TELEMETRY_PATTERN.fullmatch(line)
+            if not match:
+                return None
+            groups = match.groups() + NO_DEVICE_CLOCK
+        try:
+            return tuple(map(float, groups))
+        except ValueError:
+            return None
+    
+    def parse_many(self, lines: List[str]) -> Dict[str, np.ndarray]:
+        rows = []
+        fullmatch = TELEMETRY_PATTERN.fullmatch
+        legacy_fullmatch = LEGACY_TELEMETRY_PATTERN.fullmatch
+        fallback = self._parse_fallback
+        malformed = 0
+        
+        for line in lines:
+            match = fullmatch(line)
+            if match:
+                rows.append(match.groups())
+                continue
+            
+            match = legacy_fullmatch(line)
+            if match:
+                rows.append(match.groups() + NO_DEVICE_CLOCK)
+                continue
+            
+            values = fallback(line.strip())
+            if values is None:
+                malformed += 1
+            else:
+                rows.append(values)
+        
         try:
-            if line.strip().startswith('{'):
+            table = np.array(rows, dtype=np.float64).reshape(-1, len(TELEMETRY_COLUMNS))
+        except ValueError:
+            table, invalid = self._convert_rows(rows)
+            malformed += invalid
+        
+        self.parsed += len(table)
+        self.malformed += malformed
+        return {name: table[:, k] for k, name in enumerate(TELEMETRY_COLUMNS)}
+    
+    @staticmethod
+    def _convert_rows(rows: list) -> Tuple[np.ndarray, int]:
+        converted = []
+        for row in rows:
+            try:
+                converted.append(tuple(map(float, row)))
+            except ValueError:
+                pass
+        table = np.array(converted, dtype=np.float64).reshape(-1, len(TELEMETRY_COLUMNS))
+        return table, len(rows) - len(converted)
+    
+    @staticmethod
+    def _parse_fallback(line: str) -> Optional[Tuple[float, ...]]:
+        try:
+            if line.startswith('{'):
                 data = json.loads(line)
-                roll = float(data.get('r', 0))
-                gyro_rate = float(data.get('g', 0))
-                servo_pos = float(data.get('s', 90))
-                return IMUData(roll=roll, gyro_rate=gyro_rate, servo_pos=servo_pos)
+                if not isinstance(data, dict) or 'r' not in data:
+                    return None
+                return (float(data.get('r', 0)), float(data.get('g', 0)),
+                        float(data.get('s', 90)), float(data.get('e', 0)),
+                        float(data.get('i', 0)), float(data.get('t', 'nan')),
+                        float(data.get('n', 'nan')))
             
             if line.startswith("DATA:"):
-                data_str = line[5:]
-                parts = data_str.split(',')
-                
+                parts = line[5:].split(',')
                 if len(parts) != 3:
                     return None
-                
-                roll = float(parts[0])
-                gyro_rate = float(parts[1])
-                servo_pos = float(parts[2])
-                
-                return IMUData(roll=roll, gyro_rate=gyro_rate, servo_pos=servo_pos)
-            
-            return None
-        except Exception as e:
-            print(f"Error parsing data: {e}")
-            return None
+                return (float(parts[0]), float(parts[1]), float(parts[2]),
+                        0.0, 0.0, float('nan'), float('nan'))
+        except (ValueError, TypeError):
+            pass
+        return None
+
+
+FRAME_SYNC = b'\xa5\x5a'
+FRAME_SYNC_WORD = 0x5AA5
+FRAME_DTYPE = np.dtype([
+    ('sync', '<u2'),
+    ('seq', '<u2'),
+    ('device_time_us', '<u4'),
+    ('roll', '<f4'),
+    ('gyro_rate', '<f4'),
+    ('servo_pos', '<f4'),
+    ('error', '<f4'),
+    ('integral', '<f4'),
+    ('crc', '<u2'),
+])
+FRAME_SIZE = FRAME_DTYPE.itemsize
+FRAME_COLUMNS = TELEMETRY_COLUMNS
+
+
+def _crc16_table() -> np.ndarray:
+    table = np.zeros(256, dtype=np.uint16)
+    for value in range(256):
+        crc = value << 8
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x1021) if crc & 0x8000 else crc << 1
+        table[value] = crc & 0xFFFF
+    return table
 
 
-class DataSimulator:
+CRC16_TABLE = _crc16_table()
+
+
+def crc16_frames(frames: np.ndarray) -> np.ndarray:
+    data = frames.view(np.uint8).reshape(-1, FRAME_SIZE)[:, :FRAME_SIZE - 2]
+    crc = np.full(len(data), 0xFFFF, dtype=np.uint16)
+    for k in range(data.shape[1]):
+        index = ((crc >> 8) ^ data[:, k]) & 0xFF
+        crc = (crc << 8) ^ CRC16_TABLE[index]
+    return crc
+
+
+class BinaryFrameDecoder:
     
-    @staticmethod
-    def generate() -> IMUData:
-        roll = random.uniform(-30, 30)
-        gyro_rate = random.uniform(-50, 50)
-        servo_pos = random.uniform(0, 180)
-        return IMUData(roll=roll, gyro_rate=gyro_rate, servo_pos=servo_pos)
+    def __init__(self, max_buffer: int = 1 << 20):
+        self.max_buffer = max_buffer
+        self.buffer = bytearray()
+        self.frames = 0
+        self.crc_errors = 0
+        self.skipped_bytes = 0
+    
+    def decode(self, data: bytes) -> Dict[str, np.ndarray]:
+        buffer = self.buffer
+        buffer += data
+        blocks = []
+        pos = 0
+        
+        while True:
+            start = buffer.find(FRAME_SYNC, pos)
+            if start < 0:
+                end = len(buffer) - 1 if buffer.endswith(FRAME_SYNC[:1]) else len(buffer)
+                self.skipped_bytes += end - pos
+                pos = end
+                break
+            
+            self.skipped_bytes += start - pos
+            pos = start
+            count = (len(buffer) - start) // FRAME_SIZE
+            if count == 0:
+                break
+            
+            block = np.frombuffer(bytes(buffer[start:start + count * FRAME_SIZE]),
+                                  dtype=FRAME_DTYPE)
+            valid = (block['sync'] == FRAME_SYNC_WORD) & (crc16_frames(block) == block['crc'])
+            good = count if valid.all() else int(np.argmin(valid))
+            
+            if good:
+                blocks.append(block[:good])
+                pos = start + good * FRAME_SIZE
+            else:
+                self.crc_errors += 1
+                self.skipped_bytes += 1
+                pos = start + 1
+        
+        del buffer[:pos]
+        if len(buffer) > self.max_buffer:
+            self.skipped_bytes += len(buffer)
+            buffer.clear()
+        
+        frames = np.concatenate(blocks) if blocks else np.empty(0, dtype=FRAME_DTYPE)
+        self.frames += len(frames)
+        return {name: frames[name] for name in FRAME_COLUMNS}
+    
+    def reset(self):
+        self.buffer.clear()
@@ -0,0 +1,98 @@
+import math
+from typing import Dict, Sequence, Tuple
+import numpy as np
+from .sample_buffer import SampleBuffer
+
+
+def minmax_decimate(x: np.ndarray, y: np.ndarray, bucket_size: int) -> Tuple[np.ndarray, np.ndarray]:
+    count = len(y)
+    if count == 0 or bucket_size <= 1:
+        return np.asarray(x), np.asarray(y)
+    
+    buckets = math.ceil(count / bucket_size)
+    padded = buckets * bucket_size
+    values = np.empty(padded)
+    values[:count] = y
+    values[count:] = np.nan
+    values = values.reshape(buckets, bucket_size)
+    
+    missing = np.isnan(values)
+    low = np.where(missing, np.inf, values).argmin(axis=1)
+    high = np.where(missing, -np.inf, values).argmax(axis=1)
+    
+    first = np.minimum(low, high)
+    second = np.maximum(low, high)
+    offsets = np.arange(buckets) * bucket_size
+    index = np.empty((buckets, 2), dtype=np.int64)
+    index[:, 0] = offsets + first
+    index[:, 1] = offsets + second
+    index = np.minimum(index.ravel(), count - 1)
+    
+    decimated = np.asarray(y)[index]
+    missing.ravel()[count:] = False
+    gaps = missing.any(axis=1)
+    if gaps.any():
+        decimated.reshape(buckets, 2)[gaps, 1] = np.nan
+    return np.asarray(x)[index], decimated
+
+
+class MinMaxDecimator:
+    
+    def __init__(self, buckets: int = 1000):
+        self.buckets = buckets
+        self.bucket_size = 0
+        self.cache: Dict[str, Tuple[int, np.ndarray, np.ndarray]] = {}
+    
+    def reset(self):
+        self.bucket_size = 0
+        self.cache = {}
+    
+    def decimate(self, buffer: SampleBuffer, start: int, end: int,
+                 names: Sequence[str]) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+        count = end - start
+        if count <= 2 * self.buckets:
+            window = buffer.window(start, end)
+            return {name: (window['time'], window[name]) for name in names}
+        
+        size = 1 << math.ceil(math.log2(math.ceil(count / self.buckets)))
+        if size != self.bucket_size:
+            self.reset()
+            self.bucket_size = size
+        
+        first_bucket = -(-start // size)
+        last_bucket = end // size
+        result = {}
+        for name in names:
+            head = self._minmax(buffer, start, min(first_bucket * size, end), name)
+            body = self._cached(buffer, first_bucket, last_bucket, name)
+            tail = self._minmax(buffer, max(last_bucket * size, start), end, name)
+            result[name] = (np.concatenate([head[0], body[0], tail[0]]),
+                            np.concatenate([head[1], body[1], tail[1]]))
+        return result
+    
+    def _minmax(self, buffer: SampleBuffer, start: int, end: int,
+                name: str) -> Tuple[np.ndarray, np.ndarray]:
+        if end <= start:
+            return np.empty(0), np.empty(0)
+        window = buffer.window(start, end)
+        return minmax_decimate(window['time'], window[name], self.bucket_size)
+    
+    def _cached(self, buffer: SampleBuffer, first_bucket: int, last_bucket: int,
+                name: str) -> Tuple[np.ndarray, np.ndarray]:
+        size = self.bucket_size
+        cached_first, xs, ys = self.cache.get(name, (first_bucket, np.empty(0), np.empty(0)))
+        
+        cached_end = cached_first + len(xs) // 2
+        if cached_first > first_bucket or cached_end < first_bucket:
+            cached_first, xs, ys = first_bucket, np.empty(0), np.empty(0)
+            cached_end = first_bucket
+        
+        if last_bucket > cached_end:
+            new_x, new_y = self._minmax(buffer, cached_end * size, last_bucket * size, name)
+            xs = np.concatenate([xs, new_x])
+            ys = np.concatenate([ys, new_y])
+        
+        keep = slice(2 * (first_bucket - cached_first), 2 * (last_bucket - cached_first))
+        xs, ys = xs[keep], ys[keep]
+        self.cache[name] = (first_bucket, xs, ys)
+        return xs, ys
@@ -0,0 +1,221 @@
+import math
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+
+
+HISTORY_CHANNELS = ('roll', 'gyro_rate', 'servo_pos', 'error', 'integral')
+STATS = ('min', 'mean', 'max')
+
+
+def aggregate(values: Dict[str, np.ndarray], channels: Sequence[str],
+              factor: int, groups: int) -> Dict[str, np.ndarray]:
+    full = groups * factor
+    result = {'time': values['time'][:full:factor]}
+    for name in channels:
+        low = values[f"{name}_min"][:full].reshape(groups, factor)
+        mean = values[f"{name}_mean"][:full].reshape(groups, factor)
+        high = values[f"{name}_max"][:full].reshape(groups, factor)
+        
+        finite = np.isfinite(mean)
+        counts = finite.sum(axis=1)
+        totals = np.where(finite, mean, 0.0).sum(axis=1)
+        result[f"{name}_mean"] = totals / np.maximum(counts, 1)
+        result[f"{name}_mean"][counts == 0] = np.nan
+        result[f"{name}_min"] = np.fmin.reduce(low, axis=1)
+        result[f"{name}_max"] = np.fmax.reduce(high, axis=1)
+    return result
+
+
+class ColumnStore:
+    
+    def __init__(self, dtypes: Dict[str, str], capacity: int = 4096,
+                 path: Optional[Path] = None):
+        self.dtypes = dtypes
+        self.path = path
+        self.size = 0
+        self.capacity = 0
+        self.columns: Dict[str, np.ndarray] = {}
+        if path is not None:
+            path.mkdir(parents=True, exist_ok=True)
+        self._grow(capacity)
+    
+    def _grow(self, capacity: int):
+        columns = {}
+        for name, dtype in self.dtypes.items():
+            if self.path is None:
+                column = np.empty(capacity, dtype=dtype)
+                if name in self.columns:
+                    column[:self.size] = self.columns[name][:self.size]
+            else:
+                filename = self.path / f"{name}.bin"
+                with open(filename, 'ab') as f:
+                    f.truncate(capacity * np.dtype(dtype).itemsize)
+                column = np.memmap(filename, dtype=dtype, mode='r+', shape=(capacity,))
+            columns[name] = column
+        self.columns = columns
+        self.capacity = capacity
+    
+    def append(self, values: Dict[str, np.ndarray]):
+        count = len(values['time'])
+        if count == 0:
+            return
+        if self.size + count > self.capacity:
+            self._grow(max(2 * self.capacity, self.size + count))
+        for name, column in self.columns.items():
+            column[self.size:self.size + count] = values[name]
+        self.size += count
+    
+    def drop_front(self, count: int):
+        if count <= 0:
+            return
+        count = min(count, self.size)
+        for column in self.columns.values():
+            column[:self.size - count] = column[count:self.size]
+        self.size -= count
+    
+    def view(self, name: str) -> np.ndarray:
+        return self.columns[name][:self.size]
+
+
+class HistoryLevel:
+    
+    def __init__(self, factor: int, channels: Sequence[str], store: ColumnStore):
+        self.factor = factor
+        self.channels = channels
+        self.store = store
+        self.pending: Dict[str, np.ndarray] = {}
+    
+    def push(self, values: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        if self.pending:
+            values = {name: np.concatenate([self.pending[name], values[name]])
+                      for name in self.pending}
+        
+        count = len(values['time'])
+        full = count - count % self.factor
+        self.pending = {name: np.array(column[full:]) for name, column in values.items()}
+        if full == 0:
+            return {}
+        
+        aggregated = aggregate(values, self.channels, self.factor, full // self.factor)
+        self.store.append(aggregated)
+        return aggregated
+
+
+class HistoryStore:
+    
+    def __init__(self, channels: Sequence[str] = HISTORY_CHANNELS, factor: int = 16,
+                 levels: int = 6, recent_samples: int = 1000000,
+                 level_rows: int = 1000000, spill_dir: Optional[str] = None):
+        self.channels = tuple(channels)
+        self.factor = factor
+        self.recent_samples = recent_samples
+        self.level_rows = level_rows
+        self.spill_dir = Path(spill_dir) if spill_dir else None
+        self._lock = threading.Lock()
+        
+        raw_dtypes = {'time': '<f8'}
+        raw_dtypes.update({name: '<f4' for name in self.channels})
+        self.raw = ColumnStore(raw_dtypes, path=self._level_path(0))
+        
+        aggregate_dtypes = {'time': '<f8'}
+        for name in self.channels:
+            aggregate_dtypes.update({f"{name}_{stat}": '<f4' for stat in STATS})
+        self.levels: List[HistoryLevel] = [
+            HistoryLevel(factor, self.channels,
+                         ColumnStore(aggregate_dtypes, path=self._level_path(level)))
+            for level in range(1, levels + 1)
+        ]
+    
+    def _level_path(self, level: int) -> Optional[Path]:
+        if self.spill_dir is None:
+            return None
+        return self.spill_dir / f"level_{level}"
+    
+    def __len__(self) -> int:
+        return self.raw.size
+    
+    def append(self, columns: Dict[str, np.ndarray]):
+        if len(columns['time']) == 0:
+            return
+        
+        raw = {'time': np.asarray(columns['time'], dtype=np.float64)}
+        values = dict(raw)
+        for name in self.channels:
+            column = np.asarray(columns[name], dtype=np.float64)
+            raw[name] = column
+            for stat in STATS:
+                values[f"{name}_{stat}"] = column
+        
+        with self._lock:
+            self.raw.append(raw)
+            for level in self.levels:
+                values = level.push(values)
+                if not values:
+                    break
+            
+            if self.raw.size > 2 * self.recent_samples:
+                self.raw.drop_front(self.raw.size - self.recent_samples)
+            for level in self.levels:
+                if level.store.size > 2 * self.level_rows:
+                    level.store.drop_front(level.store.size - self.level_rows)
+    
+    def time_span(self) -> Optional[tuple]:
+        with self._lock:
+            for store in [level.store for level in reversed(self.levels)] + [self.raw]:
+                if store.size:
+                    return float(store.view('time')[0]), float(self.raw.view('time')[-1])
+        return None
+    
+    def query(self, t0: float, t1: float, points: int,
+              names: Sequence[str] = None) -> Dict[str, np.ndarray]:
+        names = names or self.channels
+        with self._lock:
+            times = self.raw.view('time')
+            if len(times) and times[0] <= t0:
+                start = int(np.searchsorted(times, t0, side='left'))
+                stop = int(np.searchsorted(times, t1, side='right'))
+                if stop - start <= points:
+                    result = {'time': np.array(times[start:stop])}
+                    for name in names:
+                        column = np.array(self.raw.view(name)[start:stop])
+                        for stat in STATS:
+                            result[f"{name}_{stat}"] = column
+                    return result
+            
+            level = None
+            for level in self.levels:
+                times = level.store.view('time')
+                start = max(int(np.searchsorted(times, t0, side='right')) - 1, 0)
+                stop = int(np.searchsorted(times, t1, side='right'))
+                if stop - start <= points and (len(times) == 0 or times[0] <= t0):
+                    break
+            
+            if level is None:
+                return {'time': np.empty(0)}
+            
+            result = {'time': np.array(times[start:stop])}
+            for name in names:
+                for stat in STATS:
+                    key = f"{name}_{stat}"
+                    result[key] = np.array(level.store.view(key)[start:stop])
+        
+        return self._reduce(result, points, names)
+    
+    @staticmethod
+    def _reduce(result: Dict[str, np.ndarray], points: int,
+                names: Sequence[str]) -> Dict[str, np.ndarray]:
+        count = len(result['time'])
+        if count <= points:
+            return result
+        
+        stride = math.ceil(count / points)
+        return aggregate(result, names, stride, count // stride)
+    
+    def clear(self):
+        with self._lock:
+            self.raw.size = 0
+            for level in self.levels:
+                level.store.size = 0
+                level.pending = {}
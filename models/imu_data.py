@@ -1,5 +1,6 @@
 from dataclasses import dataclass
 from datetime import datetime
+from typing import Optional
 
 
 @dataclass
@@ -8,6 +9,10 @@ class IMUData:
     gyro_rate: float
     servo_pos: float
     timestamp: datetime = None
+    error: float = 0.0
+    integral: float = 0.0
+    device_time_us: Optional[int] = None
+    seq: Optional[int] = None
     
     def __post_init__(self):
         if self.timestamp is None:
@@ -0,0 +1,82 @@
+import threading
+from collections import deque
+from typing import Any, List, Optional
+
+
+OVERFLOW_POLICIES = ('drop_oldest', 'drop_newest', 'block')
+
+
+class IngestQueue:
+    
+    def __init__(self, maxsize: int = 10000, policy: str = 'drop_oldest',
+                 timeout: Optional[float] = None):
+        if policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {policy}")
+        
+        self.maxsize = maxsize
+        self.policy = policy
+        self.timeout = timeout
+        self.received = 0
+        self.dropped = 0
+        self.high_water = 0
+        self._items = deque()
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+    
+    def __len__(self) -> int:
+        return len(self._items)
+    
+    def full(self) -> bool:
+        return len(self._items) >= self.maxsize
+    
+    def put(self, item: Any, block: bool = True) -> bool:
+        with self._lock:
+            self.received += 1
+            if len(self._items) >= self.maxsize:
+                if self.policy == 'drop_oldest':
+                    self._items.popleft()
+                    self.dropped += 1
+                elif self.policy == 'drop_newest' or not block or not self._not_full.wait_for(
+                        lambda: len(self._items) < self.maxsize, self.timeout):
+                    self.dropped += 1
+                    return False
+            
+            self._items.append(item)
+            self.high_water = max(self.high_water, len(self._items))
+            self._not_empty.notify()
+            return True
+    
+    def get(self, timeout: Optional[float] = 0) -> Optional[Any]:
+        with self._lock:
+            if not self._items and (timeout == 0 or not self._not_empty.wait_for(
+                    lambda: self._items, timeout)):
+                return None
+            item = self._items.popleft()
+            self._not_full.notify()
+            return item
+    
+    def drain(self, max_items: Optional[int] = None) -> List[Any]:
+        with self._lock:
+            items = self._items
+            if max_items is None or max_items >= len(items):
+                batch = list(items)
+                items.clear()
+            else:
+                batch = [items.popleft() for _ in range(max_items)]
+            if batch:
+                self._not_full.notify_all()
+            return batch
+    
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._not_full.notify_all()
+    
+    def stats(self) -> dict:
+        return {
+            'queued': len(self._items),
+            'received': self.received,
+            'dropped': self.dropped,
+            'high_water': self.high_water
+        }
@@ -0,0 +1,145 @@
+import json
+import re
+import threading
+import time
+from typing import Dict, Iterable
+import numpy as np
+
+
+QUANTILES = (0.5, 0.9, 0.99, 0.999)
+
+
+class LatencyHistogram:
+    
+    def __init__(self, sub_bits: int = 5, max_bits: int = 40):
+        self.sub_bits = sub_bits
+        self.size = (max_bits - sub_bits + 1) << sub_bits
+        self.counts = [0] * self.size
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = 0
+    
+    def _index(self, value: int) -> int:
+        shift = max(0, value.bit_length() - self.sub_bits - 1)
+        return min(self.size - 1, (shift << self.sub_bits) + (value >> shift))
+    
+    def _value(self, index: int) -> int:
+        shift = max(0, (index >> self.sub_bits) - 1)
+        top = index - (shift << self.sub_bits)
+        return ((top + 1) << shift) - 1
+    
+    def record(self, seconds: float):
+        value = max(0, int(seconds * 1e9))
+        self.counts[self._index(value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+        if self.min is None or value < self.min:
+            self.min = value
+    
+    def quantiles(self, quantiles: Iterable[float] = QUANTILES) -> Dict[float, float]:
+        if self.count == 0:
+            return {q: 0.0 for q in quantiles}
+        
+        cumulative = np.cumsum(self.counts)
+        result = {}
+        for q in quantiles:
+            index = int(np.searchsorted(cumulative, max(1, int(np.ceil(q * self.count)))))
+            result[q] = min(self._value(index), self.max) * 1e-9
+        return result
+    
+    def summary(self) -> dict:
+        quantiles = self.quantiles()
+        return {
+            'count': self.count,
+            'sum': self.total * 1e-9,
+            'mean': self.total * 1e-9 / self.count if self.count else 0.0,
+            'min': (self.min or 0) * 1e-9,
+            'max': self.max * 1e-9,
+            'p50': quantiles[0.5],
+            'p90': quantiles[0.9],
+            'p99': quantiles[0.99],
+            'p999': quantiles[0.999]
+        }
+    
+    def reset(self):
+        self.counts = [0] * self.size
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = 0
+
+
+class Instrumentation:
+    
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.counters: Dict[str, int] = {}
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self.started = time.time()
+        self._lock = threading.Lock()
+    
+    def count(self, name: str, amount: int = 1):
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+    
+    def record(self, name: str, seconds: float):
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = LatencyHistogram()
+            histogram.record(seconds)
+    
+    def snapshot(self) -> dict:
+        with self._lock:
+            elapsed = max(time.time() - self.started, 1e-9)
+            return {
+                'uptime': elapsed,
+                'counters': dict(self.counters),
+                'rates': {name: value / elapsed for name, value in self.counters.items()},
+                'latency': {name: histogram.summary()
+                            for name, histogram in self.histograms.items()}
+            }
+    
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot(), indent=2)
+    
+    def to_prometheus(self, prefix: str = 'stabilizer') -> str:
+        snapshot = self.snapshot()
+        lines = [f'# TYPE {prefix}_uptime_seconds gauge',
+                 f'{prefix}_uptime_seconds {snapshot["uptime"]:.3f}']
+        for name, value in sorted(snapshot['counters'].items()):
+            metric = f'{prefix}_{metric_name(name)}_total'
+            lines.append(f'# TYPE {metric} counter')
+            lines.append(f'{metric} {value}')
+        
+        for name, summary in sorted(snapshot['latency'].items()):
+            metric = f'{prefix}_{metric_name(name)}_seconds'
+            lines.append(f'# TYPE {metric} summary')
+            for q in QUANTILES:
+                key = 'p' + f'{q * 100:g}'.replace('.', '')
+                lines.append(f'{metric}{{quantile="{q}"}} {summary[key]:.9f}')
+            lines.append(f'{metric}_sum {summary["sum"]:.9f}')
+            lines.append(f'{metric}_count {summary["count"]}')
+            lines.append(f'# TYPE {metric}_max gauge')
+            lines.append(f'{metric}_max {summary["max"]:.9f}')
+        return '\n'.join(lines) + '\n'
+    
+    def reset(self):
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+            self.started = time.time()
+
+
+def metric_name(name: str) -> str:
+    return re.sub(r'[^a-zA-Z0-9_]', '_', name)
+
+
+METRICS = Instrumentation()
@@ -0,0 +1,79 @@
+import csv
+import math
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Dict
+import numpy as np
+
+
+class ILogWriter(ABC):
+    
+    extension = ''
+    
+    @abstractmethod
+    def open(self, filename: str):
+        pass
+    
+    @abstractmethod
+    def write(self, columns: Dict[str, np.ndarray]):
+        pass
+    
+    @abstractmethod
+    def size(self) -> int:
+        pass
+    
+    @abstractmethod
+    def close(self):
+        pass
+    
+    def clone(self) -> 'ILogWriter':
+        return type(self)()
+
+
+class CSVLogWriter(ILogWriter):
+    
+    extension = '.csv'
+    HEADER = ['Time', 'Roll', 'Gyro Rate', 'Servo Position', 'Error', 'Integral',
+              'Device Time (us)', 'Seq']
+    
+    def __init__(self):
+        self.file = None
+        self.writer = None
+        self._second = None
+        self._second_text = ""
+    
+    def open(self, filename: str):
+        self.file = open(filename, 'w', newline='')
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(self.HEADER)
+    
+    def write(self, columns: Dict[str, np.ndarray]):
+        rows = zip(
+            map(self._format_time, columns['time'].tolist()),
+            columns['roll'].tolist(), columns['gyro_rate'].tolist(),
+            columns['servo_pos'].tolist(), columns['error'].tolist(),
+            columns['integral'].tolist(),
+            map(self._format_counter, columns['device_time_us'].tolist()),
+            map(self._format_counter, columns['seq'].tolist()),
+        )
+        self.writer.writerows(rows)
+        self.file.flush()
+    
+    def _format_time(self, timestamp: float) -> str:
+        second = math.floor(timestamp)
+        if second != self._second:
+            self._second = second
+            self._second_text = datetime.fromtimestamp(second).strftime("%Y-%m-%d %H:%M:%S")
+        return f"{self._second_text}.{int((timestamp - second) * 1000):03d}"
+    
+    @staticmethod
+    def _format_counter(value: float) -> str:
+        return '' if value != value else str(int(value))
+    
+    def size(self) -> int:
+        return self.file.tell() if self.file else 0
+    
+    def close(self):
+        if self.file:
+            self.file.close()
+            self.file = None
@@ -0,0 +1,93 @@
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from .instrumentation import Instrumentation, METRICS
+
+
+class MetricsExporter:
+    
+    def __init__(self, registry: Instrumentation = METRICS, path: Optional[str] = None,
+                 port: Optional[int] = None, host: str = '127.0.0.1', interval: float = 5.0):
+        self.registry = registry
+        self.path = path
+        self.port = port
+        self.host = host
+        self.interval = interval
+        self.server: Optional[ThreadingHTTPServer] = None
+        self._threads = []
+        self._stop_event = threading.Event()
+    
+    def render(self, fmt: str) -> str:
+        if fmt == 'json':
+            return self.registry.to_json()
+        return self.registry.to_prometheus()
+    
+    def write_file(self):
+        fmt = 'json' if self.path.endswith('.json') else 'prometheus'
+        temp = f"{self.path}.tmp"
+        try:
+            with open(temp, 'w') as f:
+                f.write(self.render(fmt))
+            os.replace(temp, self.path)
+        except OSError as e:
+            print(f"Error writing metrics: {e}")
+    
+    def _write_loop(self):
+        while not self._stop_event.wait(self.interval):
+            self.write_file()
+        self.write_file()
+    
+    def _make_handler(self):
+        exporter = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            
+            def do_GET(self):
+                path = self.path.split('?')[0]
+                if path in ('/', '/metrics'):
+                    body, content_type = exporter.render('prometheus'), 'text/plain; version=0.0.4'
+                elif path == '/metrics.json':
+                    body, content_type = exporter.render('json'), 'application/json'
+                else:
+                    self.send_error(404)
+                    return
+                
+                data = body.encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+            
+            def log_message(self, format, *args):
+                pass
+        
+        return Handler
+    
+    def start(self) -> bool:
+        if self.port is not None:
+            try:
+                self.server = ThreadingHTTPServer((self.host, self.port), self._make_handler())
+            except OSError as e:
+                print(f"Error starting metrics server: {e}")
+                return False
+            self.port = self.server.server_address[1]
+            self._threads.append(threading.Thread(target=self.server.serve_forever,
+                                                  name="MetricsServer", daemon=True))
+        if self.path:
+            self._threads.append(threading.Thread(target=self._write_loop,
+                                                  name="MetricsWriter", daemon=True))
+        for thread in self._threads:
+            thread.start()
+        return True
+    
+    def stop(self):
+        self._stop_event.set()
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+        for thread in self._threads:
+            thread.join(timeout=2.0)
+        self._threads = []
@@ -0,0 +1,98 @@
+import csv
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+from typing import Optional, Dict, Sequence
+import numpy as np
+from .plant_simulator import GimbalPlant, SERVO_MIN, SERVO_MAX
+
+
+SWEEP_PARAMETERS = ('kp', 'ki', 'kd', 'alpha')
+SWEEP_METRICS = ('rms_error', 'iae', 'peak_error', 'saturation', 'oscillation', 'stable')
+
+
+def gain_grid(kp: Sequence[float], ki: Sequence[float], kd: Sequence[float],
+              alpha: Sequence[float] = (0.96,)) -> np.ndarray:
+    return np.array(list(product(kp, ki, kd, alpha)), dtype=np.float64).reshape(-1, 4)
+
+
+def simulate_batch(params: np.ndarray, duration: float = 10.0, rate: float = 100.0,
+                   settle: float = 2.0, tilt: float = 10.0, block: int = 500,
+                   stable_limit: float = 45.0, seed: Optional[int] = 0,
+                   **plant_options) -> Dict[str, np.ndarray]:
+    params = np.asarray(params, dtype=np.float64).reshape(-1, 4)
+    count = len(params)
+    plant = GimbalPlant(params[:, 0], params[:, 1], params[:, 2], params[:, 3], rate=rate,
+                        count=count, seed=seed, shared_noise=True, **plant_options)
+    plant.step(int(settle * rate))
+    plant.tilt(tilt)
+    
+    total = int(duration * rate)
+    squares = np.zeros(count)
+    absolute = np.zeros(count)
+    peak = np.zeros(count)
+    saturated = np.zeros(count)
+    variation = np.zeros(count)
+    last_error = plant.last_error.copy()
+    for start in range(0, total, block):
+        columns = plant.step(min(block, total - start))
+        error = columns['error']
+        squares += (error * error).sum(axis=0)
+        absolute += np.abs(error).sum(axis=0)
+        peak = np.maximum(peak, np.abs(error).max(axis=0))
+        servo = columns['servo_pos']
+        saturated += ((servo <= SERVO_MIN) | (servo >= SERVO_MAX)).sum(axis=0)
+        variation += np.abs(np.diff(error, axis=0, prepend=last_error[None, :])).sum(axis=0)
+        last_error = error[-1]
+    
+    seconds = total / rate
+    table = {name: params[:, i].copy() for i, name in enumerate(SWEEP_PARAMETERS)}
+    table['rms_error'] = np.sqrt(squares / total)
+    table['iae'] = absolute / rate
+    table['peak_error'] = peak
+    table['saturation'] = saturated / total
+    table['oscillation'] = variation / seconds
+    table['stable'] = ((peak < stable_limit) & (table['saturation'] < 0.05)).astype(np.float64)
+    return table
+
+
+def _simulate_chunk(args) -> Dict[str, np.ndarray]:
+    params, options = args
+    return simulate_batch(params, **options)
+
+
+def sweep(params: np.ndarray, chunk_size: int = 512, workers: Optional[int] = None,
+          **options) -> Dict[str, np.ndarray]:
+    params = np.asarray(params, dtype=np.float64).reshape(-1, 4)
+    chunks = [params[i:i + chunk_size] for i in range(0, len(params), chunk_size)]
+    workers = min(workers or os.cpu_count() or 1, len(chunks))
+    if workers <= 1:
+        results = [simulate_batch(chunk, **options) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(workers) as pool:
+            results = list(pool.map(_simulate_chunk, [(chunk, options) for chunk in chunks]))
+    
+    if not results:
+        return {name: np.empty(0) for name in SWEEP_PARAMETERS + SWEEP_METRICS}
+    return {name: np.concatenate([result[name] for result in results])
+            for name in results[0]}
+
+
+def rank_sweep(table: Dict[str, np.ndarray], metric: str = 'iae',
+               stable_only: bool = True) -> np.ndarray:
+    order = np.argsort(table[metric], kind='stable')
+    if stable_only:
+        order = order[table['stable'][order] > 0]
+    return order
+
+
+def write_sweep_csv(table: Dict[str, np.ndarray], path: str,
+                    order: Optional[np.ndarray] = None):
+    names = list(table)
+    rows = np.column_stack([table[name] for name in names])
+    if order is not None:
+        rows = rows[order]
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(names)
+        writer.writerows(rows.tolist())
@@ -0,0 +1,259 @@
+import time
+from collections import deque
+from typing import Optional, List, Dict
+import numpy as np
+from .connection import IConnection
+from .data_processor import FRAME_DTYPE, FRAME_SYNC_WORD, TELEMETRY_COLUMNS, crc16_frames
+
+
+SERVO_MIN = 0
+SERVO_MAX = 180
+SERVO_CENTER = 90
+INTEGRAL_LIMIT = 40.0
+OUTPUT_LIMIT = 90.0
+TEXT_TELEMETRY_FORMAT = '{"r":%.2f,"g":%.2f,"s":%d,"e":%.2f,"i":%.1f,"t":%d,"n":%d}'
+
+
+class GimbalPlant:
+    
+    def __init__(self, kp=1.4, ki=0.07, kd=0.001, alpha=0.96, rate: float = 100.0,
+                 count: Optional[int] = None, seed: Optional[int] = None,
+                 servo_bandwidth: float = 6.0, servo_damping: float = 0.7,
+                 servo_slew: float = 600.0, disturbance_amplitude: float = 10.0,
+                 disturbance_frequency: float = 0.3, disturbance_walk: float = 2.0,
+                 gyro_noise: float = 0.1, gyro_bias: float = 0.5, accel_noise: float = 0.02,
+                 shared_noise: bool = False):
+        self.count = count or int(np.broadcast(kp, ki, kd, alpha).size)
+        self.noise_width = 1 if shared_noise else self.count
+        self.rate = rate
+        self.dt = 1.0 / rate
+        self.rng = np.random.default_rng(seed)
+        self.servo_bandwidth = servo_bandwidth
+        self.servo_damping = servo_damping
+        self.servo_slew = servo_slew
+        self.disturbance_amplitude = disturbance_amplitude
+        self.disturbance_frequency = disturbance_frequency
+        self.disturbance_walk = disturbance_walk
+        self.gyro_noise = gyro_noise
+        self.gyro_bias = gyro_bias
+        self.accel_noise = accel_noise
+        self.target = 0.0
+        self.alpha = self._vector(alpha)
+        self.reset()
+        self.set_gains(kp, ki, kd)
+    
+    def _vector(self, value) -> np.ndarray:
+        return np.broadcast_to(np.asarray(value, dtype=np.float64), (self.count,)).copy()
+    
+    def set_gains(self, kp, ki, kd):
+        self.kp = self._vector(kp)
+        self.ki = self._vector(ki)
+        self.kd = self._vector(kd)
+        self.integral[:] = 0.0
+    
+    def reset(self):
+        shape = (self.count,)
+        self.steps = 0
+        self.base_offset = np.zeros(shape)
+        self.walk = np.zeros(self.noise_width)
+        self.phase = self.rng.uniform(0, 2 * np.pi, self.noise_width)
+        self.bias = self.rng.normal(0.0, self.gyro_bias, self.noise_width)
+        self.servo_angle = np.zeros(shape)
+        self.servo_rate = np.zeros(shape)
+        self.angle = np.zeros(shape)
+        self.integral = np.zeros(shape)
+        self.derivative = np.zeros(shape)
+        self.last_error = np.zeros(shape)
+        self.servo = np.full(shape, float(SERVO_CENTER))
+    
+    def tilt(self, degrees: float):
+        self.base_offset += degrees
+    
+    def _disturbance(self, count: int):
+        times = (self.steps + np.arange(1, count + 1))[:, None] * self.dt
+        omega = 2 * np.pi * self.disturbance_frequency
+        steps = self.rng.normal(0.0, self.disturbance_walk * np.sqrt(self.dt),
+                                (count, self.noise_width))
+        walk = self.walk + np.cumsum(steps, axis=0)
+        self.walk = walk[-1]
+        
+        base = self.base_offset + walk + self.disturbance_amplitude * np.sin(omega * times + self.phase)
+        base_rate = (steps / self.dt +
+                     self.disturbance_amplitude * omega * np.cos(omega * times + self.phase))
+        return base, base_rate
+    
+    def step(self, count: int) -> Dict[str, np.ndarray]:
+        shape = (count, self.count)
+        out = {name: np.empty(shape) for name in
+               ('roll', 'gyro_rate', 'servo_pos', 'error', 'integral')}
+        if count == 0:
+            out['device_time_us'] = np.empty(shape)
+            out['seq'] = np.empty(shape)
+            return out
+        
+        dt = self.dt
+        omega = 2 * np.pi * self.servo_bandwidth
+        stiffness = omega * omega
+        damping = 2 * self.servo_damping * omega
+        base, base_rate = self._disturbance(count)
+        noise_shape = (count, self.noise_width)
+        gyro_noise = self.rng.normal(0.0, self.gyro_noise, noise_shape)
+        accel_noise = self.rng.normal(0.0, self.accel_noise, (2,) + noise_shape)
+        
+        kp, ki, kd, alpha = self.kp, self.ki, self.kd, self.alpha
+        servo_angle, servo_rate = self.servo_angle, self.servo_rate
+        angle, integral, derivative = self.angle, self.integral, self.derivative
+        last_error, servo = self.last_error, self.servo
+        
+        for k in range(count):
+            command = servo - SERVO_CENTER
+            servo_rate += (stiffness * (command - servo_angle) - damping * servo_rate) * dt
+            np.clip(servo_rate, -self.servo_slew, self.servo_slew, out=servo_rate)
+            servo_angle += servo_rate * dt
+            
+            roll = np.radians(base[k] - servo_angle)
+            gyro = base_rate[k] - servo_rate + self.bias + gyro_noise[k]
+            accel = np.degrees(np.arctan2(np.sin(roll) + accel_noise[0, k],
+                                          np.cos(roll) + accel_noise[1, k]))
+            angle[:] = alpha * (angle + gyro * dt) + (1 - alpha) * accel
+            
+            error = angle - self.target
+            integral += error * dt
+            np.clip(integral, -INTEGRAL_LIMIT, INTEGRAL_LIMIT, out=integral)
+            saturated = ((servo >= SERVO_MAX - 2) & (error > 0)) | ((servo <= SERVO_MIN + 2) & (error < 0))
+            integral[saturated] *= 0.5
+            
+            derivative[:] = 0.9 * derivative + 0.1 * (error - last_error) / dt
+            output = np.clip(kp * error + ki * integral + kd * derivative,
+                             -OUTPUT_LIMIT, OUTPUT_LIMIT)
+            last_error[:] = error
+            servo[:] = np.clip(np.trunc(SERVO_CENTER + output), SERVO_MIN, SERVO_MAX)
+            
+            out['roll'][k] = angle
+            out['gyro_rate'][k] = gyro
+            out['servo_pos'][k] = servo
+            out['error'][k] = error
+            out['integral'][k] = integral
+        
+        indices = self.steps + np.arange(1, count + 1)
+        out['device_time_us'] = np.broadcast_to((indices * dt * 1e6)[:, None], shape).copy()
+        out['seq'] = np.broadcast_to((indices - 1)[:, None].astype(np.float64), shape).copy()
+        self.steps += count
+        return out
+
+
+class SimulatedConnection(IConnection):
+    
+    def __init__(self, rate: float = 100.0, speed: Optional[float] = 1.0,
+                 max_batch: int = 5000, seed: Optional[int] = None, **plant_options):
+        self.rate = rate
+        self.speed = speed
+        self.max_batch = max_batch
+        self.seed = seed
+        self.plant_options = plant_options
+        self.plant: Optional[GimbalPlant] = None
+        self.connected = False
+        self.binary = False
+        self.start_clock = 0.0
+        self.generated = 0
+        self.telemetry_seq = 0
+        self.frame_seq = 0
+        self.pending = deque()
+        self.replies: List[str] = []
+    
+    def connect(self) -> bool:
+        self.plant = GimbalPlant(rate=self.rate, count=1, seed=self.seed, **self.plant_options)
+        self.start_clock = time.monotonic()
+        self.generated = 0
+        self.connected = True
+        return True
+    
+    def disconnect(self):
+        self.connected = False
+        self.pending.clear()
+        self.replies.clear()
+    
+    def is_connected(self) -> bool:
+        return self.connected
+    
+    def _generate(self) -> Dict[str, np.ndarray]:
+        if self.speed:
+            due = int((time.monotonic() - self.start_clock) * self.rate * self.speed)
+            count = min(due - self.generated, self.max_batch)
+        else:
+            count = self.max_batch
+        
+        columns = self.plant.step(max(0, count))
+        self.generated += len(columns['roll'])
+        return {name: values[:, 0] for name, values in columns.items()}
+    
+    def _encode_lines(self, columns: Dict[str, np.ndarray]) -> List[str]:
+        count = len(columns['roll'])
+        seq = np.arange(self.telemetry_seq, self.telemetry_seq + count)
+        self.telemetry_seq += count
+        rows = zip(columns['roll'].tolist(), columns['gyro_rate'].tolist(),
+                   columns['servo_pos'].astype(np.int64).tolist(), columns['error'].tolist(),
+                   columns['integral'].tolist(),
+                   columns['device_time_us'].astype(np.int64).tolist(), seq.tolist())
+        return [TEXT_TELEMETRY_FORMAT % row for row in rows]
+    
+    def _encode_frames(self, columns: Dict[str, np.ndarray]) -> bytes:
+        frames = np.zeros(len(columns['roll']), dtype=FRAME_DTYPE)
+        frames['sync'] = FRAME_SYNC_WORD
+        frames['seq'] = (self.frame_seq + np.arange(len(frames))) & 0xFFFF
+        self.frame_seq += len(frames)
+        frames['device_time_us'] = columns['device_time_us'].astype(np.uint64) & 0xFFFFFFFF
+        for name in TELEMETRY_COLUMNS[:5]:
+            frames[name] = columns[name]
+        frames['crc'] = crc16_frames(frames)
+        return frames.tobytes()
+    
+    def _take_replies(self) -> List[str]:
+        replies, self.replies = self.replies, []
+        return replies
+    
+    def read_lines(self) -> List[str]:
+        if not self.is_connected():
+            return []
+        
+        lines = list(self.pending)
+        self.pending.clear()
+        lines.extend(self._take_replies())
+        lines.extend(self._encode_lines(self._generate()))
+        return lines
+    
+    def read_available(self) -> bytes:
+        if not self.is_connected():
+            return b''
+        if not self.binary:
+            lines = self.read_lines()
+            return ('\n'.join(lines) + '\n').encode('utf-8') if lines else b''
+        
+        replies = ''.join(line + '\n' for line in self._take_replies()).encode('utf-8')
+        return replies + self._encode_frames(self._generate())
+    
+    def read_line(self) -> Optional[str]:
+        if not self.pending:
+            self.pending.extend(self.read_lines())
+        return self.pending.popleft() if self.pending else None
+    
+    def send_command(self, command: str) -> bool:
+        if not self.is_connected():
+            return False
+        
+        command = command.strip()
+        if command.startswith("PID:"):
+            try:
+                kp, ki, kd = (float(value) for value in command[4:].split(','))
+            except ValueError:
+                return True
+            self.plant.set_gains(kp, ki, kd)
+            self.replies.append(f"PID Updated via Serial - Kp: {kp:.2f}, Ki: {ki:.2f}, Kd: {kd:.2f}")
+        elif command.startswith("BIN:"):
+            try:
+                self.binary = int(command[4:]) != 0
+            except ValueError:
+                self.binary = False
+            self.frame_seq = 0
+            self.replies.append("Binary telemetry ON" if self.binary else "Binary telemetry OFF")
+        return True
@@ -0,0 +1,242 @@
+import json
+import mmap
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, List, Dict
+import numpy as np
+from .connection import IColumnConnection
+from .columnar_log import ColumnarLog, HEADER_NAME
+from .sample_buffer import SAMPLE_COLUMNS
+
+
+TEXT_KEYS = (('r', 'roll'), ('g', 'gyro_rate'), ('s', 'servo_pos'), ('e', 'error'),
+             ('i', 'integral'), ('t', 'device_time_us'), ('n', 'seq'))
+
+
+def format_telemetry(row: Dict[str, float]) -> Optional[str]:
+    if row['roll'] != row['roll']:
+        return None
+    values = {}
+    for key, name in TEXT_KEYS:
+        value = row[name]
+        if value == value:
+            values[key] = int(value) if key in ('t', 'n') else value
+    return json.dumps(values, separators=(',', ':'))
+
+
+def parse_value(text: str) -> float:
+    text = text.strip()
+    return float(text) if text else float('nan')
+
+
+class ColumnarReplaySource:
+    
+    def __init__(self, path: str):
+        self.log = ColumnarLog(path)
+        self.times = self.log['time']
+        self.index = 0
+    
+    def first_time(self) -> Optional[float]:
+        return float(self.times[0]) if len(self.times) else None
+    
+    def exhausted(self) -> bool:
+        return self.index >= len(self.times)
+    
+    def read_until(self, due: float, limit: int) -> Dict[str, np.ndarray]:
+        start = self.index
+        stop = int(self.times[start:start + limit].searchsorted(due, side='right')) + start
+        self.index = stop
+        columns = {}
+        for name in SAMPLE_COLUMNS:
+            column = self.log.columns.get(name)
+            columns[name] = (np.full(stop - start, np.nan) if column is None
+                             else np.array(column[start:stop], dtype=np.float64))
+        return columns
+    
+    def rewind(self):
+        self.index = 0
+    
+    def close(self):
+        self.log = None
+        self.times = None
+
+
+class CSVReplaySource:
+    
+    def __init__(self, path: str):
+        self.file = open(path, 'rb')
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.data_start = self.map.find(b'\n') + 1
+        self.offset = self.data_start
+        self.held = None
+    
+    def _next_row(self):
+        if self.held is not None:
+            row, self.held = self.held, None
+            return row
+        
+        while self.offset < len(self.map):
+            end = self.map.find(b'\n', self.offset)
+            if end < 0:
+                end = len(self.map)
+            raw = self.map[self.offset:end]
+            self.offset = end + 1
+            
+            parts = raw.decode('utf-8', errors='replace').strip().split(',')
+            if len(parts) < 4:
+                continue
+            try:
+                timestamp = datetime.fromisoformat(parts[0]).timestamp()
+                values = [parse_value(value) for value in parts[1:len(SAMPLE_COLUMNS)]]
+            except ValueError:
+                continue
+            values.extend([float('nan')] * (len(SAMPLE_COLUMNS) - 1 - len(values)))
+            return (timestamp, *values)
+        return None
+    
+    def first_time(self) -> Optional[float]:
+        row = self._next_row()
+        if row is None:
+            return None
+        self.held = row
+        return row[0]
+    
+    def exhausted(self) -> bool:
+        return self.held is None and self.offset >= len(self.map)
+    
+    def read_until(self, due: float, limit: int) -> Dict[str, np.ndarray]:
+        rows = []
+        while len(rows) < limit:
+            row = self._next_row()
+            if row is None:
+                break
+            if row[0] > due:
+                self.held = row
+                break
+            rows.append(row)
+        table = np.array(rows, dtype=np.float64).reshape(-1, len(SAMPLE_COLUMNS))
+        return {name: table[:, k] for k, name in enumerate(SAMPLE_COLUMNS)}
+    
+    def rewind(self):
+        self.offset = self.data_start
+        self.held = None
+    
+    def close(self):
+        self.map.close()
+        self.file.close()
+
+
+class ReplayConnection(IColumnConnection):
+    
+    def __init__(self, path: str, speed: Optional[float] = 1.0,
+                 loop: bool = False, max_batch: int = 5000):
+        self.path = path
+        self.speed = speed
+        self.loop = loop
+        self.max_batch = max_batch
+        self.source = None
+        self.connected = False
+        self.start_clock = 0.0
+        self.start_time = 0.0
+        self.time_offset = 0.0
+        self.last_time = None
+        self.last_interval = 0.0
+        self.pending = deque()
+        self.commands: List[str] = []
+    
+    def _open_source(self):
+        path = Path(self.path)
+        if path.is_dir() and (path / HEADER_NAME).exists():
+            return ColumnarReplaySource(self.path)
+        return CSVReplaySource(self.path)
+    
+    def connect(self) -> bool:
+        try:
+            self.source = self._open_source()
+        except Exception as e:
+            print(f"Error opening replay: {e}")
+            return False
+        
+        self.time_offset = 0.0
+        self.last_time = None
+        self._restart()
+        self.connected = True
+        return True
+    
+    def _restart(self):
+        self.start_time = self.source.first_time() or 0.0
+        self.start_clock = time.monotonic()
+    
+    def _loop_back(self):
+        if self.last_time is not None:
+            self.time_offset += self.last_time - self.start_time + self.last_interval
+        self.source.rewind()
+        self._restart()
+        self.last_time = None
+    
+    def disconnect(self):
+        if self.source:
+            self.source.close()
+            self.source = None
+        self.connected = False
+        self.pending.clear()
+    
+    def is_connected(self) -> bool:
+        return self.connected
+    
+    def _due_time(self) -> float:
+        if not self.speed:
+            return float('inf')
+        return self.start_time + (time.monotonic() - self.start_clock) * self.speed
+    
+    def read_columns(self) -> Optional[Dict[str, np.ndarray]]:
+        if not self.is_connected():
+            return None
+        
+        columns = self.source.read_until(self._due_time(), self.max_batch)
+        times = columns['time']
+        count = len(times)
+        if count:
+            if count > 1:
+                self.last_interval = float(times[-1] - times[-2])
+            self.last_time = float(times[-1])
+            if self.time_offset:
+                columns['time'] = times + self.time_offset
+        
+        if self.source.exhausted():
+            if self.loop:
+                self._loop_back()
+            elif not count:
+                self.connected = False
+        return columns if count else None
+    
+    def read_lines(self) -> List[str]:
+        lines = list(self.pending)
+        self.pending.clear()
+        columns = self.read_columns()
+        if columns is not None:
+            names = list(columns)
+            for values in zip(*(columns[name].tolist() for name in names)):
+                line = format_telemetry(dict(zip(names, values)))
+                if line is not None:
+                    lines.append(line)
+        return lines
+    
+    def read_available(self) -> bytes:
+        lines = self.read_lines()
+        if not lines:
+            return b''
+        return ('\n'.join(lines) + '\n').encode('utf-8')
+    
+    def read_line(self) -> Optional[str]:
+        if not self.pending:
+            self.pending.extend(self.read_lines())
+        return self.pending.popleft() if self.pending else None
+    
+    def send_command(self, command: str) -> bool:
+        if not self.is_connected():
+            return False
+        self.commands.append(command)
+        return True
@@ -0,0 +1,76 @@
+from typing import Dict, Tuple, Sequence
+import numpy as np
+
+
+SAMPLE_COLUMNS = (
+    'time', 'roll', 'gyro_rate', 'servo_pos', 'error', 'integral', 'device_time_us', 'seq'
+)
+
+
+class SampleBuffer:
+    
+    def __init__(self, capacity: int = 100000, columns: Sequence[str] = SAMPLE_COLUMNS):
+        self.capacity = capacity
+        self.columns = tuple(columns)
+        self.index = {name: k for k, name in enumerate(self.columns)}
+        self.data = np.full((len(self.columns), 2 * capacity), np.nan)
+        self.write_index = 0
+    
+    def __len__(self) -> int:
+        return min(self.write_index, self.capacity)
+    
+    def append(self, values: Dict[str, np.ndarray]) -> int:
+        count = len(values[self.columns[0]])
+        if count == 0:
+            return 0
+        
+        block = np.empty((len(self.columns), count))
+        for k, name in enumerate(self.columns):
+            column = values.get(name)
+            block[k] = np.nan if column is None else column
+        
+        skipped = max(0, count - self.capacity)
+        if skipped:
+            block = block[:, skipped:]
+        
+        capacity = self.capacity
+        size = block.shape[1]
+        start = (self.write_index + skipped) % capacity
+        first = min(size, capacity - start)
+        rest = size - first
+        
+        self.data[:, start:start + first] = block[:, :first]
+        self.data[:, start + capacity:start + capacity + first] = block[:, :first]
+        if rest:
+            self.data[:, :rest] = block[:, first:]
+            self.data[:, capacity:capacity + rest] = block[:, first:]
+        
+        self.write_index += count
+        return count
+    
+    def window(self, start: int, end: int) -> Dict[str, np.ndarray]:
+        end = min(end, self.write_index)
+        start = max(start, end - self.capacity, 0)
+        count = max(0, end - start)
+        
+        stop = end % self.capacity + self.capacity
+        begin = stop - count
+        return {name: self.data[k, begin:stop] for k, name in enumerate(self.columns)}
+    
+    def latest(self, count: int) -> Dict[str, np.ndarray]:
+        return self.window(self.write_index - count, self.write_index)
+    
+    def since(self, index: int, max_items: int = None) -> Tuple[Dict[str, np.ndarray], int, int]:
+        end = self.write_index
+        lost = max(0, end - index - self.capacity)
+        start = index + lost
+        if max_items is not None:
+            end = min(end, start + max_items)
+        return self.window(start, end), end, lost
+    
+    def column(self, name: str, count: int) -> np.ndarray:
+        return self.latest(count)[name]
+    
+    def clear(self):
+        self.data.fill(np.nan)
+        self.write_index = 0
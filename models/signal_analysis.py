@@ -0,0 +1,305 @@
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+ANALYSIS_COLUMNS = ('time', 'roll', 'error', 'device_time_us')
+
+
+class RollingBlockStats:
+    
+    def __init__(self, window: int = 1000, block: int = 50):
+        self.block = block
+        self.blocks = deque(maxlen=max(1, window // block))
+        self.partial = np.empty(0)
+    
+    def update(self, values: np.ndarray):
+        values = np.asarray(values, dtype=np.float64)
+        if len(self.partial):
+            values = np.concatenate([self.partial, values])
+        
+        full = len(values) - len(values) % self.block
+        if full:
+            blocks = values[:full].reshape(-1, self.block)
+            finite = np.isfinite(blocks)
+            squares = np.where(finite, blocks * blocks, 0.0).sum(axis=1)
+            low = np.fmin.reduce(blocks, axis=1)
+            high = np.fmax.reduce(blocks, axis=1)
+            self.blocks.extend(zip(low.tolist(), high.tolist(), squares.tolist(),
+                                   finite.sum(axis=1).tolist()))
+        self.partial = values[full:].copy()
+    
+    def _stats(self) -> Optional[np.ndarray]:
+        stats = np.array(self.blocks, dtype=np.float64).reshape(-1, 4)
+        partial = self.partial[np.isfinite(self.partial)]
+        if len(partial):
+            extra = [partial.min(), partial.max(), float(np.dot(partial, partial)), len(partial)]
+            stats = np.vstack([stats, extra])
+        stats = stats[stats[:, 3] > 0]
+        return stats if len(stats) else None
+    
+    def rms(self) -> Optional[float]:
+        stats = self._stats()
+        if stats is None:
+            return None
+        return float(np.sqrt(stats[:, 2].sum() / stats[:, 3].sum()))
+    
+    def peak_to_peak(self) -> Optional[float]:
+        stats = self._stats()
+        if stats is None:
+            return None
+        return float(stats[:, 1].max() - stats[:, 0].min())
+    
+    def reset(self):
+        self.blocks.clear()
+        self.partial = np.empty(0)
+
+
+class OnlineWelch:
+    
+    def __init__(self, nperseg: int = 256, overlap: float = 0.5, averaging: float = 0.1):
+        self.nperseg = nperseg
+        self.hop = max(1, int(nperseg * (1.0 - overlap)))
+        self.averaging = averaging
+        self.window = np.hanning(nperseg)
+        self.scale = float((self.window ** 2).sum())
+        self.tail = np.empty(0)
+        self.power: Optional[np.ndarray] = None
+        self.segments = 0
+    
+    def update(self, values: np.ndarray):
+        values = np.concatenate([self.tail, np.asarray(values, dtype=np.float64)])
+        if len(values) < self.nperseg:
+            self.tail = values
+            return
+        
+        segments = sliding_window_view(values, self.nperseg)[::self.hop]
+        self.tail = values[len(segments) * self.hop:].copy()
+        segments = segments[np.isfinite(segments).all(axis=1)]
+        if len(segments) == 0:
+            return
+        
+        segments = segments - segments.mean(axis=1, keepdims=True)
+        spectra = np.abs(np.fft.rfft(segments * self.window, axis=1)) ** 2 / self.scale
+        spectra[:, 1:-1] *= 2.0
+        
+        count = len(spectra)
+        if self.power is None:
+            self.power = spectra.mean(axis=0)
+        else:
+            keep = 1.0 - self.averaging
+            weights = self.averaging * keep ** np.arange(count - 1, -1, -1)
+            self.power = self.power * keep ** count + weights @ spectra
+        self.segments += count
+    
+    def density(self, sample_rate: float) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        if self.power is None or not sample_rate:
+            return None
+        freqs = np.fft.rfftfreq(self.nperseg, 1.0 / sample_rate)
+        return freqs, self.power / sample_rate
+    
+    def reset(self):
+        self.tail = np.empty(0)
+        self.power = None
+        self.segments = 0
+
+
+class StepResponse:
+    
+    def __init__(self, start: float, label: str = "", duration: float = 5.0,
+                 band: float = 1.0, band_ratio: float = 0.05, min_step: float = 2.0):
+        self.start = start
+        self.label = label
+        self.duration = duration
+        self.band = band
+        self.band_ratio = band_ratio
+        self.min_step = min_step
+        self.complete = False
+        self._times: List[np.ndarray] = []
+        self._errors: List[np.ndarray] = []
+    
+    def update(self, times: np.ndarray, errors: np.ndarray) -> bool:
+        end = self.start + self.duration
+        mask = (times >= self.start) & (times <= end)
+        if mask.any():
+            self._times.append(times[mask])
+            self._errors.append(errors[mask])
+        if len(times) and times[-1] > end:
+            self.complete = True
+        return self.complete
+    
+    def metrics(self) -> dict:
+        result = {'label': self.label, 'complete': self.complete, 'rise_time': None,
+                  'overshoot_pct': None, 'settling_time': None, 'peak_error': None,
+                  'iae': None}
+        if not self._times:
+            return result
+        
+        times = np.concatenate(self._times) - self.start
+        errors = np.concatenate(self._errors)
+        finite = np.isfinite(errors)
+        times, errors = times[finite], errors[finite]
+        if len(errors) < 2:
+            return result
+        
+        magnitude = np.abs(errors)
+        initial = errors[0]
+        amplitude = abs(initial)
+        result['peak_error'] = float(magnitude.max())
+        result['iae'] = float(np.sum(0.5 * (magnitude[1:] + magnitude[:-1]) * np.diff(times)))
+        
+        band = max(self.band, self.band_ratio * amplitude)
+        outside = np.flatnonzero(magnitude > band)
+        if len(outside) == 0:
+            result['settling_time'] = 0.0
+        elif outside[-1] + 1 < len(times):
+            result['settling_time'] = float(times[outside[-1] + 1])
+        
+        if amplitude >= self.min_step:
+            upper = np.flatnonzero(magnitude <= 0.9 * amplitude)
+            lower = np.flatnonzero(magnitude <= 0.1 * amplitude)
+            if len(upper) and len(lower):
+                result['rise_time'] = float(times[lower[0]] - times[upper[0]])
+            overshoot = max(0.0, float((-np.sign(initial) * errors).max()))
+            result['overshoot_pct'] = float(100.0 * overshoot / amplitude)
+        return result
+
+
+class StreamAnalyzer:
+    
+    def __init__(self, window: int = 1000, block: int = 50, nperseg: int = 1024,
+                 step_duration: float = 5.0, settle_band: float = 1.0, batch: int = 256):
+        self.error_stats = RollingBlockStats(window, block)
+        self.roll_stats = RollingBlockStats(window, block)
+        self.welch = OnlineWelch(nperseg)
+        self.step_duration = step_duration
+        self.settle_band = settle_band
+        self.sample_rate: Optional[float] = None
+        self.step: Optional[StepResponse] = None
+        self.steps = deque(maxlen=20)
+        self.samples = 0
+        self.batch = batch
+        self._pending: List[Dict[str, np.ndarray]] = []
+        self._pending_count = 0
+        self._clock_source = None
+        self._last_clock = np.nan
+        self._lock = threading.RLock()
+    
+    def update(self, columns: Dict[str, np.ndarray]):
+        with self._lock:
+            count = len(columns['time'])
+            if count == 0:
+                return
+            self._pending.append({name: np.array(columns[name]) for name in ANALYSIS_COLUMNS})
+            self._pending_count += count
+            if self._pending_count >= self.batch:
+                self.flush()
+    
+    def flush(self):
+        with self._lock:
+            if not self._pending:
+                return
+            
+            pending, self._pending, self._pending_count = self._pending, [], 0
+            if len(pending) == 1:
+                columns = pending[0]
+            else:
+                columns = {name: np.concatenate([chunk[name] for chunk in pending])
+                           for name in ANALYSIS_COLUMNS}
+            self._process(columns)
+    
+    def _process(self, columns: Dict[str, np.ndarray]):
+        self.samples += len(columns['time'])
+        roll = columns['roll']
+        error = columns['error']
+        self.error_stats.update(error)
+        self.roll_stats.update(roll)
+        self.welch.update(roll)
+        self._update_rate(columns)
+        
+        if self.step is not None and self.step.update(columns['time'], error):
+            self.steps.append(self.step.metrics())
+            self.step = None
+    
+    def _update_rate(self, columns: Dict[str, np.ndarray]):
+        clock = columns['device_time_us'] * 1e-6
+        source = 'device_time_us'
+        if not np.isfinite(clock).any():
+            clock = columns['time']
+            source = 'time'
+        if source != self._clock_source:
+            self._clock_source = source
+            self._last_clock = np.nan
+        
+        intervals = np.diff(clock, prepend=self._last_clock)
+        self._last_clock = clock[-1]
+        intervals = intervals[np.isfinite(intervals) & (intervals > 0)]
+        if len(intervals) == 0:
+            return
+        
+        rate = 1.0 / float(np.median(intervals))
+        if self.sample_rate is None:
+            self.sample_rate = rate
+        else:
+            self.sample_rate += 0.1 * (rate - self.sample_rate)
+    
+    def mark_step(self, label: str = "", timestamp: Optional[float] = None):
+        with self._lock:
+            self.flush()
+            if self.step is not None:
+                self.steps.append(self.step.metrics())
+            self.step = StepResponse(timestamp or time.time(), label, self.step_duration,
+                                     self.settle_band)
+    
+    def spectrum(self) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        with self._lock:
+            self.flush()
+            return self.welch.density(self.sample_rate)
+    
+    def dominant_frequency(self, min_freq: float = 0.2) -> Optional[float]:
+        spectrum = self.spectrum()
+        if spectrum is None:
+            return None
+        
+        freqs, power = spectrum
+        valid = np.flatnonzero(freqs >= min_freq)
+        if len(valid) == 0:
+            return None
+        peak = valid[np.argmax(power[valid])]
+        if 0 < peak < len(power) - 1:
+            left, center, right = power[peak - 1:peak + 2]
+            curvature = left - 2 * center + right
+            if curvature:
+                return float(freqs[peak] + 0.5 * (left - right) / curvature * freqs[1])
+        return float(freqs[peak])
+    
+    def summary(self) -> dict:
+        with self._lock:
+            self.flush()
+            step = self.step.metrics() if self.step is not None else (
+                self.steps[-1] if self.steps else None)
+            return {
+                'samples': self.samples,
+                'sample_rate': self.sample_rate,
+                'rms_error': self.error_stats.rms(),
+                'peak_to_peak': self.roll_stats.peak_to_peak(),
+                'dominant_hz': self.dominant_frequency(),
+                'step': step
+            }
+    
+    def reset(self):
+        with self._lock:
+            self.error_stats.reset()
+            self.roll_stats.reset()
+            self.welch.reset()
+            self.sample_rate = None
+            self.step = None
+            self.steps.clear()
+            self.samples = 0
+            self._pending = []
+            self._pending_count = 0
+            self._clock_source = None
+            self._last_clock = np.nan
@@ -0,0 +1,108 @@
+from collections import deque
+import numpy as np
+
+
+class StreamStats:
+    
+    def __init__(self, seq_modulus: int = 1 << 32, clock_modulus: int = 1 << 32,
+                 window: int = 256):
+        self.seq_modulus = seq_modulus
+        self.clock_modulus = clock_modulus
+        self.received = 0
+        self.lost = 0
+        self.gaps = 0
+        self.out_of_order = 0
+        self.resets = 0
+        self.last_seq = None
+        self.last_clock = None
+        self.device_us = 0
+        self.offsets = deque(maxlen=window)
+        self.delays = deque(maxlen=window)
+        self.intervals = deque(maxlen=window * 4)
+    
+    def reset_sequence(self, seq_modulus: int = None):
+        if seq_modulus is not None:
+            self.seq_modulus = seq_modulus
+        self.last_seq = None
+        self.last_clock = None
+        self.offsets.clear()
+    
+    def update(self, seq: np.ndarray, device_time_us: np.ndarray,
+               host_time: float) -> np.ndarray:
+        count = len(seq)
+        self.received += count
+        timestamps = np.full(count, host_time)
+        if count == 0:
+            return timestamps
+        
+        seq = np.asarray(seq, dtype=np.float64)
+        clock = np.asarray(device_time_us, dtype=np.float64)
+        valid = ~(np.isnan(seq) | np.isnan(clock))
+        if not valid.any():
+            return timestamps
+        
+        seq = seq[valid].astype(np.int64)
+        clock = clock[valid].astype(np.int64)
+        
+        first_batch = self.last_seq is None
+        previous_seq = np.empty_like(seq)
+        previous_seq[1:] = seq[:-1]
+        previous_seq[0] = seq[0] - 1 if self.last_seq is None else self.last_seq
+        steps = (seq - previous_seq) % self.seq_modulus
+        
+        backwards = steps > self.seq_modulus // 2
+        skipped = (steps > 1) & ~backwards
+        self.out_of_order += int(np.count_nonzero(backwards | (steps == 0)))
+        self.gaps += int(np.count_nonzero(skipped))
+        self.lost += int((steps[skipped] - 1).sum())
+        
+        previous_clock = np.empty_like(clock)
+        previous_clock[1:] = clock[:-1]
+        previous_clock[0] = clock[0] if self.last_clock is None else self.last_clock
+        deltas = (clock - previous_clock) % self.clock_modulus
+        
+        reset = deltas > self.clock_modulus // 2
+        if reset.any():
+            self.resets += int(np.count_nonzero(reset))
+            self.offsets.clear()
+            deltas[reset] = 0
+        
+        in_order = steps == 1
+        if first_batch:
+            in_order[0] = False
+        if in_order.any():
+            self.intervals.extend((deltas[in_order] / steps[in_order]).tolist())
+        
+        device_s = (self.device_us + np.cumsum(deltas)) / 1e6
+        self.device_us += int(deltas.sum())
+        self.last_seq = int(seq[-1])
+        self.last_clock = int(clock[-1])
+        
+        candidate = host_time - float(device_s[-1])
+        self.offsets.append(candidate)
+        offset = min(self.offsets)
+        self.delays.append(candidate - offset)
+        
+        timestamps[valid] = device_s + offset
+        return timestamps
+    
+    def clock_offset(self) -> float:
+        return min(self.offsets) if self.offsets else 0.0
+    
+    def summary(self) -> dict:
+        intervals = np.asarray(self.intervals)
+        delays = np.asarray(self.delays)
+        mean_interval = float(intervals.mean()) if len(intervals) else 0.0
+        expected = self.received + self.lost
+        return {
+            'received': self.received,
+            'lost': self.lost,
+            'gaps': self.gaps,
+            'out_of_order': self.out_of_order,
+            'drop_rate': self.lost / expected if expected else 0.0,
+            'rate_hz': 1e6 / mean_interval if mean_interval > 0 else 0.0,
+            'jitter_us': float(intervals.std()) if len(intervals) else 0.0,
+            'clock_offset_s': self.clock_offset(),
+            'arrival_delay_ms': float(delays.mean()) * 1000 if len(delays) else 0.0,
+            'arrival_delay_max_ms': float(delays.max()) * 1000 if len(delays) else 0.0,
+        }
@@ -0,0 +1,208 @@
+import argparse
+import signal
+import sys
+import threading
+import time
+from typing import Dict, List, Optional
+from controllers import DataManager
+
+
+STATS_KEYS = ('samples', 'malformed', 'ingest_dropped', 'reconnects', 'gaps')
+
+
+def parse_endpoint(value: str, default_port: int):
+    host, _, port = value.rpartition(':')
+    if host and port.isdigit():
+        return host, int(port)
+    return value, default_port
+
+
+def parse_gains(value: str):
+    try:
+        kp, ki, kd = (float(part) for part in value.split(','))
+    except ValueError:
+        raise argparse.ArgumentTypeError("expected kp,ki,kd")
+    return kp, ki, kd
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog='stabilizer', description="Ball Stabilizer tools")
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    record = commands.add_parser('record', help="stream telemetry straight to disk")
+    source = record.add_mutually_exclusive_group(required=True)
+    source.add_argument('--serial', metavar='PORT', help="serial port of the stabilizer")
+    source.add_argument('--tcp', metavar='HOST[:PORT]', help="TCP telemetry server")
+    source.add_argument('--mqtt', metavar='BROKER[:PORT]', help="MQTT broker")
+    source.add_argument('--simulate', metavar='HZ', type=float,
+                        help="record the built-in plant simulator at this rate")
+    record.add_argument('--baudrate', type=int, default=921600)
+    record.add_argument('--topic', default="gimbal/stabilizer",
+                        help="MQTT data topic, wildcards record every matching device")
+    record.add_argument('--command-topic', default=None,
+                        help="MQTT command topic (default: derived from --topic)")
+    record.add_argument('-o', '--output', default=None,
+                        help="log file name (default: timestamped)")
+    record.add_argument('--format', choices=('csv', 'columnar'), default='columnar')
+    record.add_argument('--binary', action='store_true',
+                        help="switch the device to binary telemetry frames")
+    record.add_argument('--pid', type=parse_gains, default=None, metavar='KP,KI,KD',
+                        help="send these gains once connected")
+    record.add_argument('--duration', type=float, default=None,
+                        help="stop after this many seconds")
+    record.add_argument('--stats-interval', type=float, default=1.0,
+                        help="seconds between status lines, 0 to disable")
+    record.add_argument('--max-mb', type=float, default=None,
+                        help="rotate the log file at this size")
+    record.add_argument('--rotate-minutes', type=float, default=None,
+                        help="rotate the log file after this many minutes")
+    record.add_argument('--buffer-size', type=int, default=8192,
+                        help="samples kept in memory per device")
+    record.add_argument('--watchdog', type=float, default=3.0,
+                        help="seconds without data before reconnecting")
+    return parser.parse_args(argv)
+
+
+class Recorder:
+    
+    def __init__(self, args):
+        self.args = args
+        self.manager = DataManager(buffer_size=args.buffer_size, watchdog=args.watchdog,
+                                   keep_history=False)
+        self.stop_event = threading.Event()
+        self.hub = False
+        self.states: Dict[str, str] = {}
+        self.configured = set()
+        self.loggers = {}
+        self.started = 0.0
+        self.last_clock = 0.0
+        self.last_samples = 0
+    
+    def log_options(self) -> dict:
+        options = {}
+        if self.args.max_mb:
+            options['max_bytes'] = int(self.args.max_mb * 1024 * 1024)
+        if self.args.rotate_minutes:
+            options['rotate_interval'] = self.args.rotate_minutes * 60.0
+        return options
+    
+    def connect(self) -> bool:
+        args = self.args
+        if args.serial:
+            return self.manager.connect_serial(args.serial, args.baudrate)
+        if args.tcp:
+            host, port = parse_endpoint(args.tcp, 8888)
+            return self.manager.connect_wifi(host, port)
+        if args.mqtt:
+            broker, port = parse_endpoint(args.mqtt, 1883)
+            topic_cmd = args.command_topic or args.topic.replace('stabilizer', 'command')
+            if '+' in args.topic or '#' in args.topic:
+                self.hub = True
+                self.manager.connect_mqtt_hub(broker, port, args.topic, topic_cmd)
+                return True
+            return self.manager.connect_mqtt(broker, port, args.topic, topic_cmd)
+        return self.manager.start_simulation(args.simulate)
+    
+    def start_logging(self, device: str):
+        output = None if self.hub else self.args.output
+        self.manager.start_logging(output, self.args.format, device, **self.log_options())
+        self.loggers[device] = self.manager.get_device(device).logger
+        print(f"[{device}] Recording to {self.manager.get_log_filename(device)}")
+    
+    def recording_devices(self) -> List[str]:
+        return [name for name in self.manager.device_names()
+                if self.manager.is_active(name)]
+    
+    def poll_devices(self):
+        if self.hub:
+            for name in self.manager.update_devices():
+                self.start_logging(name)
+        
+        for name in self.recording_devices():
+            state = self.manager.get_connection_state(name)
+            if state != self.states.get(name):
+                self.states[name] = state
+                print(f"[{name}] {state}")
+            if state == 'connected' and name not in self.configured:
+                self.configured.add(name)
+                self.configure(name)
+    
+    def configure(self, device: str):
+        if self.args.binary and not self.manager.set_binary_telemetry(True, device):
+            print(f"[{device}] Failed to enable binary telemetry")
+        if self.args.pid and not self.manager.send_pid_values(*self.args.pid, device=device):
+            print(f"[{device}] Failed to send PID values")
+    
+    def totals(self) -> dict:
+        totals = dict.fromkeys(STATS_KEYS + ('lost', 'logged'), 0)
+        for name in self.recording_devices():
+            stats = self.manager.get_acquisition_stats(name)
+            for key in STATS_KEYS:
+                totals[key] += stats.get(key, 0)
+            totals['lost'] += self.manager.get_stream_stats(name).get('lost', 0)
+        totals['logged'] = sum(logger.rows_written for logger in self.loggers.values())
+        return totals
+    
+    def print_stats(self):
+        now = time.monotonic()
+        totals = self.totals()
+        rate = (totals['samples'] - self.last_samples) / max(now - self.last_clock, 1e-9)
+        self.last_clock = now
+        self.last_samples = totals['samples']
+        self.report(f"[{now - self.started:7.1f}s]", rate, totals)
+    
+    def report(self, label: str, rate: float, totals: dict):
+        lost = totals['lost']
+        loss = lost / (totals['samples'] + lost) if totals['samples'] + lost else 0.0
+        print(f"{label} "
+              f"{rate:8.1f} Hz | samples {totals['samples']} | logged {totals['logged']} | "
+              f"lost {lost} ({loss:.2%}) | ingest dropped {totals['ingest_dropped']} | "
+              f"malformed {totals['malformed']} | gaps {totals['gaps']} | "
+              f"reconnects {totals['reconnects']}", flush=True)
+    
+    def request_stop(self, signum, frame):
+        signal.signal(signum, signal.SIG_DFL)
+        self.stop_event.set()
+    
+    def run(self) -> int:
+        signal.signal(signal.SIGINT, self.request_stop)
+        signal.signal(signal.SIGTERM, self.request_stop)
+        
+        if not self.connect() or not self.manager.wait_connected():
+            print("Failed to connect")
+            self.manager.shutdown()
+            return 1
+        if not self.hub:
+            self.start_logging(self.manager.current)
+        
+        self.started = self.last_clock = time.monotonic()
+        deadline = self.started + self.args.duration if self.args.duration else None
+        next_stats = self.started + self.args.stats_interval
+        try:
+            while not self.stop_event.is_set():
+                self.poll_devices()
+                now = time.monotonic()
+                if deadline is not None and now >= deadline:
+                    break
+                if self.args.stats_interval > 0 and now >= next_stats:
+                    self.print_stats()
+                    next_stats += self.args.stats_interval
+                self.stop_event.wait(0.1)
+        finally:
+            totals = self.totals()
+            elapsed = time.monotonic() - self.started
+            self.manager.shutdown()
+            totals['logged'] = sum(logger.rows_written for logger in self.loggers.values())
+            self.report("Total", totals['samples'] / max(elapsed, 1e-9), totals)
+        return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    if args.command == 'record':
+        return Recorder(args).run()
+    return 2
+
+
+if __name__ == '__main__':
+    sys.exit(main())
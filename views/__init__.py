@@ -1,4 +1,24 @@
-from .plot_widget import PlotWidget
-from .main_window import BallStabilizerDashboard
+import importlib
 
-__all__ = ['PlotWidget', 'BallStabilizerDashboard']
+LAZY_IMPORTS = {
+    'PlotWidget': 'plot_widget',
+    'FastPlotWidget': 'fast_plot_widget',
+    'AnalysisPanel': 'analysis_panel',
+    'StatsPanel': 'stats_panel',
+    'BallStabilizerDashboard': 'main_window'
+}
+
+__all__ = ['PlotWidget', 'FastPlotWidget', 'AnalysisPanel', 'StatsPanel', 'BallStabilizerDashboard']
+
+
+def __getattr__(name):
+    module = LAZY_IMPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{module}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
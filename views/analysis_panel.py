@@ -0,0 +1,93 @@
+import numpy as np
+from PyQt5.QtCore import QTimer
+from PyQt5.QtWidgets import QGroupBox, QVBoxLayout, QLabel
+from models import StreamAnalyzer
+
+
+class AnalysisPanel(QGroupBox):
+    
+    def __init__(self, analyzer: StreamAnalyzer = None, parent=None, interval_ms: int = 500):
+        super().__init__("Signal Analysis", parent)
+        self.analyzer = analyzer if analyzer is not None else StreamAnalyzer()
+        
+        layout = QVBoxLayout()
+        self.rms_label = QLabel("RMS Error: -")
+        self.p2p_label = QLabel("Roll Peak-to-Peak: -")
+        self.freq_label = QLabel("Dominant Freq: -")
+        self.rate_label = QLabel("Sample Rate: -")
+        self.step_label = QLabel("Step: -")
+        self.step_label.setWordWrap(True)
+        for label in (self.rms_label, self.p2p_label, self.freq_label,
+                      self.rate_label, self.step_label):
+            layout.addWidget(label)
+        
+        self.figure = None
+        self.canvas = None
+        self.setLayout(layout)
+        
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+        self.timer.start(interval_ms)
+    
+    def set_source(self, analyzer: StreamAnalyzer):
+        self.analyzer = analyzer
+        self.refresh()
+    
+    def refresh(self):
+        summary = self.analyzer.summary()
+        self.rms_label.setText(f"RMS Error: {self._format(summary['rms_error'], '°')}")
+        self.p2p_label.setText(
+            f"Roll Peak-to-Peak: {self._format(summary['peak_to_peak'], '°')}"
+        )
+        self.freq_label.setText(
+            f"Dominant Freq: {self._format(summary['dominant_hz'], ' Hz', 2)}"
+        )
+        self.rate_label.setText(f"Sample Rate: {self._format(summary['sample_rate'], ' Hz', 1)}")
+        self.step_label.setText(self._format_step(summary['step']))
+        self._draw_spectrum()
+    
+    def _create_plot(self):
+        from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+        from matplotlib.figure import Figure
+        
+        self.figure = Figure(figsize=(3, 2.5))
+        self.canvas = FigureCanvas(self.figure)
+        self.ax = self.figure.add_subplot(111)
+        self.psd_line, = self.ax.semilogy([], [], 'b-')
+        self.ax.set_xlabel('Frequency (Hz)')
+        self.ax.set_ylabel('Roll PSD (°²/Hz)')
+        self.ax.grid(True)
+        self.figure.tight_layout()
+        self.layout().addWidget(self.canvas)
+    
+    def _draw_spectrum(self):
+        spectrum = self.analyzer.spectrum()
+        if spectrum is None:
+            if self.canvas is not None and len(self.psd_line.get_xdata()):
+                self.psd_line.set_data([], [])
+                self.canvas.draw_idle()
+            return
+        
+        if self.canvas is None:
+            self._create_plot()
+        freqs, power = spectrum[0][1:], spectrum[1][1:]
+        power = np.maximum(power, 1e-12)
+        self.psd_line.set_data(freqs, power)
+        self.ax.set_xlim(freqs[0], freqs[-1])
+        self.ax.set_ylim(power.min(), power.max() * 2)
+        self.canvas.draw_idle()
+    
+    @staticmethod
+    def _format(value, unit: str = '', digits: int = 2) -> str:
+        return '-' if value is None else f"{value:.{digits}f}{unit}"
+    
+    def _format_step(self, step) -> str:
+        if step is None:
+            return "Step: -"
+        state = "done" if step['complete'] else "measuring"
+        return (
+            f"Step ({state}): rise {self._format(step['rise_time'], ' s')} | "
+            f"overshoot {self._format(step['overshoot_pct'], '%', 1)} | "
+            f"settling {self._format(step['settling_time'], ' s')} | "
+            f"IAE {self._format(step['iae'])}"
+        )
@@ -0,0 +1,181 @@
+import time
+from typing import List, Dict
+import numpy as np
+from PyQt5.QtCore import QTimer
+from PyQt5.QtWidgets import QWidget, QVBoxLayout
+from models import IMUData, SampleBuffer, HistoryStore, columns_from_samples, METRICS
+try:
+    import pyqtgraph as pg
+except ImportError:
+    pg = None
+
+
+CHANNELS = [
+    ('Roll Angle (°)', [('roll', 'Roll Angle', 'b')]),
+    ('Gyro Rate (°/s)', [('gyro_rate', 'Gyro Rate', 'r')]),
+    ('Servo Position (°)', [('servo_pos', 'Servo Position', 'g')]),
+    ('Error / Integral', [('error', 'Error', 'm'), ('integral', 'Integral', 'c')]),
+]
+
+OVERLAY_COLORS = ['#ff7f0e', '#2ca02c', '#9467bd', '#8c564b',
+                  '#e377c2', '#bcbd22', '#17becf', '#7f7f7f']
+
+
+class FastPlotWidget(QWidget):
+    
+    def __init__(self, parent=None, max_points=100000, buffer: SampleBuffer = None,
+                 fps: int = 30, history: HistoryStore = None):
+        if pg is None:
+            raise ImportError("pyqtgraph library not installed. Run: pip install pyqtgraph")
+        
+        super().__init__(parent)
+        
+        self.max_points = max_points
+        self.buffer = buffer if buffer is not None else SampleBuffer(max_points)
+        self.clear_index = self.buffer.write_index
+        self.history = history
+        self.live = True
+        
+        pg.setConfigOptions(antialias=False, background='w', foreground='k')
+        self.graphics = pg.GraphicsLayoutWidget()
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self.graphics)
+        
+        self.plots = []
+        self.curves = []
+        self.overlays = []
+        for row, (label, channels) in enumerate(CHANNELS):
+            plot = self.graphics.addPlot(row=row, col=0)
+            plot.setLabel('left', label)
+            plot.setLabel('bottom', 'Time (s)')
+            plot.showGrid(x=True, y=True, alpha=0.3)
+            plot.setDownsampling(auto=True, mode='peak')
+            plot.setClipToView(True)
+            plot.addLegend(offset=(10, 5))
+            plot.getViewBox().sigRangeChangedManually.connect(self._on_range_changed)
+            if self.plots:
+                plot.setXLink(self.plots[0])
+            
+            for name, title, color in channels:
+                curve = plot.plot(pen=pg.mkPen(color, width=1), name=title,
+                                  connect='finite', skipFiniteCheck=True)
+                self.curves.append((curve, name, plot))
+            self.plots.append(plot)
+        
+        self.start_time = None
+        self.dirty = False
+        self.frames_drawn = 0
+        
+        self.frame_timer = QTimer(self)
+        self.frame_timer.timeout.connect(self.render_frame)
+        self.frame_timer.start(max(1, int(1000 / fps)))
+    
+    def update_data(self, data: IMUData):
+        self.update_batch([data])
+    
+    def update_batch(self, samples: List[IMUData]):
+        if not samples:
+            return
+        self.buffer.append(columns_from_samples(samples))
+        self.refresh()
+    
+    def refresh(self):
+        self.dirty = True
+    
+    def render_frame(self):
+        if not self.dirty or not self.live:
+            return
+        self.dirty = False
+        
+        start = time.perf_counter()
+        self._render()
+        METRICS.record('plot', time.perf_counter() - start)
+    
+    def _render(self):
+        end = self.buffer.write_index
+        start = max(self.clear_index, end - self.max_points)
+        window = self.buffer.window(start, end)
+        times = window['time']
+        if len(times) == 0:
+            return
+        
+        if self.start_time is None:
+            self.start_time = times[0]
+        METRICS.record('plot.age', time.time() - times[-1])
+        
+        elapsed = times - self.start_time
+        for curve, name, _ in self.curves:
+            curve.setData(elapsed, np.array(window[name]))
+        
+        for buffer, curves in self.overlays:
+            end = buffer.write_index
+            window = buffer.window(max(0, end - self.max_points), end)
+            elapsed = window['time'] - self.start_time
+            for curve, name, _ in curves:
+                curve.setData(elapsed, np.array(window[name]))
+        self.frames_drawn += 1
+    
+    def set_source(self, buffer: SampleBuffer, history: HistoryStore = None):
+        self.buffer = buffer
+        self.history = history
+        self.clear_plot()
+        self.clear_index = 0
+        self.dirty = True
+    
+    def set_overlays(self, buffers: Dict[str, SampleBuffer]):
+        for _, curves in self.overlays:
+            for curve, _, plot in curves:
+                plot.removeItem(curve)
+        
+        self.overlays = []
+        for index, (device, buffer) in enumerate(buffers.items()):
+            pen = pg.mkPen(OVERLAY_COLORS[index % len(OVERLAY_COLORS)], width=1,
+                           style=pg.QtCore.Qt.DashLine)
+            curves = [(plot.plot(pen=pen, name=f"{device} {name}", connect='finite',
+                                 skipFiniteCheck=True), name, plot)
+                      for _, name, plot in self.curves]
+            self.overlays.append((buffer, curves))
+        self.dirty = True
+    
+    def _on_range_changed(self, mask):
+        if mask[0]:
+            x0, x1 = self.plots[0].viewRange()[0]
+            self.show_history(x0, x1)
+    
+    def show_history(self, x0: float, x1: float):
+        if self.history is None or self.start_time is None or x1 <= x0:
+            return
+        self.live = False
+        
+        names = [name for _, name, _ in self.curves]
+        series = self.history.query(self.start_time + x0, self.start_time + x1,
+                                    max(100, self.width()), names)
+        elapsed = np.repeat(series['time'] - self.start_time, 2)
+        for curve, name, _ in self.curves:
+            if len(elapsed) == 0:
+                curve.setData([], [])
+                continue
+            values = np.column_stack((series[f"{name}_min"], series[f"{name}_max"])).ravel()
+            curve.setData(elapsed, values)
+    
+    def go_live(self):
+        if self.live:
+            return
+        self.live = True
+        for plot in self.plots:
+            plot.enableAutoRange()
+        self.dirty = True
+    
+    def clear_plot(self):
+        self.clear_index = self.buffer.write_index
+        self.start_time = None
+        self.dirty = False
+        self.live = True
+        for plot in self.plots:
+            plot.enableAutoRange()
+        for curve, _, _ in self.curves:
+            curve.setData([], [])
+        for _, curves in self.overlays:
+            for curve, _, _ in curves:
+                curve.setData([], [])
@@ -1,25 +1,39 @@
 from PyQt5.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QPushButton, QLabel, QLineEdit, QComboBox,
-    QGroupBox, QRadioButton, QButtonGroup, QMessageBox
+    QGroupBox, QRadioButton, QButtonGroup, QMessageBox, QFileDialog,
+    QCheckBox
 )
-from PyQt5.QtCore import QTimer
-from models.connection import SerialConnection
-from controllers import DataManager
-from .plot_widget import PlotWidget
+from PyQt5.QtCore import Qt, QTimer
+from controllers import DataManager, DEFAULT_DEVICE
+from .analysis_panel import AnalysisPanel
+from .stats_panel import StatsPanel
+
+
+DEFAULT_MAX_POINTS = {
+    'matplotlib': 30000,
+    'pyqtgraph': 100000,
+}
+PLOT_LOAD_DELAY_MS = 50
 
 
 class BallStabilizerDashboard(QMainWindow):
     
-    def __init__(self):
+    def __init__(self, plot_backend: str = 'matplotlib', max_points: int = None):
         super().__init__()
-        self.data_manager = DataManager()
+        self.plot_backend = plot_backend
+        self.max_points = max_points or DEFAULT_MAX_POINTS.get(plot_backend, 500)
+        self.data_manager = DataManager(buffer_size=max(100000, self.max_points))
         self.data_count = 0
+        self.connection_state = 'idle'
+        self.tuning = False
+        self.ports_future = None
         self.init_ui()
+        QTimer.singleShot(PLOT_LOAD_DELAY_MS, self.load_plot_widget)
         
         self.timer = QTimer()
         self.timer.timeout.connect(self.update_data)
-        self.timer.start(100)
+        self.timer.start(33)
     
     def init_ui(self):
         self.setWindowTitle('Ball Stabilizer Dashboard')
@@ -39,11 +53,50 @@ class BallStabilizerDashboard(QMainWindow):
         pid_group = self.create_pid_control_group()
         main_layout.addWidget(pid_group)
         
-        self.plot_widget = PlotWidget(max_points=500)
-        main_layout.addWidget(self.plot_widget)
+        self.plot_layout = QHBoxLayout()
+        self.plot_widget = None
+        self.plot_placeholder = QLabel("Loading plot...")
+        self.plot_placeholder.setAlignment(Qt.AlignCenter)
+        self.plot_layout.addWidget(self.plot_placeholder, 4)
+        
+        side_layout = QVBoxLayout()
+        self.analysis_panel = AnalysisPanel(self.data_manager.analyzer)
+        side_layout.addWidget(self.analysis_panel)
         
-        control_layout = self.create_control_buttons()
-        main_layout.addLayout(control_layout)
+        self.stats_panel = StatsPanel()
+        side_layout.addWidget(self.stats_panel)
+        self.plot_layout.addLayout(side_layout, 1)
+        main_layout.addLayout(self.plot_layout)
+        
+        self.control_layout = self.create_control_buttons()
+        main_layout.addLayout(self.control_layout)
+    
+    def load_plot_widget(self):
+        if self.plot_widget is not None:
+            return
+        self.plot_widget = self.create_plot_widget()
+        self.plot_layout.removeWidget(self.plot_placeholder)
+        self.plot_placeholder.deleteLater()
+        self.plot_layout.insertWidget(0, self.plot_widget, 4)
+        
+        if hasattr(self.plot_widget, 'go_live'):
+            self.live_btn = QPushButton("Go Live")
+            self.live_btn.clicked.connect(self.plot_widget.go_live)
+            self.control_layout.insertWidget(self.control_layout.count() - 1, self.live_btn)
+        self.update_overlays()
+    
+    def create_plot_widget(self):
+        if self.plot_backend == 'pyqtgraph':
+            try:
+                from .fast_plot_widget import FastPlotWidget
+                return FastPlotWidget(max_points=self.max_points,
+                                      buffer=self.data_manager.buffer,
+                                      history=self.data_manager.history)
+            except ImportError as e:
+                print(f"{e}. Falling back to matplotlib plotting.")
+        from .plot_widget import PlotWidget
+        return PlotWidget(max_points=self.max_points, buffer=self.data_manager.buffer,
+                          history=self.data_manager.history)
     
     def create_connection_group(self):
         group = QGroupBox("Connection Settings")
@@ -54,16 +107,24 @@ class BallStabilizerDashboard(QMainWindow):
         
         self.serial_radio = QRadioButton("Serial (USB)")
         self.mqtt_radio = QRadioButton("MQTT (WiFi)")
+        self.replay_radio = QRadioButton("Replay (File)")
+        self.sim_radio = QRadioButton("Simulation")
         
         self.connection_mode_group.addButton(self.serial_radio, 0)
         self.connection_mode_group.addButton(self.mqtt_radio, 1)
+        self.connection_mode_group.addButton(self.replay_radio, 2)
+        self.connection_mode_group.addButton(self.sim_radio, 3)
         self.serial_radio.setChecked(True)
         
         self.serial_radio.toggled.connect(self.on_mode_changed)
         self.mqtt_radio.toggled.connect(self.on_mode_changed)
+        self.replay_radio.toggled.connect(self.on_mode_changed)
+        self.sim_radio.toggled.connect(self.on_mode_changed)
         
         mode_layout.addWidget(self.serial_radio)
         mode_layout.addWidget(self.mqtt_radio)
+        mode_layout.addWidget(self.replay_radio)
+        mode_layout.addWidget(self.sim_radio)
         mode_layout.addStretch()
         layout.addLayout(mode_layout)
         
@@ -94,13 +155,68 @@ class BallStabilizerDashboard(QMainWindow):
         self.mqtt_port_input.setText("1883")
         self.mqtt_port_input.setMaximumWidth(80)
         self.mqtt_layout.addWidget(self.mqtt_port_input)
+        
+        self.mqtt_topic_label = QLabel("Topic:")
+        self.mqtt_layout.addWidget(self.mqtt_topic_label)
+        self.mqtt_topic_input = QLineEdit()
+        self.mqtt_topic_input.setText("gimbal/stabilizer")
+        self.mqtt_topic_input.setToolTip("Use + to read many devices, e.g. gimbal/+/stabilizer")
+        self.mqtt_layout.addWidget(self.mqtt_topic_input)
         self.mqtt_layout.addStretch()
         layout.addLayout(self.mqtt_layout)
         
+        self.replay_layout = QHBoxLayout()
+        self.replay_file_label = QLabel("Log File:")
+        self.replay_layout.addWidget(self.replay_file_label)
+        self.replay_file_input = QLineEdit()
+        self.replay_file_input.setPlaceholderText("data_log.csv or data_log.stblog")
+        self.replay_layout.addWidget(self.replay_file_input)
+        
+        self.replay_browse_btn = QPushButton("Browse")
+        self.replay_browse_btn.clicked.connect(self.browse_replay_file)
+        self.replay_layout.addWidget(self.replay_browse_btn)
+        
+        self.replay_speed_label = QLabel("Speed (0 = max):")
+        self.replay_layout.addWidget(self.replay_speed_label)
+        self.replay_speed_input = QLineEdit()
+        self.replay_speed_input.setText("1.0")
+        self.replay_speed_input.setMaximumWidth(80)
+        self.replay_layout.addWidget(self.replay_speed_input)
+        self.replay_layout.addStretch()
+        layout.addLayout(self.replay_layout)
+        
+        self.sim_layout = QHBoxLayout()
+        self.sim_rate_label = QLabel("Sample Rate (Hz):")
+        self.sim_layout.addWidget(self.sim_rate_label)
+        self.sim_rate_input = QLineEdit()
+        self.sim_rate_input.setText("100")
+        self.sim_rate_input.setMaximumWidth(80)
+        self.sim_layout.addWidget(self.sim_rate_input)
+        self.sim_layout.addStretch()
+        layout.addLayout(self.sim_layout)
+        
+        device_layout = QHBoxLayout()
+        device_layout.addWidget(QLabel("Device:"))
+        self.device_combo = QComboBox()
+        self.device_combo.setEditable(True)
+        self.device_combo.addItems(self.data_manager.device_names())
+        self.device_combo.activated[str].connect(self.on_device_changed)
+        device_layout.addWidget(self.device_combo)
+        
+        self.overlay_check = QCheckBox("Overlay All Devices")
+        self.overlay_check.toggled.connect(self.update_overlays)
+        device_layout.addWidget(self.overlay_check)
+        device_layout.addStretch()
+        layout.addLayout(device_layout)
+        
         button_layout = QHBoxLayout()
         self.connect_btn = QPushButton("Connect")
         self.connect_btn.clicked.connect(self.toggle_connection)
         button_layout.addWidget(self.connect_btn)
+        
+        self.binary_check = QCheckBox("Binary Telemetry")
+        self.binary_check.toggled.connect(self.toggle_binary_telemetry)
+        button_layout.addWidget(self.binary_check)
         button_layout.addStretch()
         layout.addLayout(button_layout)
         
@@ -111,15 +227,38 @@ class BallStabilizerDashboard(QMainWindow):
     
     def on_mode_changed(self):
         is_serial = self.serial_radio.isChecked()
+        is_mqtt = self.mqtt_radio.isChecked()
+        is_replay = self.replay_radio.isChecked()
+        is_sim = self.sim_radio.isChecked()
         
         self.serial_port_label.setVisible(is_serial)
         self.port_combo.setVisible(is_serial)
         self.refresh_btn.setVisible(is_serial)
         
-        self.broker_label.setVisible(not is_serial)
-        self.broker_input.setVisible(not is_serial)
-        self.mqtt_port_label.setVisible(not is_serial)
-        self.mqtt_port_input.setVisible(not is_serial)
+        self.broker_label.setVisible(is_mqtt)
+        self.broker_input.setVisible(is_mqtt)
+        self.mqtt_port_label.setVisible(is_mqtt)
+        self.mqtt_port_input.setVisible(is_mqtt)
+        self.mqtt_topic_label.setVisible(is_mqtt)
+        self.mqtt_topic_input.setVisible(is_mqtt)
+        
+        self.replay_file_label.setVisible(is_replay)
+        self.replay_file_input.setVisible(is_replay)
+        self.replay_browse_btn.setVisible(is_replay)
+        self.replay_speed_label.setVisible(is_replay)
+        self.replay_speed_input.setVisible(is_replay)
+        
+        self.sim_rate_label.setVisible(is_sim)
+        self.sim_rate_input.setVisible(is_sim)
+    
+    def browse_replay_file(self):
+        filename, _ = QFileDialog.getOpenFileName(
+            self, "Open Log File", "", "Log files (*.csv header.json);;All files (*)"
+        )
+        if filename:
+            if filename.endswith("header.json"):
+                filename = filename[:-len("header.json")].rstrip("/\\")
+            self.replay_file_input.setText(filename)
     
     def create_info_group(self):
         group = QGroupBox("Data Info")
@@ -134,6 +273,12 @@ class BallStabilizerDashboard(QMainWindow):
         self.log_status_label = QLabel("Logging: Off")
         layout.addWidget(self.log_status_label)
         
+        self.backlog_label = QLabel("Backlog: 0 | Dropped: 0")
+        layout.addWidget(self.backlog_label)
+        
+        self.stream_label = QLabel("Rate: - | Lost: - | Arrival Delay: -")
+        layout.addWidget(self.stream_label)
+        
         layout.addStretch()
         
         group.setLayout(layout)
@@ -165,6 +310,18 @@ class BallStabilizerDashboard(QMainWindow):
         self.send_pid_btn.clicked.connect(self.send_pid_values)
         layout.addWidget(self.send_pid_btn)
         
+        self.tune_method_combo = QComboBox()
+        self.tune_method_combo.addItem("Nelder-Mead", "nelder_mead")
+        self.tune_method_combo.addItem("Ziegler-Nichols", "ziegler_nichols")
+        layout.addWidget(self.tune_method_combo)
+        
+        self.tune_btn = QPushButton("Auto Tune")
+        self.tune_btn.clicked.connect(self.toggle_autotune)
+        layout.addWidget(self.tune_btn)
+        
+        self.tune_label = QLabel("Tuning: Off")
+        layout.addWidget(self.tune_label)
+        
         layout.addStretch()
         
         group.setLayout(layout)
@@ -173,6 +330,11 @@ class BallStabilizerDashboard(QMainWindow):
     def create_control_buttons(self):
         layout = QHBoxLayout()
         
+        self.log_format_combo = QComboBox()
+        self.log_format_combo.addItem("CSV", "csv")
+        self.log_format_combo.addItem("Binary (columnar)", "columnar")
+        layout.addWidget(self.log_format_combo)
+        
         self.log_btn = QPushButton("Start Logging")
         self.log_btn.clicked.connect(self.toggle_logging)
         layout.addWidget(self.log_btn)
@@ -186,17 +348,62 @@ class BallStabilizerDashboard(QMainWindow):
         return layout
     
     def refresh_ports(self):
+        if self.ports_future is None:
+            self.ports_future = self.data_manager.list_serial_ports()
+    
+    def update_ports(self):
+        if self.ports_future is None or not self.ports_future.done():
+            return
+        future, self.ports_future = self.ports_future, None
+        try:
+            ports = future.result()
+        except Exception as e:
+            print(f"Error listing serial ports: {e}")
+            return
         self.port_combo.clear()
-        ports = SerialConnection.list_ports()
         self.port_combo.addItems(ports)
     
     def toggle_connection(self):
-        if self.data_manager.is_connected():
+        if self.data_manager.is_active():
             self.disconnect()
         else:
             self.connect()
     
+    def on_device_changed(self, name: str):
+        name = name.strip()
+        if not name or name == self.data_manager.current:
+            return
+        
+        self.data_manager.select_device(name)
+        if self.device_combo.findText(name) < 0:
+            self.device_combo.addItem(name)
+        self.device_combo.setCurrentText(name)
+        
+        if self.plot_widget is not None:
+            self.plot_widget.set_source(self.data_manager.buffer, self.data_manager.history)
+        self.analysis_panel.set_source(self.data_manager.analyzer)
+        self.update_overlays()
+        
+        self.binary_check.blockSignals(True)
+        self.binary_check.setChecked(self.data_manager.binary_telemetry)
+        self.binary_check.blockSignals(False)
+        self.connect_btn.setText("Disconnect" if self.data_manager.is_active() else "Connect")
+        self.data_count = 0
+        self.update_status()
+    
+    def update_overlays(self):
+        buffers = {}
+        if self.overlay_check.isChecked():
+            for name in self.data_manager.device_names():
+                device = self.data_manager.get_device(name)
+                if name != self.data_manager.current and (device.is_active() or
+                                                          device.buffer.write_index):
+                    buffers[name] = device.buffer
+        if self.plot_widget is not None:
+            self.plot_widget.set_overlays(buffers)
+    
     def connect(self):
+        self.on_device_changed(self.device_combo.currentText())
         mode = self.connection_mode_group.checkedId()
         success = False
         
@@ -221,35 +428,82 @@ class BallStabilizerDashboard(QMainWindow):
                 QMessageBox.warning(self, "Error", "Invalid port number")
                 return
             
-            success = self.data_manager.connect_mqtt(broker, port)
+            topic = self.mqtt_topic_input.text().strip() or "gimbal/stabilizer"
+            levels = topic.split('/')
+            topic_cmd = '/'.join(levels[:-1] + ['command'])
+            if '+' in levels:
+                self.data_manager.connect_mqtt_hub(broker, port, topic, topic_cmd)
+                self.status_label.setText(f"Status: Waiting for devices on {topic}")
+                return
+            success = self.data_manager.connect_mqtt(broker, port, topic, topic_cmd)
+        
+        elif mode == 2:
+            path = self.replay_file_input.text().strip()
+            if not path:
+                QMessageBox.warning(self, "Error", "Please select a log file to replay")
+                return
+            
+            try:
+                speed = float(self.replay_speed_input.text().strip())
+            except ValueError:
+                QMessageBox.warning(self, "Error", "Invalid replay speed")
+                return
+            
+            success = self.data_manager.connect_replay(path, speed or None)
+        
+        elif mode == 3:
+            try:
+                rate = float(self.sim_rate_input.text().strip())
+            except ValueError:
+                rate = 0
+            if rate <= 0:
+                QMessageBox.warning(self, "Error", "Invalid sample rate")
+                return
+            
+            success = self.data_manager.start_simulation(rate)
         
         if success:
+            if self.binary_check.isChecked():
+                self.data_manager.set_binary_telemetry(True)
             self.connect_btn.setText("Disconnect")
             self.update_status()
+            self.update_overlays()
             self.data_count = 0
         else:
             QMessageBox.warning(self, "Error", "Failed to connect")
     
+    def toggle_binary_telemetry(self, enabled: bool):
+        if not self.data_manager.is_active():
+            return
+        if not self.data_manager.set_binary_telemetry(enabled):
+            QMessageBox.warning(self, "Error", "Failed to switch telemetry mode")
+    
     def disconnect(self):
         self.data_manager.disconnect()
         self.connect_btn.setText("Connect")
         self.update_status()
     
     def toggle_logging(self):
-        if self.data_manager.is_logging():
-            self.data_manager.stop_logging()
+        if self.data_manager.logging_devices():
+            self.data_manager.stop_all_logging()
             self.log_btn.setText("Start Logging")
+            self.log_format_combo.setEnabled(True)
         else:
-            self.data_manager.start_logging()
+            devices = self.data_manager.active_devices() or [self.data_manager.current]
+            for name in devices:
+                self.data_manager.start_logging(fmt=self.log_format_combo.currentData(),
+                                                device=name)
             self.log_btn.setText("Stop Logging")
-            filename = self.data_manager.get_log_filename()
-            QMessageBox.information(self, "Logging Started", 
-                                  f"Logging to: {filename}")
+            self.log_format_combo.setEnabled(False)
+            filenames = [self.data_manager.get_log_filename(name) for name in devices]
+            QMessageBox.information(self, "Logging Started",
+                                  "Logging to: " + ", ".join(filenames))
         
         self.update_status()
     
     def clear_plot(self):
-        self.plot_widget.clear_plot()
+        if self.plot_widget is not None:
+            self.plot_widget.clear_plot()
         self.data_count = 0
         self.data_count_label.setText("Data Count: 0")
     
@@ -266,28 +520,107 @@ class BallStabilizerDashboard(QMainWindow):
             success = self.data_manager.send_pid_values(kp, ki, kd)
             
             if success:
-                QMessageBox.information(self, "Success", 
+                QMessageBox.information(self, "Success",
                                       f"PID values sent to ESP32:\nKp={kp}, Ki={ki}, Kd={kd}")
             else:
                 QMessageBox.warning(self, "Error", "Failed to send PID values")
         except ValueError:
             QMessageBox.warning(self, "Error", "Invalid PID values. Please enter numbers.")
     
-    def update_data(self):
-        if not self.data_manager.is_connected():
+    def toggle_autotune(self):
+        if self.data_manager.is_tuning():
+            self.data_manager.stop_autotune()
+            return
+        
+        try:
+            initial = (float(self.kp_input.text()), float(self.ki_input.text()),
+                       float(self.kd_input.text()))
+        except ValueError:
+            QMessageBox.warning(self, "Error", "Invalid PID values. Please enter numbers.")
             return
         
-        data = self.data_manager.read_data()
-        if data:
-            self.plot_widget.update_data(data)
-            self.data_count += 1
+        method = self.tune_method_combo.currentData()
+        if not self.data_manager.start_autotune(method, initial):
+            QMessageBox.warning(self, "Error", "Not connected to ESP32")
+            return
+        self.tuning = True
+        self.tune_btn.setText("Stop Tuning")
+    
+    def update_tuning(self):
+        if not self.tuning:
+            return
+        
+        progress = self.data_manager.get_tuning_progress()
+        
+        best = progress['best']
+        score = f"{best['score']:.3f}" if best else "-"
+        self.tune_label.setText(
+            f"Tuning: {progress['status']} | Trial {progress['trials']}/"
+            f"{progress['max_trials']} | Best: {score}"
+        )
+        if progress['status'] == 'running':
+            return
+        
+        self.tune_btn.setText("Auto Tune")
+        if best:
+            kp, ki, kd = best['gains']
+            self.kp_input.setText(f"{kp:g}")
+            self.ki_input.setText(f"{ki:g}")
+            self.kd_input.setText(f"{kd:g}")
+        if progress['message']:
+            self.tune_label.setText(f"{self.tune_label.text()} | {progress['message']}")
+        self.tuning = False
+    
+    def update_data(self):
+        self.update_ports()
+        added = self.data_manager.update_devices()
+        if added:
+            self.device_combo.addItems(added)
+            if not self.data_manager.is_active():
+                self.on_device_changed(added[0])
+            self.update_overlays()
+        
+        failed = self.data_manager.poll_connects()
+        if self.data_manager.get_connection_state() != self.connection_state:
+            self.update_status()
+        if self.data_manager.current in failed:
+            self.connect_btn.setText("Connect")
+            QMessageBox.warning(self, "Error", "Failed to connect")
+        
+        columns = self.data_manager.read_columns()
+        count = len(columns['time'])
+        if self.plot_widget is not None and (count or self.plot_widget.overlays):
+            self.plot_widget.refresh()
+        if count:
+            self.data_count += count
             self.data_count_label.setText(f"Data Count: {self.data_count}")
+        
+        stats = self.data_manager.get_acquisition_stats()
+        dropped = stats['dropped'] + stats['ingest_dropped']
+        self.backlog_label.setText(
+            f"Backlog: {stats['backlog']} | Dropped: {dropped} | "
+            f"Reconnects: {stats['reconnects']} | Gaps: {stats['gaps']}"
+        )
+        
+        self.update_tuning()
+        
+        stream = self.data_manager.get_stream_stats()
+        if stream.get('rate_hz'):
+            self.stream_label.setText(
+                f"Rate: {stream['rate_hz']:.1f} Hz | Lost: {stream['lost']} | "
+                f"Arrival Delay: +{stream['arrival_delay_ms']:.1f} ms"
+            )
     
     def update_status(self):
-        if self.data_manager.is_connected():
+        self.connection_state = self.data_manager.get_connection_state()
+        if self.connection_state == 'connected':
             mode = self.connection_mode_group.checkedId()
-            mode_text = ["Serial", "MQTT"][mode]
+            mode_text = ["Serial", "MQTT", "Replay", "Simulation"][mode]
+            if self.data_manager.current != DEFAULT_DEVICE:
+                mode_text = f"{mode_text}, {self.data_manager.current}"
             self.status_label.setText(f"Status: Connected ({mode_text})")
+        elif self.connection_state == 'connecting':
+            self.status_label.setText("Status: Connecting...")
         else:
             self.status_label.setText("Status: Disconnected")
         
@@ -298,6 +631,5 @@ class BallStabilizerDashboard(QMainWindow):
             self.log_status_label.setText("Logging: Off")
     
     def closeEvent(self, event):
-        if self.data_manager.is_connected():
-            self.data_manager.disconnect()
+        self.data_manager.shutdown()
         event.accept()
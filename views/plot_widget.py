@@ -1,27 +1,42 @@
-from collections import deque
+import time
+from typing import List, Dict
+import numpy as np
+from PyQt5.QtCore import QTimer
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
-from models import IMUData
+from models import (
+    IMUData, SampleBuffer, HistoryStore, MinMaxDecimator, columns_from_samples, METRICS
+)
+
+
+OVERLAY_COLORS = ['tab:orange', 'tab:green', 'tab:purple', 'tab:brown',
+                  'tab:pink', 'tab:olive', 'tab:cyan', 'tab:gray']
 
 
 class PlotWidget(FigureCanvas):
     
-    def __init__(self, parent=None, max_points=500):
+    def __init__(self, parent=None, max_points=500, buffer: SampleBuffer = None,
+                 fps: int = 30, use_blit: bool = True, history: HistoryStore = None):
         self.figure = Figure(figsize=(10, 6))
         super().__init__(self.figure)
         self.setParent(parent)
         
         self.max_points = max_points
-        
-        self.times = deque(maxlen=max_points)
-        self.rolls = deque(maxlen=max_points)
-        self.gyro_rates = deque(maxlen=max_points)
+        self.buffer = buffer if buffer is not None else SampleBuffer(max_points)
+        self.clear_index = self.buffer.write_index
+        self.use_blit = use_blit and self.supports_blit
+        self.decimator = MinMaxDecimator()
+        self.history = history
+        self.live = True
+        self.pan_origin = None
         
         self.ax1 = self.figure.add_subplot(211)
         self.ax2 = self.figure.add_subplot(212)
         
-        self.line1, = self.ax1.plot([], [], 'b-', label='Roll Angle')
-        self.line2, = self.ax2.plot([], [], 'r-', label='Gyro Rate')
+        self.line1, = self.ax1.plot([], [], 'b-', label='Roll Angle', animated=self.use_blit)
+        self.line2, = self.ax2.plot([], [], 'r-', label='Gyro Rate', animated=self.use_blit)
+        self.channels = [(self.ax1, self.line1, 'roll'), (self.ax2, self.line2, 'gyro_rate')]
+        self.overlays = []
         
         self.ax1.set_xlabel('Time (s)')
         self.ax1.set_ylabel('Roll Angle (°)')
@@ -36,40 +51,238 @@ class PlotWidget(FigureCanvas):
         self.figure.tight_layout()
         
         self.start_time = None
+        self.backgrounds = None
+        self.dirty = False
+        self.frames_drawn = 0
+        self.full_draws = 0
+        self._reset_limits()
+        
+        self.mpl_connect('draw_event', self._on_draw)
+        self.mpl_connect('scroll_event', self._on_scroll)
+        self.mpl_connect('button_press_event', self._on_press)
+        self.mpl_connect('motion_notify_event', self._on_motion)
+        self.mpl_connect('button_release_event', self._on_release)
+        self.frame_timer = QTimer(self)
+        self.frame_timer.timeout.connect(self.render_frame)
+        self.frame_timer.start(max(1, int(1000 / fps)))
+    
+    def _reset_limits(self):
+        for ax, _, _ in self.channels:
+            ax.set_xlim(0, 1)
+            ax.set_ylim(-1, 1)
+    
+    def _on_draw(self, event):
+        if not self.use_blit:
+            return
+        self.backgrounds = [self.copy_from_bbox(ax.bbox) for ax, _, _ in self.channels]
+        self._draw_lines()
+    
+    def _draw_lines(self):
+        for index, (ax, line, _) in enumerate(self.channels):
+            for _, _, lines in self.overlays:
+                ax.draw_artist(lines[index])
+            ax.draw_artist(line)
     
     def update_data(self, data: IMUData):
+        self.update_batch([data])
+    
+    def update_batch(self, samples: List[IMUData]):
+        if not samples:
+            return
+        self.buffer.append(columns_from_samples(samples))
+        self.refresh()
+    
+    def refresh(self):
+        self.dirty = True
+    
+    def render_frame(self):
+        if not self.dirty or not self.live:
+            return
+        self.dirty = False
+        
+        start = time.perf_counter()
+        self._render()
+        METRICS.record('plot', time.perf_counter() - start)
+    
+    def draw(self):
+        start = time.perf_counter()
+        super().draw()
+        METRICS.record('plot.draw', time.perf_counter() - start)
+    
+    def _render(self):
+        end = self.buffer.write_index
+        start = max(self.clear_index, end - self.max_points)
+        if end <= start:
+            return
+        
         if self.start_time is None:
-            self.start_time = data.timestamp
+            self.start_time = self.buffer.window(start, start + 1)['time'][0]
+        METRICS.record('plot.age', time.time() - self.buffer.window(end - 1, end)['time'][0])
+        
+        self.decimator.buckets = max(100, self.width())
+        series = self.decimator.decimate(self.buffer, start, end,
+                                         [name for _, _, name in self.channels])
+        
+        times = series[self.channels[0][2]][0]
+        rescaled = self._update_x_limits(times - self.start_time)
+        for ax, line, name in self.channels:
+            times, values = series[name]
+            line.set_data(times - self.start_time, values)
+            rescaled = self._update_y_limits(ax, values) or rescaled
+        rescaled = self._render_overlays() or rescaled
         
-        elapsed = (data.timestamp - self.start_time).total_seconds()
+        self.frames_drawn += 1
+        if rescaled or not self.use_blit or self.backgrounds is None:
+            self.full_draws += 1
+            self.draw_idle()
+            return
         
-        self.times.append(elapsed)
-        self.rolls.append(data.roll)
-        self.gyro_rates.append(data.gyro_rate)
+        for background in self.backgrounds:
+            self.restore_region(background)
+        self._draw_lines()
+        for ax, _, _ in self.channels:
+            self.blit(ax.bbox)
+    
+    def _render_overlays(self) -> bool:
+        rescaled = False
+        names = [name for _, _, name in self.channels]
+        for buffer, decimator, lines in self.overlays:
+            end = buffer.write_index
+            start = max(0, end - self.max_points)
+            if end <= start:
+                continue
+            decimator.buckets = self.decimator.buckets
+            series = decimator.decimate(buffer, start, end, names)
+            for (ax, _, name), line in zip(self.channels, lines):
+                times, values = series[name]
+                line.set_data(times - self.start_time, values)
+                rescaled = self._update_y_limits(ax, values) or rescaled
+        return rescaled
+    
+    def set_source(self, buffer: SampleBuffer, history: HistoryStore = None):
+        self.buffer = buffer
+        self.history = history
+        self.clear_plot()
+        self.clear_index = 0
+        self.dirty = True
+    
+    def set_overlays(self, buffers: Dict[str, SampleBuffer]):
+        for _, _, lines in self.overlays:
+            for line in lines:
+                line.remove()
+        
+        self.overlays = []
+        for index, (name, buffer) in enumerate(buffers.items()):
+            color = OVERLAY_COLORS[index % len(OVERLAY_COLORS)]
+            lines = [ax.plot([], [], '--', color=color, linewidth=0.8, label=name,
+                             animated=self.use_blit)[0]
+                     for ax, _, _ in self.channels]
+            self.overlays.append((buffer, MinMaxDecimator(), lines))
+        
+        for ax, _, _ in self.channels:
+            ax.legend()
+        self.dirty = True
+        self.draw_idle()
+    
+    def _update_x_limits(self, elapsed: np.ndarray) -> bool:
+        x0, x1 = self.ax1.get_xlim()
+        t_min, t_max = elapsed[0], elapsed[-1]
+        if x0 <= t_min and t_max <= x1:
+            return False
+        
+        span = max(t_max - t_min, 1.0)
+        for ax, _, _ in self.channels:
+            ax.set_xlim(t_min, t_max + 0.25 * span)
+        return True
+    
+    @staticmethod
+    def _update_y_limits(ax, values: np.ndarray) -> bool:
+        finite = values[np.isfinite(values)]
+        if len(finite) == 0:
+            return False
         
-        self.line1.set_data(list(self.times), list(self.rolls))
-        self.line2.set_data(list(self.times), list(self.gyro_rates))
+        y0, y1 = ax.get_ylim()
+        low, high = finite.min(), finite.max()
+        if y0 <= low and high <= y1:
+            return False
         
-        if len(self.times) > 0:
-            self.ax1.relim()
-            self.ax1.autoscale_view()
-            self.ax2.relim()
-            self.ax2.autoscale_view()
+        low, high = min(low, y0), max(high, y1)
+        margin = 0.1 * (high - low) or 1.0
+        ax.set_ylim(low - margin, high + margin)
+        return True
+    
+    def _on_scroll(self, event):
+        if event.inaxes is None or event.xdata is None:
+            return
+        factor = 0.8 if event.button == 'up' else 1.25
+        x0, x1 = event.inaxes.get_xlim()
+        center = event.xdata
+        self.show_history(center - (center - x0) * factor, center + (x1 - center) * factor)
+    
+    def _on_press(self, event):
+        if event.inaxes is None:
+            return
+        if event.dblclick:
+            self.go_live()
+        elif event.button == 1:
+            self.pan_origin = (event.x, event.inaxes.get_xlim(), event.inaxes.bbox.width)
+    
+    def _on_motion(self, event):
+        if self.pan_origin is None:
+            return
+        x, (x0, x1), width = self.pan_origin
+        shift = (event.x - x) * (x1 - x0) / width
+        self.show_history(x0 - shift, x1 - shift)
+    
+    def _on_release(self, event):
+        self.pan_origin = None
+    
+    def show_history(self, x0: float, x1: float):
+        if self.history is None or self.start_time is None or x1 <= x0:
+            return
+        self.live = False
+        
+        names = [name for _, _, name in self.channels]
+        series = self.history.query(self.start_time + x0, self.start_time + x1,
+                                    max(100, self.width()), names)
+        elapsed = np.repeat(series['time'] - self.start_time, 2)
+        for ax, line, name in self.channels:
+            ax.set_xlim(x0, x1)
+            if len(elapsed) == 0:
+                line.set_data([], [])
+                continue
+            values = np.column_stack((series[f"{name}_min"], series[f"{name}_max"])).ravel()
+            line.set_data(elapsed, values)
+            finite = values[np.isfinite(values)]
+            if len(finite):
+                low, high = finite.min(), finite.max()
+                margin = 0.1 * (high - low) or 1.0
+                ax.set_ylim(low - margin, high + margin)
         
-        self.draw()
+        self.full_draws += 1
+        self.draw_idle()
+    
+    def go_live(self):
+        if self.live:
+            return
+        self.live = True
+        self.pan_origin = None
+        self._reset_limits()
+        self.dirty = True
     
     def clear_plot(self):
-        self.times.clear()
-        self.rolls.clear()
-        self.gyro_rates.clear()
+        self.clear_index = self.buffer.write_index
         self.start_time = None
+        self.dirty = False
+        self.live = True
+        self.decimator.reset()
         
-        self.line1.set_data([], [])
-        self.line2.set_data([], [])
-        
-        self.ax1.relim()
-        self.ax1.autoscale_view()
-        self.ax2.relim()
-        self.ax2.autoscale_view()
+        for _, line, _ in self.channels:
+            line.set_data([], [])
+        for _, decimator, lines in self.overlays:
+            decimator.reset()
+            for line in lines:
+                line.set_data([], [])
+        self._reset_limits()
         
-        self.draw()
+        self.draw_idle()
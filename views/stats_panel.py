@@ -0,0 +1,48 @@
+from PyQt5.QtCore import QTimer
+from PyQt5.QtWidgets import QGroupBox, QVBoxLayout, QLabel, QTableWidget, QTableWidgetItem
+from models import Instrumentation, METRICS
+
+
+STATS_HEADERS = ("Stage", "Count", "Rate/s", "p50 ms", "p99 ms", "Max ms")
+
+
+class StatsPanel(QGroupBox):
+    
+    def __init__(self, registry: Instrumentation = METRICS, parent=None, interval_ms: int = 1000):
+        super().__init__("Pipeline Stats", parent)
+        self.registry = registry
+        
+        layout = QVBoxLayout()
+        self.table = QTableWidget(0, len(STATS_HEADERS))
+        self.table.setHorizontalHeaderLabels(STATS_HEADERS)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        layout.addWidget(self.table)
+        
+        self.counters_label = QLabel("Counters: -")
+        self.counters_label.setWordWrap(True)
+        layout.addWidget(self.counters_label)
+        
+        self.setLayout(layout)
+        
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+        self.timer.start(interval_ms)
+    
+    def refresh(self):
+        snapshot = self.registry.snapshot()
+        latency = snapshot['latency']
+        uptime = snapshot['uptime']
+        self.table.setRowCount(len(latency))
+        for row, name in enumerate(sorted(latency)):
+            summary = latency[name]
+            values = (name, f"{summary['count']}", f"{summary['count'] / uptime:.1f}",
+                      f"{summary['p50'] * 1e3:.3f}", f"{summary['p99'] * 1e3:.3f}",
+                      f"{summary['max'] * 1e3:.3f}")
+            for column, value in enumerate(values):
+                self.table.setItem(row, column, QTableWidgetItem(value))
+        
+        rates = snapshot['rates']
+        counters = " | ".join(f"{name}: {value} ({rates[name]:.0f}/s)"
+                              for name, value in sorted(snapshot['counters'].items()))
+        self.counters_label.setText(f"Counters: {counters or '-'}")